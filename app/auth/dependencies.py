@@ -2,13 +2,33 @@ from datetime import datetime
 from uuid import UUID
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
+from jose import JWTError
+from app.auth.jwt import is_revoked, verify_jwt
+from app.schemas.token import TokenType
 from app.schemas.user import UserResponse
 from app.models.user import User
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/token")
 
+async def reject_revoked_token(token: str = Depends(oauth2_scheme)) -> None:
+    """
+    Dependency that rejects logged-out tokens and tokens revoked by a
+    token generation bump. Invalid tokens are left to get_current_user.
+    """
+    try:
+        payload = verify_jwt(token, TokenType.ACCESS)
+    except JWTError:
+        return
+    if await is_revoked(payload):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Token has been revoked",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
 def get_current_user(
-    token: str = Depends(oauth2_scheme)
+    token: str = Depends(oauth2_scheme),
+    _revocation_checked: None = Depends(reject_revoked_token),
 ) -> UserResponse:
     """
     Dependency to get the current user from the JWT token without a database lookup.
@@ -0,0 +1,87 @@
+# app/auth/generations.py
+"""
+Per-user token generations, cached per worker.
+
+Every token carries the ``gen`` its user had when it was issued, and a
+token whose generation is older than the user's current one is revoked.
+Logging out everywhere is therefore a single increment
+(User.revoke_all_tokens), however many tokens are outstanding.
+
+The current generation is read from the users table and cached here for
+AUTH_TOKEN_GENERATION_TTL_SECONDS. The worker that bumps a generation
+updates its cache at once; the other workers notice within the TTL.
+"""
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple, Union
+
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from app.database import SessionLocal
+from app.models.user import User
+
+
+class GenerationCache:
+    """Thread-safe LRU of user id -> generation with a TTL per entry."""
+
+    def __init__(self, ttl_seconds: float, max_entries: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[uuid.UUID, Tuple[int, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, user_id: uuid.UUID) -> Optional[int]:
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None or entry[1] <= time.monotonic():
+                self._entries.pop(user_id, None)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(user_id)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, user_id: uuid.UUID, generation: int) -> None:
+        if self.ttl_seconds <= 0:
+            return
+        with self._lock:
+            self._entries[user_id] = (generation, time.monotonic() + self.ttl_seconds)
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def stats(self) -> Dict[str, Union[int, float]]:
+        """Return the cache counters."""
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+token_generations = GenerationCache(
+    ttl_seconds=settings.AUTH_TOKEN_GENERATION_TTL_SECONDS,
+    max_entries=settings.AUTH_TOKEN_GENERATION_CACHE_SIZE,
+)
+
+
+def _load_generation(user_id: uuid.UUID) -> Optional[int]:
+    with SessionLocal() as db:
+        return User.get_token_generation(db, user_id)
+
+
+async def current_generation(user_id: uuid.UUID) -> Optional[int]:
+    """The user's token generation (cached), or None if the user does not exist."""
+    generation = token_generations.get(user_id)
+    if generation is None:
+        generation = await run_in_threadpool(_load_generation, user_id)
+        if generation is not None:
+            token_generations.put(user_id, generation)
+    return generation
@@ -0,0 +1,175 @@
+# app/auth/hashing.py
+"""
+Password hashing on a dedicated, bounded process pool.
+
+bcrypt at BCRYPT_ROUNDS=12 costs a few hundred milliseconds of CPU per call.
+Run in request threads it holds the GIL-bound threadpool that CRUD requests
+share, so a login storm stalls everything else. Here hashes run in their own
+worker processes, in parallel, and admission is bounded: at most
+AUTH_HASH_WORKERS hashes run and AUTH_HASH_MAX_PENDING wait. Further
+requests fail immediately with HasherBusy (a 503 with Retry-After in
+app.main) instead of queueing without limit, so the threads blocked on
+hashing never exceed workers + max_pending.
+
+Workers are started by a fork server rather than forked from the
+application, which by then has threads, an event loop and connection
+pools that a forked child would inherit mid-use.
+"""
+import asyncio
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Callable, Optional, Tuple
+
+from passlib.context import CryptContext
+
+from app.core.config import settings
+from app.core.metrics import Histogram
+
+# Also built in each worker process on import.
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__rounds=settings.BCRYPT_ROUNDS
+)
+
+
+class HasherBusy(Exception):
+    """Raised when the hashing queue is full."""
+
+
+def _timed_hash(password: str) -> Tuple[str, float]:
+    start = time.perf_counter()
+    return pwd_context.hash(password), time.perf_counter() - start
+
+
+def _timed_verify(password: str, hashed: str) -> Tuple[bool, float]:
+    start = time.perf_counter()
+    return pwd_context.verify(password, hashed), time.perf_counter() - start
+
+
+class PasswordHasher:
+    """
+    Bounded process-pool executor for bcrypt.
+
+    With ``workers=0`` hashes run in the calling thread, still under the
+    same admission limit (useful for tests and single-core hosts).
+    """
+
+    def __init__(self, workers: int, max_pending: int):
+        self.workers = workers
+        self.max_pending = max_pending
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self.completed = 0
+        self.rejected = 0
+        self.wait_seconds = Histogram()
+        self.hash_seconds = Histogram()
+
+    @property
+    def capacity(self) -> int:
+        return max(self.workers, 1) + self.max_pending
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers, mp_context=multiprocessing.get_context("forkserver")
+            )
+        return self._pool
+
+    def _admit(self) -> None:
+        with self._lock:
+            if self._in_flight >= self.capacity:
+                self.rejected += 1
+                raise HasherBusy("Too many pending password hashes")
+            self._in_flight += 1
+
+    def _finish(self, submitted: float, elapsed: Optional[float]) -> None:
+        with self._lock:
+            self._in_flight -= 1
+            if elapsed is not None:
+                self.completed += 1
+        if elapsed is not None:
+            self.wait_seconds.observe(max(time.perf_counter() - submitted - elapsed, 0.0))
+            self.hash_seconds.observe(elapsed)
+
+    def _submit(self, fn: Callable, *args) -> Future:
+        """Admit and start fn(*args); the future resolves to fn's (value, seconds)."""
+        self._admit()
+        submitted = time.perf_counter()
+        try:
+            if self.workers > 0:
+                future = self._get_pool().submit(fn, *args)
+            else:
+                future = Future()
+                try:
+                    future.set_result(fn(*args))
+                except Exception as e:
+                    future.set_exception(e)
+        except BaseException:
+            self._finish(submitted, None)
+            raise
+
+        def done(f: Future) -> None:
+            failed = f.cancelled() or f.exception() is not None
+            self._finish(submitted, None if failed else f.result()[1])
+
+        future.add_done_callback(done)
+        return future
+
+    def hash(self, password: str) -> str:
+        """Hash a password, blocking the calling thread until a worker is done."""
+        return self._submit(_timed_hash, password).result()[0]
+
+    def verify(self, password: str, hashed: str) -> bool:
+        """Verify a password, blocking the calling thread until a worker is done."""
+        return self._submit(_timed_verify, password, hashed).result()[0]
+
+    async def ahash(self, password: str) -> str:
+        """Hash a password without holding a thread while it waits."""
+        return (await asyncio.wrap_future(self._submit(_timed_hash, password)))[0]
+
+    async def averify(self, password: str, hashed: str) -> bool:
+        """Verify a password without holding a thread while it waits."""
+        return (await asyncio.wrap_future(self._submit(_timed_verify, password, hashed)))[0]
+
+    def stats(self) -> dict:
+        """Queue depth and latency counters for this worker process."""
+        in_flight = self._in_flight
+        running = min(in_flight, max(self.workers, 1))
+        return {
+            "workers": self.workers,
+            "max_pending": self.max_pending,
+            "running": running,
+            "queued": in_flight - running,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "wait_seconds": self.wait_seconds.snapshot(),
+            "hash_seconds": self.hash_seconds.snapshot(),
+        }
+
+    def shutdown(self) -> None:
+        """Shut the worker processes down (called from the application lifespan)."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+
+def pool_size() -> int:
+    """
+    Hashing processes of this application worker.
+
+    By default the host's CPUs are split between the WEB_CONCURRENCY
+    workers (at most 4 each), so all of them together run at most one bcrypt
+    process per CPU. The calculation pool (app.operations.parallel) is
+    sized the same way on top of this.
+    """
+    if settings.AUTH_HASH_WORKERS is not None:
+        return settings.AUTH_HASH_WORKERS
+    return min(max(1, (os.cpu_count() or 1) // max(1, settings.WEB_CONCURRENCY)), 4)
+
+
+password_hasher = PasswordHasher(workers=pool_size(), max_pending=settings.AUTH_HASH_MAX_PENDING)
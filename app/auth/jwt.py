@@ -2,14 +2,16 @@
 from datetime import datetime, timedelta, timezone
 from typing import Any, Optional, Union
 from jose import jwt, JWTError
-from passlib.context import CryptContext
 from fastapi import HTTPException, status, Depends
 from fastapi.security import OAuth2PasswordBearer
 from uuid import UUID
 import secrets
 
 from app.core.config import get_settings
+from app.auth.hashing import password_hasher, pwd_context
+from app.auth.generations import current_generation
 from app.auth.redis import add_to_blacklist, is_blacklisted
+from app.auth.token_cache import make_key, token_cache
 from app.schemas.token import TokenType
 from app.database import get_db
 from sqlalchemy.orm import Session
@@ -17,30 +19,42 @@ from app.models.user import User
 
 settings = get_settings()
 
-# Password hashing
-pwd_context = CryptContext(
-    schemes=["bcrypt"],
-    deprecated="auto",
-    bcrypt__rounds=settings.BCRYPT_ROUNDS
-)
-
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/login")
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    """Verify a plain password against its hash."""
-    return pwd_context.verify(plain_password, hashed_password)
+    """Verify a plain password against its hash on the hashing pool."""
+    return password_hasher.verify(plain_password, hashed_password)
 
 def get_password_hash(password: str) -> str:
-    """Hash a password using bcrypt."""
-    return pwd_context.hash(password)
+    """Hash a password using bcrypt on the hashing pool."""
+    return password_hasher.hash(password)
+
+async def averify_password(plain_password: str, hashed_password: str) -> bool:
+    """verify_password for async callers; no thread waits on the hash."""
+    return await password_hasher.averify(plain_password, hashed_password)
+
+async def aget_password_hash(password: str) -> str:
+    """get_password_hash for async callers; no thread waits on the hash."""
+    return await password_hasher.ahash(password)
+
+def _secret(token_type: TokenType) -> str:
+    return (
+        settings.JWT_SECRET_KEY
+        if token_type == TokenType.ACCESS
+        else settings.JWT_REFRESH_SECRET_KEY
+    )
 
 def create_token(
     user_id: Union[str, UUID],
     token_type: TokenType,
-    expires_delta: Optional[timedelta] = None
+    expires_delta: Optional[timedelta] = None,
+    generation: int = 0
 ) -> str:
     """
     Create a JWT token (access or refresh).
+
+    ``generation`` is the user's token generation; the token is revoked
+    once the user's generation moves past it.
     """
     if expires_delta:
         expire = datetime.now(timezone.utc) + expires_delta
@@ -62,23 +76,50 @@ def create_token(
         "type": token_type.value,
         "exp": expire,
         "iat": datetime.now(timezone.utc),
-        "jti": secrets.token_hex(16)
+        "jti": secrets.token_hex(16),
+        "gen": generation
     }
 
-    secret = (
-        settings.JWT_SECRET_KEY 
-        if token_type == TokenType.ACCESS 
-        else settings.JWT_REFRESH_SECRET_KEY
-    )
-
     try:
-        return jwt.encode(to_encode, secret, algorithm=settings.ALGORITHM)
+        return jwt.encode(to_encode, _secret(token_type), algorithm=settings.ALGORITHM)
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Could not create token: {str(e)}"
         )
 
+def verify_jwt(token: str, token_type: TokenType) -> dict[str, Any]:
+    """
+    Check a token's signature and expiry with the secret for token_type.
+
+    Verified payloads are cached until their exp, so a token seen before
+    skips the parse and HMAC. The token type and blacklist are not checked.
+
+    Raises:
+        JWTError: If the token is invalid (ExpiredSignatureError once expired)
+    """
+    key = make_key(token_type.value, token)
+    payload = token_cache.get(key)
+    if payload is None:
+        payload = jwt.decode(token, _secret(token_type), algorithms=[settings.ALGORITHM])
+        token_cache.put(key, payload)
+    return payload
+
+async def is_revoked(payload: dict[str, Any]) -> bool:
+    """
+    True if a verified token was logged out (its jti is blacklisted) or
+    revoked with all its siblings (its generation is behind the user's).
+    Tokens of users that no longer exist count as revoked.
+    """
+    if await is_blacklisted(payload["jti"]):
+        return True
+    try:
+        user_id = UUID(payload["sub"])
+    except (KeyError, TypeError, ValueError):
+        return True
+    generation = await current_generation(user_id)
+    return generation is None or payload.get("gen", 0) < generation
+
 async def decode_token(
     token: str,
     token_type: TokenType,
@@ -88,18 +129,15 @@ async def decode_token(
     Decode and verify a JWT token.
     """
     try:
-        secret = (
-            settings.JWT_SECRET_KEY 
-            if token_type == TokenType.ACCESS 
-            else settings.JWT_REFRESH_SECRET_KEY
-        )
-        
-        payload = jwt.decode(
-            token,
-            secret,
-            algorithms=[settings.ALGORITHM],
-            options={"verify_exp": verify_exp}
-        )
+        if verify_exp:
+            payload = verify_jwt(token, token_type)
+        else:
+            payload = jwt.decode(
+                token,
+                _secret(token_type),
+                algorithms=[settings.ALGORITHM],
+                options={"verify_exp": False}
+            )
         
         if payload.get("type") != token_type.value:
             raise HTTPException(
@@ -108,7 +146,7 @@ async def decode_token(
                 headers={"WWW-Authenticate": "Bearer"},
             )
             
-        if await is_blacklisted(payload["jti"]):
+        if await is_revoked(payload):
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Token has been revoked",
@@ -140,9 +178,7 @@ async def get_current_user(
     """
     try:
         payload = await decode_token(token, TokenType.ACCESS)
-        user_id = payload["sub"]
-        
-        user = db.query(User).filter(User.id == user_id).first()
+        user = User.get_by_id(db, UUID(payload["sub"]))
         if user is None:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
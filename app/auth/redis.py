@@ -1,28 +1,310 @@
+import asyncio
+import logging
+import time
+from typing import Awaitable, Callable, Dict, List, Optional, Set
+
 from redis import asyncio as aioredis  # Use the modern redis library as a drop-in replacement
+from redis.exceptions import RedisError, TimeoutError as RedisTimeoutError
+
+from app.auth.revocation import RevocationMirror
+from app.core.circuit_breaker import CircuitBreaker
 from app.core.config import settings
+from app.core.metrics import Histogram
+
+logger = logging.getLogger(__name__)
+
+# Revoked jtis are stored as "revoked:<jti>" -> expiry (epoch seconds) and
+# announced on REVOCATIONS_CHANNEL as "<jti> <expiry>".
+BLACKLIST_PREFIX = "revoked:"
+REVOCATIONS_CHANNEL = "revocations"
+
+
+class RedisUnavailable(RedisError):
+    """Raised instead of calling Redis while the circuit breaker is open."""
+
 
-# Create Redis client
-redis_client = aioredis.from_url(
-    settings.REDIS_URL, 
-    encoding="utf-8", 
-    decode_responses=True
+# Create Redis client: a bounded pool whose checkouts wait at most
+# REDIS_POOL_TIMEOUT_SECONDS, and commands that time out instead of hanging.
+# Without REDIS_URL there is no client and revocations stay in this worker.
+redis_client = None if not settings.REDIS_URL else aioredis.Redis(
+    connection_pool=aioredis.BlockingConnectionPool.from_url(
+        settings.REDIS_URL,
+        max_connections=settings.REDIS_MAX_CONNECTIONS,
+        timeout=settings.REDIS_POOL_TIMEOUT_SECONDS,
+        socket_timeout=settings.REDIS_SOCKET_TIMEOUT_SECONDS,
+        socket_connect_timeout=settings.REDIS_CONNECT_TIMEOUT_SECONDS,
+        health_check_interval=30,
+        encoding="utf-8",
+        decode_responses=True,
+    )
 )
 
+breaker = CircuitBreaker(
+    failure_threshold=settings.REDIS_BREAKER_FAILURES,
+    reset_seconds=settings.REDIS_BREAKER_RESET_SECONDS,
+)
+
+
+class RedisMetrics:
+    """Latency and error counters of request-path Redis calls."""
+
+    def __init__(self):
+        self.latency_seconds = Histogram()
+        self.errors = 0
+        self.timeouts = 0
+        self.batches = 0
+        self.batched_lookups = 0
+
+    def stats(self) -> dict:
+        return {
+            "latency_seconds": self.latency_seconds.snapshot(),
+            "errors": self.errors,
+            "timeouts": self.timeouts,
+            "batches": self.batches,
+            "batched_lookups": self.batched_lookups,
+            "breaker": breaker.stats(),
+            "failure_policy": settings.REDIS_FAILURE_POLICY,
+        }
+
+
+redis_metrics = RedisMetrics()
+
+# This worker's copy of the revoked set (see app.auth.revocation)
+revocations = RevocationMirror()
+
+async def _execute(command: Callable[[], Awaitable]):
+    """
+    Run a Redis command through the circuit breaker, recording its latency.
+
+    Raises:
+        RedisUnavailable: If the breaker is open
+        RedisError: If the command failed (the breaker counts it)
+    """
+    if not breaker.allow():
+        raise RedisUnavailable("Redis circuit breaker is open")
+    start = time.perf_counter()
+    try:
+        result = await command()
+    except (RedisError, OSError) as e:
+        redis_metrics.errors += 1
+        if isinstance(e, (RedisTimeoutError, TimeoutError)):
+            redis_metrics.timeouts += 1
+        breaker.record_failure()
+        raise
+    except BaseException:
+        # Cancelled or failed outside Redis: no verdict on Redis' health,
+        # but a half-open trial must not stay claimed forever.
+        breaker.release()
+        raise
+    finally:
+        redis_metrics.latency_seconds.observe(time.perf_counter() - start)
+    breaker.record_success()
+    return result
+
+
+class _LookupBatcher:
+    """
+    Coalesce concurrent blacklist lookups into one MGET.
+
+    The first lookup in a window of REDIS_BATCH_WINDOW_SECONDS schedules a
+    flush; every lookup arriving before it (up to REDIS_BATCH_MAX_KEYS) is
+    answered by the same round trip.
+    """
+
+    def __init__(self):
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._pending: Dict[str, List[asyncio.Future]] = {}
+        self._timer: Optional[asyncio.TimerHandle] = None
+        # The loop only keeps weak references to tasks
+        self._flushes: Set[asyncio.Task] = set()
+
+    async def exists(self, key: str) -> bool:
+        if settings.REDIS_BATCH_WINDOW_SECONDS <= 0:
+            return await _execute(lambda: redis_client.get(key)) is not None
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # Batches belong to the loop that serves requests.
+            self._loop, self._pending, self._timer, self._flushes = loop, {}, None, set()
+        future = loop.create_future()
+        self._pending.setdefault(key, []).append(future)
+        if len(self._pending) >= settings.REDIS_BATCH_MAX_KEYS:
+            self._flush_now()
+        elif self._timer is None:
+            self._timer = loop.call_later(settings.REDIS_BATCH_WINDOW_SECONDS, self._flush_now)
+        return await future
+
+    def _flush_now(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        pending, self._pending = self._pending, {}
+        if pending:
+            task = self._loop.create_task(self._flush(pending))
+            self._flushes.add(task)
+            task.add_done_callback(self._flushes.discard)
+
+    @staticmethod
+    async def _flush(pending: Dict[str, List[asyncio.Future]]) -> None:
+        keys = list(pending)
+        redis_metrics.batches += 1
+        redis_metrics.batched_lookups += sum(len(futures) for futures in pending.values())
+        try:
+            values = await _execute(lambda: redis_client.mget(keys))
+        except Exception as e:
+            for futures in pending.values():
+                for future in futures:
+                    if not future.done():
+                        future.set_exception(e)
+            return
+        for key, value in zip(keys, values):
+            for future in pending[key]:
+                if not future.done():
+                    future.set_result(value is not None)
+
+
+_lookups = _LookupBatcher()
+
 async def add_to_blacklist(token: str, expiration: int = 3600):
     """
-    Adds a token to the Redis blacklist with an expiration time.
+    Adds a token id (jti) to the Redis blacklist with an expiration time
+    and tells every worker's revocation mirror about it, in one pipelined
+    round trip.
+
+    Raises:
+        RedisError: If Redis is unavailable; the revocation is then only
+            known to this worker
     """
-    await redis_client.setex(token, expiration, "blacklisted")
+    expires_at = time.time() + expiration
+    revocations.add(token, expires_at)
+    if redis_client is None:
+        return
+
+    async def write():
+        async with redis_client.pipeline(transaction=False) as pipe:
+            pipe.setex(f"{BLACKLIST_PREFIX}{token}", expiration, repr(expires_at))
+            pipe.publish(REVOCATIONS_CHANNEL, f"{token} {expires_at!r}")
+            return await pipe.execute()
+
+    await _execute(write)
 
 async def is_blacklisted(token: str) -> bool:
     """
-    Checks if a token is in the Redis blacklist.
+    Checks if a token id (jti) is in the blacklist.
+
+    Answered locally by the revocation mirror when it is in sync; Redis is
+    only asked while the mirror is (re)loading, with concurrent lookups
+    batched. If Redis cannot answer, REDIS_FAILURE_POLICY decides: "open"
+    accepts the token, "closed" treats it as revoked. Without REDIS_URL only
+    this worker's own revocations are known.
+    """
+    if redis_client is None:
+        return revocations.lookup(token) is True
+    if settings.AUTH_REVOCATION_MIRROR:
+        revoked = revocations.lookup(token)
+        if revoked is not None:
+            return revoked
+    try:
+        return await _lookups.exists(f"{BLACKLIST_PREFIX}{token}")
+    except RedisError as e:
+        fail_open = settings.REDIS_FAILURE_POLICY == "open"
+        logger.warning("Blacklist lookup failed (%s); failing %s", e, "open" if fail_open else "closed")
+        return not fail_open
+
+def _parse(message):
+    """(jti, expiry) from a revocation message, or None for anything else."""
+    if message is None or message.get("type") != "message":
+        return None
+    try:
+        jti, expires_at = message["data"].split()
+        return jti, float(expires_at)
+    except ValueError:
+        logger.warning("Ignoring malformed revocation message %r", message["data"])
+        return None
+
+async def _load_revocations(pubsub) -> None:
+    """Replace the mirror with Redis' revoked set plus what was published meanwhile."""
+    entries = []
+    keys = [key async for key in redis_client.scan_iter(match=f"{BLACKLIST_PREFIX}*", count=1000)]
+    for start in range(0, len(keys), 1000):
+        batch = keys[start:start + 1000]
+        for key, value in zip(batch, await redis_client.mget(batch)):
+            if value is None:
+                continue
+            jti = key[len(BLACKLIST_PREFIX):]
+            try:
+                entries.append((jti, float(value)))
+            except ValueError:
+                # The key exists, so the token is revoked; keep it until the next reload.
+                logger.warning("Malformed revocation %r for %s", value, jti)
+                entries.append((jti, time.time() + settings.AUTH_REVOCATION_RESYNC_SECONDS))
+    # Revocations published during the scan are queued on the subscription
+    # and may have been missed by it; include them before declaring the
+    # mirror complete.
+    while (message := await pubsub.get_message(ignore_subscribe_messages=True, timeout=0)) is not None:
+        entry = _parse(message)
+        if entry is not None:
+            entries.append(entry)
+    revocations.replace(entries)
+
+async def sync_revocations() -> None:
+    """
+    Keep the revocation mirror in sync until cancelled (run from the lifespan).
+
+    Subscribe first, then load the full set, so no revocation falls between
+    the two. On any Redis error the mirror is marked out of sync (lookups go
+    to Redis) and the cycle restarts; it is also reloaded every
+    AUTH_REVOCATION_RESYNC_SECONDS in case a message was lost silently.
+    """
+    delay = 0.5
+    while True:
+        pubsub = redis_client.pubsub()
+        try:
+            await pubsub.subscribe(REVOCATIONS_CHANNEL)
+            await _load_revocations(pubsub)
+            loaded = time.monotonic()
+            delay = 0.5
+            while True:
+                entry = _parse(await pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0))
+                if entry is not None:
+                    revocations.add(*entry)
+                revocations.prune()
+                if time.monotonic() - loaded >= settings.AUTH_REVOCATION_RESYNC_SECONDS:
+                    await _load_revocations(pubsub)
+                    loaded = time.monotonic()
+        except (RedisError, OSError) as e:
+            logger.warning("Revocation mirror out of sync: %s", e)
+        except Exception:
+            logger.exception("Revocation mirror sync failed")
+        finally:
+            revocations.synced = False
+            try:
+                await pubsub.aclose()
+            except (RedisError, OSError):
+                pass
+        await asyncio.sleep(delay)
+        delay = min(delay * 2, 30.0)
+
+async def set_value(key: str, value: str, seconds: int) -> None:
+    """
+    SETEX through the circuit breaker, for other per-user state kept in Redis.
+
+    Raises:
+        RedisError: If Redis is unavailable
+    """
+    await _execute(lambda: redis_client.setex(key, seconds, value))
+
+async def get_value(key: str) -> Optional[str]:
+    """
+    GET through the circuit breaker.
+
+    Raises:
+        RedisError: If Redis is unavailable
     """
-    exists = await redis_client.get(token)
-    return exists is not None
+    return await _execute(lambda: redis_client.get(key))
 
 async def close_redis():
     """
     Closes the Redis connection.
     """
-    await redis_client.close()
\ No newline at end of file
+    if redis_client is not None:
+        await redis_client.close()
@@ -0,0 +1,91 @@
+# app/auth/revocation.py
+"""
+In-process mirror of the revoked-jti set.
+
+Every authenticated request asks whether its token's jti was revoked. With
+the mirror in sync the answer is a local dict lookup instead of a Redis GET.
+The mirror keeps the exact set (jti -> expiry), not a Bloom filter. Revoked
+tokens live only until their exp, so the set stays small, and an exact set
+never needs a second lookup to confirm a hit.
+
+app.auth.redis keeps it fresh: each revocation is published on a Redis
+channel, and every worker's listener applies it. A (re)subscribing
+listener loads the full set from Redis before it marks the mirror synced.
+While it is not synced, for example during a reconnect when messages may
+have been missed, ``lookup`` answers None and callers ask Redis.
+"""
+import heapq
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+class RevocationMirror:
+    """Revoked jtis with their expiry (epoch seconds); expired entries are pruned."""
+
+    def __init__(self):
+        self._expiry: Dict[str, float] = {}
+        self._heap: List[Tuple[float, str]] = []
+        self._lock = threading.Lock()
+        self.synced = False
+        self.hits = 0
+        self.misses = 0
+        self.fallbacks = 0
+        self.resyncs = 0
+
+    def add(self, jti: str, expires_at: float) -> None:
+        """Record a revocation (idempotent; the later expiry wins)."""
+        with self._lock:
+            if expires_at > self._expiry.get(jti, 0):
+                self._expiry[jti] = expires_at
+                heapq.heappush(self._heap, (expires_at, jti))
+
+    def replace(self, entries: Iterable[Tuple[str, float]]) -> None:
+        """Replace the contents with a full snapshot and mark the mirror synced."""
+        expiry: Dict[str, float] = {}
+        for jti, expires_at in entries:
+            expiry[jti] = max(expires_at, expiry.get(jti, 0))
+        heap = [(expires_at, jti) for jti, expires_at in expiry.items()]
+        heapq.heapify(heap)
+        with self._lock:
+            self._expiry, self._heap = expiry, heap
+            self.synced = True
+            self.resyncs += 1
+
+    def prune(self, now: Optional[float] = None) -> int:
+        """Drop entries whose token has expired; returns how many."""
+        now = time.time() if now is None else now
+        pruned = 0
+        with self._lock:
+            while self._heap and self._heap[0][0] <= now:
+                expires_at, jti = heapq.heappop(self._heap)
+                # Skip stale heap entries superseded by a later expiry.
+                if self._expiry.get(jti) == expires_at:
+                    del self._expiry[jti]
+                    pruned += 1
+        return pruned
+
+    def lookup(self, jti: str) -> Optional[bool]:
+        """True if revoked, False if not, None if the mirror cannot tell (not synced)."""
+        self.prune()
+        with self._lock:
+            if jti in self._expiry:
+                self.hits += 1
+                return True
+            if self.synced:
+                self.misses += 1
+                return False
+            self.fallbacks += 1
+            return None
+
+    def stats(self) -> Dict[str, int]:
+        """Return the mirror counters."""
+        with self._lock:
+            return {
+                "synced": self.synced,
+                "entries": len(self._expiry),
+                "revoked_hits": self.hits,
+                "not_revoked": self.misses,
+                "redis_fallbacks": self.fallbacks,
+                "resyncs": self.resyncs,
+            }
@@ -0,0 +1,96 @@
+# app/auth/token_cache.py
+"""
+Cache of verified JWT payloads.
+
+Clients send the same access token on every request, so the signature and
+claims are checked once and the decoded payload is kept, under a digest of
+the token, until the token's own ``exp``. Only successful verifications are
+cached; an invalid token is re-checked (and rejected) every time. Callers
+still apply their per-request checks (token type, blacklist) to the
+cached payload.
+"""
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple, Union
+
+from app.core.config import settings
+
+
+def make_key(secret_name: str, token: str) -> bytes:
+    """Cache key for a token verified with the named secret."""
+    digest = hashlib.blake2b(digest_size=20)
+    digest.update(secret_name.encode())
+    digest.update(b"\0")
+    digest.update(token.encode())
+    return digest.digest()
+
+
+class TokenCache:
+    """Thread-safe LRU of verified payloads bounded by entry count; entries expire at exp."""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[bytes, Tuple[Dict[str, Any], float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0
+
+    def get(self, key: bytes) -> Optional[Dict[str, Any]]:
+        """Return a copy of the cached payload, or None if absent or expired."""
+        if not self.enabled:
+            return None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            payload, expires_at = entry
+            if expires_at <= time.time():
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return dict(payload)
+
+    def put(self, key: bytes, payload: Dict[str, Any]) -> None:
+        """Cache a verified payload until its exp; payloads without exp are not cached."""
+        expires_at = payload.get("exp")
+        if not self.enabled or not isinstance(expires_at, (int, float)):
+            return
+        with self._lock:
+            self._entries[key] = (dict(payload), float(expires_at))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        """Drop all entries; counters are kept."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Union[int, bool]]:
+        """Return the cache counters."""
+        with self._lock:
+            return {
+                "enabled": self.enabled,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
+
+
+token_cache = TokenCache(max_entries=settings.AUTH_TOKEN_CACHE_SIZE)
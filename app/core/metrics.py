@@ -0,0 +1,61 @@
+# app/core/metrics.py
+"""
+Minimal in-process metrics.
+
+Counters are plain attributes on the objects they describe; this module only
+provides a thread-safe counter, for those updated from several threads, and
+a fixed-bucket histogram whose snapshot is served as JSON by GET /metrics.
+"""
+import bisect
+import threading
+from typing import Dict, Sequence, Union
+
+# Upper bounds in seconds, Prometheus style; the last bucket is +Inf.
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 30.0)
+
+
+class Counter:
+    """Thread-safe counter, for events counted from several threads."""
+
+    def __init__(self):
+        self._value = 0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: int = 1) -> None:
+        with self._lock:
+            self._value += amount
+
+    @property
+    def value(self) -> int:
+        return self._value
+
+
+class Histogram:
+    """Cumulative histogram of observed values with fixed bucket bounds."""
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self._counts = [0] * (len(self.buckets) + 1)
+        self._sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self._counts[index] += 1
+            self._sum += value
+
+    @property
+    def count(self) -> int:
+        return sum(self._counts)
+
+    def snapshot(self) -> Dict[str, Union[int, float, Dict[str, int]]]:
+        """Return count, sum and cumulative bucket counts keyed by upper bound."""
+        with self._lock:
+            counts = list(self._counts)
+            total = self._sum
+        cumulative, buckets = 0, {}
+        for bound, count in zip((*map(str, self.buckets), "+Inf"), counts):
+            cumulative += count
+            buckets[bound] = cumulative
+        return {"count": cumulative, "sum": total, "buckets": buckets}
@@ -0,0 +1,124 @@
+"""
+Read-your-writes for the read replicas, per user.
+
+After a user's successful write the primary's WAL position is recorded for
+DATABASE_REPLICA_READ_WINDOW_SECONDS as a "<deadline epoch>:<lsn>" marker
+(see app.database.ReplicaSet.engine_for_read). Markers live in Redis, so
+every worker and every client of the user sees them; without REDIS_URL
+they are only known to the worker that served the write. If Redis cannot
+answer, the read stays on the primary.
+
+ReadAfterWriteMiddleware is only installed when replicas are configured.
+The WAL position of a write comes from the request's own session at commit
+(app.database), so recording it costs no extra connection.
+"""
+import logging
+import math
+import time
+from typing import Dict, Optional, Tuple
+
+from jose import JWTError
+from redis.exceptions import RedisError
+from starlette.requests import Request
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.auth import redis as auth_redis
+from app.auth.jwt import verify_jwt
+from app.core.config import settings
+from app.schemas.token import TokenType
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "read_after_write:"
+# Users with a marker remembered by this worker (without REDIS_URL)
+MAX_LOCAL_MARKERS = 10_000
+
+# user id -> (deadline, marker)
+_local: Dict[str, Tuple[float, str]] = {}
+
+
+def _marker(lsn: str) -> Tuple[float, str]:
+    deadline = time.time() + settings.DATABASE_REPLICA_READ_WINDOW_SECONDS
+    return deadline, f"{deadline:.3f}:{lsn}"
+
+
+def _remember(user_id: str, deadline: float, marker: str) -> None:
+    if user_id not in _local and len(_local) >= MAX_LOCAL_MARKERS:
+        now = time.time()
+        for key in [key for key, (until, _) in _local.items() if until <= now]:
+            del _local[key]
+        if len(_local) >= MAX_LOCAL_MARKERS:
+            del _local[next(iter(_local))]
+    _local[user_id] = (deadline, marker)
+
+
+async def record_write(user_id: str, lsn: str) -> None:
+    """Remember that user_id wrote up to WAL position lsn ("" off PostgreSQL)."""
+    deadline, marker = _marker(lsn)
+    if auth_redis.redis_client is None:
+        _remember(user_id, deadline, marker)
+        return
+    try:
+        await auth_redis.set_value(
+            f"{KEY_PREFIX}{user_id}", marker, math.ceil(settings.DATABASE_REPLICA_READ_WINDOW_SECONDS)
+        )
+    except RedisError as e:
+        logger.warning("Read-after-write marker for %s not recorded: %s", user_id, e)
+
+
+async def last_write(user_id: str) -> Optional[str]:
+    """The user's read-after-write marker, or None if they have not written recently."""
+    if auth_redis.redis_client is not None:
+        try:
+            return await auth_redis.get_value(f"{KEY_PREFIX}{user_id}")
+        except RedisError:
+            # Unknown: a marker without an LSN keeps the read on the primary
+            return _marker("")[1]
+    local = _local.get(user_id)
+    if local is None or local[0] <= time.time():
+        return None
+    return local[1]
+
+
+def _bearer_subject(request: Request) -> Optional[str]:
+    """The user id of a valid bearer access token on the request, if any."""
+    scheme, _, token = request.headers.get("authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return None
+    try:
+        return verify_jwt(token, TokenType.ACCESS).get("sub")
+    except JWTError:
+        return None
+
+
+class ReadAfterWriteMiddleware:
+    """
+    Reads carry the user's marker to get_read_db as request.state.read_after_write;
+    a successful write that committed records a new marker before its
+    response starts, so the user's next request already sees it.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        request = Request(scope)
+        if request.method in ("GET", "HEAD"):
+            user_id = _bearer_subject(request)
+            if user_id is not None:
+                request.state.read_after_write = await last_write(user_id)
+            await self.app(scope, receive, send)
+            return
+
+        async def send_after_recording(message: Message) -> None:
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                lsn = getattr(request.state, "wal_lsn", None)
+                user_id = _bearer_subject(request) if lsn is not None else None
+                if user_id is not None:
+                    await record_write(user_id, lsn)
+            await send(message)
+
+        await self.app(scope, receive, send_after_recording)
@@ -1,19 +1,95 @@
 # app/database.py
-from sqlalchemy import create_engine
+import itertools
+import logging
+import threading
+import time
+from typing import Optional, Tuple
+
+from fastapi import Request
+from sqlalchemy import create_engine, event, exc, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
 from app.core.config import settings
+from app.core.metrics import Counter, Histogram
+
+logger = logging.getLogger(__name__)
 
 SQLALCHEMY_DATABASE_URL = settings.DATABASE_URL
 
+
+class _InstrumentedPool:
+    """Pool mixin that records how long checkouts wait and how often they time out."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.wait_seconds = Histogram()
+        # Checkouts run on many request threads at once
+        self.timeouts = Counter()
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            self.timeouts.inc()
+            raise
+        finally:
+            self.wait_seconds.observe(time.perf_counter() - start)
+
+
+class InstrumentedQueuePool(_InstrumentedPool, QueuePool):
+    """QueuePool with checkout metrics."""
+
+
+class InstrumentedAsyncQueuePool(_InstrumentedPool, AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool with checkout metrics."""
+
+
+# Async drivers used in place of the sync ones for the async engine.
+ASYNC_DRIVERS = {"postgresql": "asyncpg", "sqlite": "aiosqlite"}
+
+
+def async_database_url(database_url: str) -> str:
+    """
+    Return database_url with its driver swapped for the async one.
+
+    asyncpg prepares statements server-side; the size of its per-connection
+    cache of prepared statements comes from DB_PREPARED_STATEMENT_CACHE_SIZE.
+    """
+    url = make_url(database_url)
+    backend = url.get_backend_name()
+    url = url.set(drivername=f"{backend}+{ASYNC_DRIVERS[backend]}")
+    if ASYNC_DRIVERS[backend] == "asyncpg":
+        url = url.update_query_dict(
+            {"prepared_statement_cache_size": str(settings.DB_PREPARED_STATEMENT_CACHE_SIZE)}
+        )
+    return url.render_as_string(hide_password=False)
+
+
+def pool_options(async_engine: bool = False) -> dict:
+    """create_engine() pool arguments from the settings."""
+    return {
+        "poolclass": InstrumentedAsyncQueuePool if async_engine else InstrumentedQueuePool,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+
 # Create the default engine and sessionmaker
-engine = create_engine(SQLALCHEMY_DATABASE_URL)
+engine = create_engine(SQLALCHEMY_DATABASE_URL, **pool_options())
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 Base = declarative_base()
 
-def get_db():
+def get_db(request: Request):
     db = SessionLocal()
+    if replicas is not None and request.method not in _READ_METHODS:
+        db.info["request_state"] = request.state
     try:
         yield db
     finally:
@@ -22,8 +98,223 @@ def get_db():
 # --- New Functions Added ---
 def get_engine(database_url: str = SQLALCHEMY_DATABASE_URL):
     """Factory function to create a new SQLAlchemy engine."""
-    return create_engine(database_url)
+    return create_engine(database_url, **pool_options())
 
 def get_sessionmaker(engine):
     """Factory function to create a new sessionmaker bound to the given engine."""
     return sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+# --- Async engine (opt-in with DATABASE_ASYNC) ---
+def get_async_engine(database_url: str = SQLALCHEMY_DATABASE_URL):
+    """Factory function to create a new async engine for the same database."""
+    return create_async_engine(async_database_url(database_url), **pool_options(async_engine=True))
+
+def get_async_sessionmaker(engine):
+    """
+    Factory function to create an async sessionmaker bound to the given engine.
+
+    Objects are not expired on commit: an async session cannot lazy-load
+    attributes while the response is being serialized.
+    """
+    return async_sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)
+
+async_engine = get_async_engine() if settings.DATABASE_ASYNC else None
+AsyncSessionLocal = get_async_sessionmaker(async_engine) if async_engine is not None else None
+
+# --- Read replicas (opt-in with DATABASE_REPLICA_URLS) ---
+# Users' last writes are tracked in app.core.read_after_write as
+# "<deadline epoch>:<primary WAL LSN>" markers
+
+
+class ReplicaSet:
+    """
+    Read replicas picked round-robin among those that passed the last health check.
+
+    Health is probed at most every ``health_interval`` seconds, by whichever
+    request notices the check is due. Read-your-writes is decided per read
+    from the client's read-after-write token.
+    """
+
+    def __init__(self, urls, health_interval: float):
+        self.urls = list(urls)
+        self.engines = [get_engine(url) for url in self.urls]
+        self.health_interval = health_interval
+        self.healthy = [True] * len(self.engines)
+        self.reads = {"replica": 0, "primary_recent_write": 0, "primary_no_replica": 0}
+        self._checked_at = float("-inf")
+        self._counter = itertools.count()
+        self._lock = threading.Lock()
+
+    def check_health(self) -> None:
+        """Probe every replica with a trivial query."""
+        for index, replica in enumerate(self.engines):
+            try:
+                with replica.connect() as conn:
+                    conn.execute(text("SELECT 1"))
+                healthy = True
+            except exc.SQLAlchemyError as e:
+                healthy = False
+                if self.healthy[index]:
+                    logger.warning("Replica %d is unhealthy: %s", index, e)
+            self.healthy[index] = healthy
+        self._checked_at = time.monotonic()
+
+    def _next_healthy(self):
+        if time.monotonic() - self._checked_at >= self.health_interval and self._lock.acquire(blocking=False):
+            try:
+                self.check_health()
+            finally:
+                self._lock.release()
+        candidates = [replica for replica, ok in zip(self.engines, self.healthy) if ok]
+        if not candidates:
+            return None
+        return candidates[next(self._counter) % len(candidates)]
+
+    @staticmethod
+    def _has_replayed(replica, lsn: str) -> bool:
+        if not lsn or replica.dialect.name != "postgresql":
+            return False
+        try:
+            with replica.connect() as conn:
+                return bool(conn.execute(
+                    text("SELECT pg_last_wal_replay_lsn() >= CAST(:lsn AS pg_lsn)"), {"lsn": lsn}
+                ).scalar())
+        except exc.SQLAlchemyError:
+            return False
+
+    def engine_for_read(self, token: Optional[str]):
+        """
+        Return the engine a read should use, or None for the primary.
+
+        Within a user's read-after-write window the primary is used unless
+        the chosen replica has already replayed the write's WAL position.
+        """
+        replica = self._next_healthy()
+        if replica is None:
+            self.reads["primary_no_replica"] += 1
+            return None
+        deadline, lsn = parse_read_after_write_token(token)
+        if time.time() < deadline and not self._has_replayed(replica, lsn):
+            self.reads["primary_recent_write"] += 1
+            return None
+        self.reads["replica"] += 1
+        return replica
+
+    def status(self) -> dict:
+        return {
+            "reads": dict(self.reads),
+            "replicas": [
+                {"healthy": ok, "pool": pool_status(replica)}
+                for replica, ok in zip(self.engines, self.healthy)
+            ],
+        }
+
+
+def parse_read_after_write_token(token: Optional[str]) -> Tuple[float, str]:
+    """Return (deadline, lsn) from a read-after-write marker; (0, "") if absent or invalid."""
+    try:
+        deadline, lsn = token.split(":", 1)
+        return float(deadline), lsn
+    except (AttributeError, ValueError):
+        return 0.0, ""
+
+
+def current_wal_lsn(connection) -> str:
+    """The primary's current WAL position, read on connection; "" off PostgreSQL."""
+    if connection.dialect.name != "postgresql":
+        return ""
+    return connection.exec_driver_sql("SELECT pg_current_wal_lsn()::text").scalar()
+
+
+# Write requests with replicas: get_db/get_async_db put request.state in the
+# session's info, and each commit leaves the primary's WAL position there as
+# wal_lsn for the read_after_write middleware. It is read on the connection
+# that just committed, before the session hands it back to the pool.
+_READ_METHODS = ("GET", "HEAD", "OPTIONS")
+
+
+@event.listens_for(Session, "after_begin")
+def _remember_connection(session, transaction, connection):
+    if "request_state" in session.info:
+        session.info["connection"] = connection
+
+
+@event.listens_for(Session, "after_commit")
+def _record_commit_lsn(session):
+    connection = session.info.pop("connection", None)
+    if connection is not None:
+        session.info["request_state"].wal_lsn = current_wal_lsn(connection)
+
+
+replicas = (
+    ReplicaSet(settings.DATABASE_REPLICA_URLS, settings.DATABASE_REPLICA_HEALTH_INTERVAL_SECONDS)
+    if settings.DATABASE_REPLICA_URLS else None
+)
+
+def get_read_db(request: Request):
+    """
+    Session for read-only routes: bound to a replica when one is configured,
+    healthy and not behind the user's last write, otherwise the primary.
+    The user's marker is put on request.state by the read_after_write
+    middleware.
+    """
+    bind = None
+    if replicas is not None:
+        bind = replicas.engine_for_read(getattr(request.state, "read_after_write", None))
+    db = SessionLocal(bind=bind) if bind is not None else SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+async def get_async_db(request: Request):
+    if AsyncSessionLocal is None:
+        raise RuntimeError("The async engine is disabled; set DATABASE_ASYNC=true")
+    async with AsyncSessionLocal() as db:
+        if replicas is not None and request.method not in _READ_METHODS:
+            db.sync_session.info["request_state"] = request.state
+        yield db
+
+def pool_status(bind=None) -> dict:
+    """Return live statistics for an engine's connection pool."""
+    pool = (bind or engine).pool
+    status = {
+        "size": pool.size(),
+        "checked_out": pool.checkedout(),
+        "checked_in": pool.checkedin(),
+        # QueuePool counts overflow from -pool_size; only report real overflow.
+        "overflow": max(pool.overflow(), 0),
+    }
+    if isinstance(pool, _InstrumentedPool):
+        status["timeouts"] = pool.timeouts.value
+        status["wait_seconds"] = pool.wait_seconds.snapshot()
+    return status
+
+def check_connection_budget(bind=None, workers: int = None) -> bool:
+    """
+    Warn if every worker's full pool would exceed the server's max_connections.
+
+    Returns:
+        bool: False if the budget is exceeded, True otherwise (or if unknown)
+    """
+    bind = bind or engine
+    if bind.dialect.name != "postgresql":
+        return True
+    workers = workers or settings.WEB_CONCURRENCY
+    try:
+        with bind.connect() as conn:
+            max_connections = int(conn.execute(text("SHOW max_connections")).scalar())
+    except exc.SQLAlchemyError as e:
+        logger.warning("Could not read max_connections: %s", e)
+        return True
+    # With DATABASE_ASYNC each worker holds a sync and an async pool.
+    pools = workers * (2 if settings.DATABASE_ASYNC else 1)
+    peak = pools * (settings.DB_POOL_SIZE + settings.DB_MAX_OVERFLOW)
+    if peak > max_connections:
+        logger.warning(
+            "%d pools x (pool_size %d + max_overflow %d) = %d connections exceeds "
+            "max_connections = %d; lower DB_POOL_SIZE/DB_MAX_OVERFLOW or add a pooler",
+            pools, settings.DB_POOL_SIZE, settings.DB_MAX_OVERFLOW, peak, max_connections,
+        )
+        return False
+    return True
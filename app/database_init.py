@@ -1,11 +1,17 @@
+from app.core.config import settings
 from app.database import engine
+from app.migrations import pack_inputs
+from app.migrations.schema import drop_history, migrate
 from app.models.user import Base
 
 def init_db():
-    Base.metadata.create_all(bind=engine)
+    migrate(engine)
+    if settings.CALC_INPUTS_STORAGE == "packed":
+        pack_inputs.migrate(engine)
 
 def drop_db():
     Base.metadata.drop_all(bind=engine)
+    drop_history(engine)
 
 if __name__ == "__main__":
     init_db() # pragma: no cover
\ No newline at end of file
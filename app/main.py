@@ -1,34 +1,136 @@
 from contextlib import asynccontextmanager
 from datetime import datetime, timezone, timedelta
-from uuid import UUID
-from typing import List
+from uuid import UUID, uuid4
+from typing import Annotated, List, Literal, Optional
+import asyncio
+import email.message
+import functools
+import logging
+import math
+import secrets
+import time
+import zlib
 
-from fastapi import Body, FastAPI, Depends, HTTPException, status, Request, Form
-from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
-from fastapi.responses import HTMLResponse, RedirectResponse, JSONResponse
+from fastapi import Body, FastAPI, Depends, HTTPException, status, Request, Response, Form, Query
+from fastapi.exceptions import RequestValidationError
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer, OAuth2PasswordBearer, OAuth2PasswordRequestForm
+from fastapi.responses import HTMLResponse, RedirectResponse, JSONResponse, StreamingResponse
+from fastapi.routing import APIRoute
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 
+from pydantic import ValidationError
+from redis.exceptions import RedisError
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 
 import uvicorn
 
-from app.auth.dependencies import get_current_active_user
-from app.models.calculation import Calculation
+from app.auth.dependencies import get_current_active_user, oauth2_scheme
+from app.auth.generations import token_generations
+from app.auth.hashing import HasherBusy, password_hasher
+from app.auth.jwt import decode_token
+from app.auth.redis import add_to_blacklist, redis_metrics, revocations, sync_revocations
+from app.auth.token_cache import token_cache
+from app.core.read_after_write import ReadAfterWriteMiddleware
+from app.models.calculation import Calculation, CalculationStats
+from app.models.job import CalculationJob
 from app.models.user import User
-from app.schemas.calculation import CalculationBase, CalculationResponse, CalculationUpdate
-from app.schemas.token import TokenResponse
+from app.schemas.calculation import (
+    CalculationType,
+    CalculationBase,
+    CalculationResponse,
+    CalculationUpdate,
+    CalculationBatchRequest,
+    CalculationBatchError,
+    CalculationBatchResponse,
+    CalculationIngestError,
+    CalculationIngestResponse,
+    CalculationExportQuery,
+    CalculationBulkFilter,
+    CalculationBulkDeleteResponse,
+    CalculationRecomputeError,
+    CalculationRecomputeResponse,
+    CalculationListQuery,
+    CalculationStatsResponse,
+    CalculationTypeStats,
+    CalculationJobStatus,
+    CalculationJobResponse,
+)
+from app.migrations import partition_calculations
+from app.migrations.schema import check_inputs_storage, ensure_schema
+from app.operations.binary import decode_float64, validate_float64
+from app.operations.export import MEDIA_TYPES, encode_csv, encode_ndjson, gzip_chunks
+from app.operations.ingest import iter_ndjson_lines
+from app.operations.jobs import calculation_jobs
+from app.operations.memo import result_cache
+from app.operations.parallel import get_pool, pool_size, shutdown_pool
+from app.operations.vectorized import evaluate_many
+from app.schemas.token import TokenResponse, TokenType
 from app.schemas.user import UserCreate, UserResponse, UserLogin
-from app.database import Base, get_db, engine
+from app import database
+from app.database import (
+    SessionLocal, async_engine, get_db, get_read_db, engine, check_connection_budget, pool_status,
+)
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+async def _maintain_partitions():
+    """Keep month partitions of calculations created ahead and expired ones dropped."""
+    while True:
+        try:
+            await run_in_threadpool(partition_calculations.maintain)
+        except Exception:
+            logger.exception("Partition maintenance failed")
+        await asyncio.sleep(settings.CALC_PARTITION_MAINTENANCE_INTERVAL_SECONDS)
 
+async def _maintain_calculation_jobs():
+    """
+    Run jobs that no worker is running (queued when their worker stopped, or
+    running when it died) and delete finished jobs past their retention.
+    Claims are atomic, so picking up a job another worker still has queued
+    only means one of the two skips it.
+    """
+    while True:
+        try:
+            rows = await run_in_threadpool(_recoverable_jobs)
+            for job_id, user_id, payload in rows:
+                _queue_calculation_job(job_id, user_id, CalculationBase.model_validate(payload))
+        except asyncio.QueueFull:
+            pass
+        except Exception:
+            logger.exception("Calculation job maintenance failed")
+        await asyncio.sleep(settings.CALC_JOB_STALE_SECONDS)
 
-# Create tables on startup
+# Check (and if needed migrate) the schema on startup
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    print("Creating tables...")
-    Base.metadata.create_all(bind=engine)
-    print("Tables created successfully!")
+    print("Checking schema version...")
+    version = await run_in_threadpool(ensure_schema, engine)
+    print(f"Schema is at version {version}")
+    await run_in_threadpool(check_inputs_storage, engine)
+    check_connection_budget()
+    maintenance = None
+    if settings.CALC_PARTITIONING == "month" and engine.dialect.name == "postgresql":
+        maintenance = asyncio.create_task(_maintain_partitions())
+    revocation_sync = None
+    if settings.AUTH_REVOCATION_MIRROR and settings.REDIS_URL:
+        revocation_sync = asyncio.create_task(sync_revocations())
+    job_maintenance = asyncio.create_task(_maintain_calculation_jobs())
     yield
+    if maintenance is not None:
+        maintenance.cancel()
+    if revocation_sync is not None:
+        revocation_sync.cancel()
+    job_maintenance.cancel()
+    await calculation_jobs.shutdown()
+    if async_engine is not None:
+        await async_engine.dispose()
+    shutdown_pool()
+    password_hasher.shutdown()
 
 app = FastAPI(
     title="Calculations API",
@@ -36,6 +138,20 @@ app = FastAPI(
     version="1.0.0",
     lifespan=lifespan
 )
+
+@app.exception_handler(HasherBusy)
+async def hasher_busy(request: Request, exc: HasherBusy):
+    """Login/register storms are shed quickly instead of queueing on bcrypt."""
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": "Too many concurrent logins; retry shortly."},
+        headers={"Retry-After": str(settings.AUTH_HASH_RETRY_AFTER_SECONDS)},
+    )
+
+# Read-your-writes for the replicas; without them no middleware runs
+if database.replicas is not None:
+    app.add_middleware(ReadAfterWriteMiddleware)
+
 # Mount the static files directory
 app.mount("/static", StaticFiles(directory="static"), name="static")
 
@@ -70,6 +186,38 @@ def dashboard_page(request: Request):
 def read_health():
     return {"status": "ok"}
 
+metrics_bearer = HTTPBearer(auto_error=False)
+
+def require_metrics_token(
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(metrics_bearer),
+) -> None:
+    """Hide /metrics unless METRICS_TOKEN is set, then require it as the bearer token."""
+    if not settings.METRICS_TOKEN:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    if credentials is None or not secrets.compare_digest(
+        credentials.credentials.encode(), settings.METRICS_TOKEN.encode()
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid metrics token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+@app.get("/metrics", tags=["health"], dependencies=[Depends(require_metrics_token)])
+def read_metrics():
+    """Connection pool, cache and password hashing statistics for this worker process."""
+    return {
+        "db_pool": pool_status(),
+        "async_db_pool": pool_status(async_engine.sync_engine) if async_engine is not None else None,
+        "replicas": database.replicas.status() if database.replicas is not None else None,
+        "calculation_memo": result_cache.stats(),
+        "password_hashing": password_hasher.stats(),
+        "token_cache": token_cache.stats(),
+        "revocations": revocations.stats(),
+        "token_generations": token_generations.stats(),
+        "redis": redis_metrics.stats(),
+    }
+
 # ------------------------------------------------------------------------------
 # User Registration Endpoint
 # ------------------------------------------------------------------------------
@@ -94,19 +242,19 @@ def register(user_create: UserCreate, db: Session = Depends(get_db)):
 # ------------------------------------------------------------------------------
 # User Login Endpoints
 # ------------------------------------------------------------------------------
-@app.post("/auth/login", response_model=TokenResponse, tags=["auth"])
-def login_json(user_login: UserLogin, db: Session = Depends(get_db)):
-    """Login with JSON payload"""
-    auth_result = User.authenticate(db, user_login.username, user_login.password)
+def _check_login(auth_result: Optional[dict]) -> dict:
+    """Raise 401 for a failed login."""
     if auth_result is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid username or password",
             headers={"WWW-Authenticate": "Bearer"},
         )
+    return auth_result
 
+def _token_response(auth_result: dict) -> TokenResponse:
+    """Build the login response from User.authenticate's result."""
     user = auth_result["user"]
-    db.commit()  # Commit the last_login update
 
     # Ensure expires_at is timezone-aware
     expires_at = auth_result.get("expires_at")
@@ -129,34 +277,340 @@ def login_json(user_login: UserLogin, db: Session = Depends(get_db)):
         is_verified=user.is_verified
     )
 
+@app.post("/auth/login", response_model=TokenResponse, tags=["auth"])
+def login_json(user_login: UserLogin, db: Session = Depends(get_db)):
+    """Login with JSON payload"""
+    auth_result = _check_login(User.authenticate(db, user_login.username, user_login.password))
+    db.commit()  # Commit the last_login update
+    return _token_response(auth_result)
+
 @app.post("/auth/token", tags=["auth"])
 def login_form(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
     """Login with form data for Swagger UI"""
-    auth_result = User.authenticate(db, form_data.username, form_data.password)
-    if auth_result is None:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid username or password",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
+    auth_result = _check_login(User.authenticate(db, form_data.username, form_data.password))
 
     return {
         "access_token": auth_result["access_token"],
         "token_type": "bearer"
     }
 
+def _revoke_all_tokens(db: Session, user_id: UUID) -> Optional[int]:
+    generation = User.revoke_all_tokens(db, user_id)
+    db.commit()
+    return generation
+
+@app.post("/auth/logout", status_code=status.HTTP_204_NO_CONTENT, tags=["auth"])
+async def logout(
+    everywhere: bool = Query(False, description="Revoke every token of this user, not just this one"),
+    token: str = Depends(oauth2_scheme),
+    db: Session = Depends(get_db)
+):
+    """
+    Revoke the presented access token.
+
+    By default only this token's jti is blacklisted, for the rest of its
+    lifetime. With `everywhere=true` the user's token generation is
+    incremented instead, which revokes every access and refresh token
+    issued so far in one write; other workers apply it within
+    AUTH_TOKEN_GENERATION_TTL_SECONDS.
+    """
+    payload = await decode_token(token, TokenType.ACCESS)
+    if everywhere:
+        user_id = UUID(payload["sub"])
+        generation = await _run_db(db, _revoke_all_tokens, user_id)
+        if generation is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
+        token_generations.put(user_id, generation)
+        return None
+    try:
+        await add_to_blacklist(payload["jti"], max(math.ceil(payload["exp"] - time.time()), 1))
+    except RedisError:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Could not revoke the token; retry shortly.",
+            headers={"Retry-After": "1"},
+        )
+    return None
+
 # ------------------------------------------------------------------------------
 # Calculations Endpoints (BREAD)
 # ------------------------------------------------------------------------------
+async def _run_db(db, fn, *args):
+    """
+    Run fn(session, *args) without blocking the event loop: in the threadpool
+    for a Session, or on the async connection for an AsyncSession.
+    """
+    if isinstance(db, AsyncSession):
+        return await db.run_sync(fn, *args)
+    return await run_in_threadpool(fn, db, *args)
+
+def _resolve_inputs(db: Session, calculation: Calculation, input_refs) -> None:
+    calculation.resolve_inputs(db, input_refs)
+
+def _persist_calculation(db: Session, calculation: Calculation) -> Calculation:
+    """Add (if new), commit and refresh a calculation, with the references its response reads."""
+    db.add(calculation)
+    db.commit()
+    db.refresh(calculation)
+    # Not lazy-loaded at serialization: the async stack cannot do I/O there.
+    db.refresh(calculation, ["dependencies"])
+    return calculation
+
+def _store_new_calculation(db: Session, calculation: Calculation):
+    """Store a new calculation, with a single INSERT ... RETURNING when it has no references."""
+    if calculation.dependencies:
+        return _persist_calculation(db, calculation)
+    row = calculation.insert_returning(db)
+    db.commit()
+    return row
+
+# Bodies read by read_calculation_payload as raw float64 values
+_BINARY_CONTENT_TYPES = ("application/octet-stream", "multipart/form-data")
+
+def _content_type(request: Request) -> str:
+    message = email.message.Message()
+    message["content-type"] = request.headers.get("content-type", "application/json")
+    return message.get_content_type()
+
+class CalculationRequest(Request):
+    """
+    Request for POST /calculations. Binary bodies are read here, at most
+    CALC_BINARY_MAX_BYTES, and hidden from FastAPI's JSON body parsing;
+    read_calculation_payload decodes them.
+    """
+
+    async def body(self) -> bytes:
+        if _content_type(self) not in _BINARY_CONTENT_TYPES:
+            return await super().body()
+        await self.binary_body()
+        return b""
+
+    async def binary_body(self) -> bytes:
+        """
+        Raises:
+            HTTPException: 413 if the body is larger than CALC_BINARY_MAX_BYTES
+        """
+        if not hasattr(self, "_body"):
+            limit = settings.CALC_BINARY_MAX_BYTES
+            too_large = HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail=f"Binary bodies are limited to {limit} bytes",
+            )
+            declared = self.headers.get("content-length", "")
+            if declared.isdigit() and int(declared) > limit:
+                raise too_large
+            chunks, size = [], 0
+            async for chunk in self.stream():
+                size += len(chunk)
+                if size > limit:
+                    raise too_large
+                chunks.append(chunk)
+            self._body = b"".join(chunks)
+        return self._body
+
+class CalculationRoute(APIRoute):
+    """Route whose handler receives a CalculationRequest."""
+
+    def get_route_handler(self):
+        handler = super().get_route_handler()
+
+        async def route_handler(request: Request) -> Response:
+            return await handler(CalculationRequest(request.scope, request.receive))
+
+        return route_handler
+
+async def read_calculation_payload(
+    request: Request,
+    type: Optional[str] = Query(
+        None,
+        description="Calculation type, required for application/octet-stream bodies"
+    ),
+    calculation: Optional[CalculationBase] = Body(None),
+) -> CalculationBase:
+    """
+    Read the create-calculation body as JSON or as raw float64 values.
+
+    JSON bodies are parsed and validated by FastAPI. `application/octet-stream`
+    bodies (with `?type=`) and `multipart/form-data` bodies (a `type` field
+    and an `inputs` file part) carry little-endian float64 values, which are
+    wrapped without copying and validated in one vectorized pass. Routes
+    using it are CalculationRoutes.
+    """
+    content_type = _content_type(request)
+    if content_type in _BINARY_CONTENT_TYPES:
+        if content_type == "multipart/form-data":
+            await request.binary_body()
+            form = await request.form(max_part_size=settings.CALC_BINARY_MAX_BYTES)
+            type = form.get("type")
+            upload = form.get("inputs")
+            data = await upload.read() if hasattr(upload, "read") else b""
+        else:
+            data = await request.binary_body()
+        try:
+            calc_type = CalculationBase.validate_type(type)
+            inputs = decode_float64(data)
+            validate_float64(calc_type, inputs)
+        except ValueError as e:
+            raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(e))
+        # Already validated above; skip the per-element list validators.
+        return CalculationBase.model_construct(type=CalculationType(calc_type), inputs=inputs)
+
+    if calculation is None:
+        raise RequestValidationError(
+            [{"type": "missing", "loc": ("body",), "msg": "Field required", "input": None}]
+        )
+    return calculation
+
+def _job_payload(calculation_data: CalculationBase) -> dict:
+    """The request as stored with its job (JSON; binary inputs become a list)."""
+    inputs = calculation_data.inputs
+    refs = calculation_data.input_refs
+    return {
+        "type": CalculationType(calculation_data.type).value,
+        "inputs": inputs.tolist() if hasattr(inputs, "tolist") else list(inputs),
+        "input_refs": {str(position): str(ref) for position, ref in refs.items()} if refs else None,
+    }
+
+def _add_job(db: Session, job_id: UUID, user_id, payload: dict) -> None:
+    CalculationJob.add(db, job_id, user_id, payload)
+    db.commit()
+
+def _discard_job(db: Session, job_id: UUID) -> None:
+    db.execute(delete(CalculationJob).where(CalculationJob.id == job_id))
+    db.commit()
+
+def _stale_before() -> datetime:
+    return datetime.utcnow() - timedelta(seconds=settings.CALC_JOB_STALE_SECONDS)
+
+def _claim_job(db: Session, job_id: UUID) -> bool:
+    claimed = CalculationJob.claim(db, job_id, _stale_before())
+    db.commit()
+    return claimed
+
+def _store_job_calculation(db: Session, calculation: Calculation):
+    """Store the job's calculation and mark the job succeeded in one transaction."""
+    CalculationJob.finish(db, calculation.id, CalculationJobStatus.SUCCEEDED)
+    return _store_new_calculation(db, calculation)
+
+def _fail_job(db: Session, job_id: UUID, error: str) -> None:
+    db.rollback()
+    CalculationJob.finish(db, job_id, CalculationJobStatus.FAILED, error)
+    db.commit()
+
+def _release_job(db: Session, job_id: UUID) -> None:
+    db.rollback()
+    CalculationJob.release(db, job_id)
+    db.commit()
+
+def _recoverable_jobs():
+    with SessionLocal() as db:
+        CalculationJob.prune(db, datetime.utcnow() - timedelta(seconds=settings.CALC_JOB_RETENTION_SECONDS))
+        db.commit()
+        return CalculationJob.recoverable(db, _stale_before(), settings.CALC_JOB_MAX_PENDING)
+
+async def _run_calculation_job(job_id: UUID, user_id, calculation_data: CalculationBase) -> Optional[CalculationResponse]:
+    """
+    Claim, compute and store one asynchronous calculation in its own session.
+
+    The outcome is recorded on the job row. A job that another worker has
+    claimed (or finished) is skipped; one interrupted by shutdown goes back
+    to pending and is run again by the next worker.
+    """
+    db = SessionLocal()
+    try:
+        if not await run_in_threadpool(_claim_job, db, job_id):
+            return None
+        try:
+            calculation = Calculation.create(
+                calculation_type=calculation_data.type,
+                user_id=user_id,
+                inputs=calculation_data.inputs,
+            )
+            calculation.id = job_id
+            if calculation_data.input_refs:
+                await run_in_threadpool(calculation.resolve_inputs, db, calculation_data.input_refs)
+            calculation.result = await calculation.aget_result()
+            if not isinstance(calculation.inputs, list) and settings.CALC_INPUTS_STORAGE == "json":
+                calculation.inputs = calculation.inputs.tolist()
+            stored = await run_in_threadpool(_store_job_calculation, db, calculation)
+            return CalculationResponse.model_validate(stored)
+        except asyncio.CancelledError:
+            await run_in_threadpool(_release_job, db, job_id)
+            raise
+        except ValueError as e:
+            await run_in_threadpool(_fail_job, db, job_id, str(e))
+            raise
+        except Exception:
+            await run_in_threadpool(_fail_job, db, job_id, "Internal error")
+            raise
+    finally:
+        await run_in_threadpool(db.close)
+
+def _queue_calculation_job(job_id: UUID, user_id, calculation_data: CalculationBase) -> None:
+    """Run a stored job on this worker; raises asyncio.QueueFull."""
+    calculation_jobs.submit(user_id, _run_calculation_job, job_id, user_id, calculation_data, job_id=job_id)
+
+async def _submit_calculation_job(calculation_data: CalculationBase, user_id, db) -> JSONResponse:
+    """Store and queue a calculation job and answer 202 with its id."""
+    job_id = uuid4()
+    await _run_db(db, _add_job, job_id, user_id, _job_payload(calculation_data))
+    try:
+        _queue_calculation_job(job_id, user_id, calculation_data)
+    except asyncio.QueueFull:
+        await _run_db(db, _discard_job, job_id)
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many pending calculation jobs",
+            headers={"Retry-After": "1"},
+        )
+    job = CalculationJobResponse(id=job_id, status=CalculationJobStatus.PENDING)
+    return JSONResponse(
+        status_code=status.HTTP_202_ACCEPTED,
+        content=job.model_dump(mode="json"),
+        headers={"Location": f"/jobs/{job_id}"},
+    )
+
 # Create (Add) Calculation – using CalculationBase so that 'user_id' from the client is ignored.
-@app.post(
-    "/calculations",
+CREATE_CALCULATION_ROUTE = dict(
+    methods=["POST"],
+    route_class_override=CalculationRoute,
     response_model=CalculationResponse,
     status_code=status.HTTP_201_CREATED,
     tags=["calculations"],
+    responses={
+        status.HTTP_202_ACCEPTED: {
+            "model": CalculationJobResponse,
+            "description": "Queued (mode=async); poll GET /jobs/{id}",
+        }
+    },
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                "application/octet-stream": {
+                    "schema": {"type": "string", "format": "binary"}
+                },
+                "multipart/form-data": {
+                    "schema": {
+                        "type": "object",
+                        "properties": {
+                            "type": {"$ref": "#/components/schemas/CalculationType"},
+                            "inputs": {"type": "string", "format": "binary"},
+                        },
+                        "required": ["type", "inputs"],
+                    }
+                },
+            },
+        }
+    },
 )
-def create_calculation(
-    calculation_data: CalculationBase,
+
+async def create_calculation(
+    calculation_data: CalculationBase = Depends(read_calculation_payload),
+    mode: Literal["sync", "async"] = Query(
+        "sync",
+        description="async: queue the calculation, answer 202 and poll GET /jobs/{id}"
+    ),
     current_user = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ):
@@ -165,7 +619,11 @@ def create_calculation(
     
     The endpoint reads the calculation type and inputs from the request (ignoring any extra fields),
     computes the result using the appropriate operation, and assigns the authenticated user's ID.
+    Very large inputs are reduced in the process pool while the request awaits the result.
+    With mode=async the request is validated, queued and answered at once.
     """
+    if mode == "async":
+        return await _submit_calculation_job(calculation_data, current_user.id, db)
     try:
         # Create the calculation using the factory method.
         new_calculation = Calculation.create(
@@ -173,75 +631,497 @@ def create_calculation(
             user_id=current_user.id,
             inputs=calculation_data.inputs,
         )
-        new_calculation.result = new_calculation.get_result()
+        if calculation_data.input_refs:
+            await _run_db(db, _resolve_inputs, new_calculation, calculation_data.input_refs)
+        new_calculation.result = await new_calculation.aget_result()
+        if not isinstance(new_calculation.inputs, list):
+            # Binary upload: short vectors reduce to a NumPy scalar, which
+            # the driver cannot bind, and the JSON column stores a plain list.
+            new_calculation.result = float(new_calculation.result)
+            if settings.CALC_INPUTS_STORAGE == "json":
+                new_calculation.inputs = new_calculation.inputs.tolist()
 
         # Persist the calculation to the database.
-        db.add(new_calculation)
-        db.commit()
-        db.refresh(new_calculation)
-        return new_calculation
+        return await _run_db(db, _store_new_calculation, new_calculation)
 
     except ValueError as e:
-        db.rollback()
+        await _run_db(db, Session.rollback)
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=str(e)
         )
 
+app.router.add_api_route("/calculations", create_calculation, **CREATE_CALCULATION_ROUTE)
+
+# Batch Create Calculations – one multi-row INSERT for the whole request.
+@app.post(
+    "/calculations/batch",
+    response_model=CalculationBatchResponse,
+    status_code=status.HTTP_201_CREATED,
+    tags=["calculations"],
+)
+def create_calculations_batch(
+    batch: CalculationBatchRequest,
+    current_user = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Compute and persist many calculations at once.
+
+    Each item is validated on its own; invalid items are reported in `errors`
+    by index and do not prevent the others from being created. Created rows
+    are returned in request order.
+    """
+    if len(batch.items) > settings.CALC_BATCH_MAX_ITEMS:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"A batch may contain at most {settings.CALC_BATCH_MAX_ITEMS} items."
+        )
+
+    errors = {}
+    indexes = []
+    items = []
+    for index, raw_item in enumerate(batch.items):
+        try:
+            item = CalculationBase.model_validate(raw_item)
+        except ValidationError as e:
+            errors[index] = e.errors()[0]["msg"].removeprefix("Value error, ")
+            continue
+        if item.input_refs:
+            errors[index] = "input_refs are not supported in batch requests."
+            continue
+        indexes.append(index)
+        items.append((item.type.value, item.inputs))
+
+    rows, insert_errors = Calculation.bulk_create(db, current_user.id, items)
+    db.commit()
+
+    for position, message in insert_errors.items():
+        errors[indexes[position]] = message
+
+    return CalculationBatchResponse(
+        created=[CalculationResponse.model_validate(row) for row in rows if row is not None],
+        errors=[
+            CalculationBatchError(index=index, detail=detail)
+            for index, detail in sorted(errors.items())
+        ],
+    )
+
+# Ingest Calculations – stream an NDJSON body and store it in fixed-size chunks.
+def _store_chunk(db: Session, user_id, items):
+    """Insert one chunk of calculations and commit it."""
+    rows, errors = Calculation.bulk_create(db, user_id, items)
+    db.commit()
+    return errors
+
+@app.post(
+    "/calculations/ingest",
+    response_model=CalculationIngestResponse,
+    tags=["calculations"],
+)
+async def ingest_calculations(
+    request: Request,
+    current_user = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Import calculations from an NDJSON request body.
+
+    Each line is a JSON object validated like CalculationBase. The body may be
+    gzip-encoded (`Content-Encoding: gzip`). Lines are stored in chunks of
+    CALC_INGEST_CHUNK_SIZE, each chunk in its own transaction, so memory stays
+    flat regardless of the upload size.
+    """
+    encoding = request.headers.get("content-encoding", "identity").lower()
+    if encoding not in ("identity", "gzip"):
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail="Content-Encoding must be gzip or identity."
+        )
+
+    lines = created = failed = 0
+    errors = []
+    chunk = []
+    chunk_lines = []
+
+    def record_error(line_number: int, detail: str):
+        nonlocal failed
+        failed += 1
+        if len(errors) < settings.CALC_INGEST_MAX_ERRORS:
+            errors.append(CalculationIngestError(line=line_number, detail=detail))
+
+    async def flush():
+        nonlocal created
+        chunk_errors = await run_in_threadpool(_store_chunk, db, current_user.id, chunk)
+        for position, detail in chunk_errors.items():
+            record_error(chunk_lines[position], detail)
+        created += len(chunk) - len(chunk_errors)
+        chunk.clear()
+        chunk_lines.clear()
+
+    try:
+        async for line_number, line in iter_ndjson_lines(
+            request.stream(),
+            gzipped=encoding == "gzip",
+            max_line_bytes=settings.CALC_INGEST_MAX_LINE_BYTES,
+        ):
+            if line is None:
+                lines += 1
+                record_error(line_number, "Line is too long.")
+                continue
+            if not line.strip():
+                continue
+            lines += 1
+            try:
+                item = CalculationBase.model_validate_json(line)
+            except ValidationError as e:
+                record_error(line_number, e.errors()[0]["msg"].removeprefix("Value error, "))
+                continue
+            if item.input_refs:
+                record_error(line_number, "input_refs are not supported in ingest.")
+                continue
+            chunk.append((item.type.value, item.inputs))
+            chunk_lines.append(line_number)
+            if len(chunk) >= settings.CALC_INGEST_CHUNK_SIZE:
+                await flush()
+    except zlib.error:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid gzip stream after {lines} lines; {created} calculations were stored."
+        )
+
+    if chunk:
+        await flush()
+
+    return CalculationIngestResponse(
+        lines=lines,
+        created=created,
+        failed=failed,
+        errors=errors,
+        errors_truncated=failed > len(errors),
+    )
+
+# Export Calculations – stream every matching row from a server-side cursor.
+def _accepts_gzip(request: Request) -> bool:
+    for coding in request.headers.get("accept-encoding", "").split(","):
+        name, *params = [part.strip() for part in coding.split(";")]
+        if name.lower() != "gzip":
+            continue
+        try:
+            return next((float(p[2:]) for p in params if p.startswith("q=")), 1.0) > 0
+        except ValueError:
+            return False
+    return False
+
+def _export_batches(bind, stmt):
+    """Yield batches of rows from a server-side cursor on a dedicated connection."""
+    with bind.connect() as conn:
+        result = conn.execution_options(
+            stream_results=True, yield_per=settings.CALC_EXPORT_BATCH_SIZE
+        ).execute(stmt)
+        yield from result.partitions()
+
+@app.get("/calculations/export", tags=["calculations"])
+def export_calculations(
+    request: Request,
+    params: Annotated[CalculationExportQuery, Query()],
+    current_user = Depends(get_current_active_user),
+    db: Session = Depends(get_read_db)
+):
+    """
+    Download the user's calculations, oldest first, as NDJSON or CSV.
+
+    Rows are read in batches of CALC_EXPORT_BATCH_SIZE from a server-side
+    cursor as plain tuples and written out batch by batch, so memory stays
+    flat regardless of the number of rows. The body is gzip-compressed when
+    the client sends `Accept-Encoding: gzip`.
+    """
+    stmt = (
+        select(
+            Calculation.id, Calculation.type, Calculation.inputs, Calculation.result,
+            Calculation.created_at, Calculation.updated_at,
+        )
+        .where(*Calculation.filter_clauses(current_user.id, params))
+        .order_by(Calculation.created_at, Calculation.id)
+    )
+    encode = encode_csv if params.format == "csv" else encode_ndjson
+    # The stream outlives this request's session, so it opens its own connection.
+    body = encode(_export_batches(db.get_bind(), stmt))
+    headers = {
+        "Content-Disposition": f'attachment; filename="calculations.{params.format}"',
+        "Vary": "Accept-Encoding",
+    }
+    if _accepts_gzip(request):
+        body = gzip_chunks(body, settings.CALC_EXPORT_GZIP_LEVEL)
+        headers["Content-Encoding"] = "gzip"
+    return StreamingResponse(body, media_type=MEDIA_TYPES[params.format], headers=headers)
+
+# Bulk Delete / Recompute – set-based statements over the filter, in bounded batches.
+def _check_bulk_ids(params: CalculationBulkFilter) -> None:
+    if params.ids is not None and len(params.ids) > settings.CALC_BULK_MAX_IDS:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"A bulk request may list at most {settings.CALC_BULK_MAX_IDS} ids."
+        )
+
+@app.delete("/calculations", response_model=CalculationBulkDeleteResponse, tags=["calculations"])
+def delete_calculations(
+    params: CalculationBulkFilter,
+    current_user = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Delete every calculation matching the filter (type, result, created_at range, ids).
+
+    Rows are deleted CALC_BULK_BATCH_SIZE at a time, each batch one
+    DELETE ... RETURNING in its own transaction, so locks and undo stay
+    bounded however many rows match. If the request fails part-way, the
+    batches already committed stay deleted.
+    """
+    _check_bulk_ids(params)
+    deleted = batches = 0
+    while True:
+        count = Calculation.delete_batch(db, current_user.id, params, settings.CALC_BULK_BATCH_SIZE)
+        db.commit()
+        if count:
+            batches += 1
+            deleted += count
+        if count < settings.CALC_BULK_BATCH_SIZE:
+            return CalculationBulkDeleteResponse(deleted=deleted, batches=batches)
+
+def _read_recompute_batch(db: Session, user_id, params: CalculationBulkFilter, after: Optional[UUID]):
+    stmt = Calculation.recompute_batch_statement(user_id, params, after, settings.CALC_BULK_BATCH_SIZE)
+    rows = db.execute(stmt).all()
+    # Release the read transaction; each batch is written in its own.
+    db.commit()
+    return rows
+
+def _store_recomputed(db: Session, rows, results):
+    stored = Calculation.store_recomputed(db, rows, results)
+    db.commit()
+    return stored
+
+_evaluate_batch = functools.partial(evaluate_many, return_exceptions=True)
+
+@app.post("/calculations/recompute", response_model=CalculationRecomputeResponse, tags=["calculations"])
+async def recompute_calculations(
+    params: CalculationBulkFilter,
+    parallel: bool = Query(False, description="Compute batches concurrently in the process pool"),
+    current_user = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Recompute and store the result of every calculation matching the filter.
+
+    Matching rows are read in id order, CALC_BULK_BATCH_SIZE at a time, and
+    each batch is evaluated by the vectorized engine. With `parallel=true`
+    up to one batch per process-pool worker is computed at once while
+    earlier batches are written. Each batch is written in its own
+    transaction, changed results only; rows edited in the meantime are left
+    alone. Calculations that reference a changed result are recomputed with
+    it (and counted in `updated`); a change that would make a dependent
+    uncomputable is reported as a failure and not written.
+    """
+    _check_bulk_ids(params)
+    loop = asyncio.get_running_loop()
+    window = pool_size() if parallel else 1
+    matched = updated = failed = batches = 0
+    errors = []
+    in_flight = []
+
+    def evaluate(rows):
+        items = [
+            (row.type, row.inputs.tolist() if hasattr(row.inputs, "tolist") else list(row.inputs))
+            for row in rows
+        ]
+        if parallel:
+            return loop.run_in_executor(get_pool(), _evaluate_batch, items)
+        return asyncio.ensure_future(run_in_threadpool(_evaluate_batch, items))
+
+    def fail(calc_id, detail):
+        nonlocal failed
+        failed += 1
+        if len(errors) < settings.CALC_BULK_MAX_ERRORS:
+            errors.append(CalculationRecomputeError(id=calc_id, detail=detail))
+
+    async def store(rows, computing):
+        nonlocal updated, batches
+        results = await computing
+        good_rows, good_results = [], []
+        for row, result in zip(rows, results):
+            if isinstance(result, Exception):
+                fail(row.id, "Cannot divide by zero." if isinstance(result, ZeroDivisionError) else str(result))
+            else:
+                good_rows.append(row)
+                good_results.append(result)
+        count, rejected = await run_in_threadpool(_store_recomputed, db, good_rows, good_results)
+        for calc_id, detail in rejected:
+            fail(calc_id, detail)
+        if count:
+            batches += 1
+            updated += count
+
+    try:
+        after = None
+        while True:
+            rows = await run_in_threadpool(_read_recompute_batch, db, current_user.id, params, after)
+            if rows:
+                matched += len(rows)
+                after = rows[-1].id
+                in_flight.append((rows, evaluate(rows)))
+            # Writes happen in read order, oldest batch first.
+            while in_flight and (len(in_flight) >= window or len(rows) < settings.CALC_BULK_BATCH_SIZE):
+                await store(*in_flight.pop(0))
+            if len(rows) < settings.CALC_BULK_BATCH_SIZE:
+                break
+    finally:
+        for _, computing in in_flight:
+            computing.cancel()
+
+    return CalculationRecomputeResponse(
+        matched=matched,
+        updated=updated,
+        failed=failed,
+        batches=batches,
+        errors=errors,
+        errors_truncated=failed > len(errors),
+    )
+
 # Browse / List Calculations (for the current user)
+def _page_statement(user_id, params: CalculationListQuery):
+    try:
+        return Calculation.page_statement(user_id, params)
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor.")
+
+def _set_next_page(request: Request, response: Response, next_cursor: Optional[str]) -> None:
+    """Advertise the next page in X-Next-Cursor and a Link header."""
+    if next_cursor is None:
+        return
+    response.headers["X-Next-Cursor"] = next_cursor
+    response.headers["Link"] = f'<{request.url.include_query_params(cursor=next_cursor)}>; rel="next"'
+
 @app.get("/calculations", response_model=List[CalculationResponse], tags=["calculations"])
 def list_calculations(
+    request: Request,
+    response: Response,
+    params: Annotated[CalculationListQuery, Query()],
     current_user = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
-    calculations = db.query(Calculation).filter(Calculation.user_id == current_user.id).all()
+    """
+    One page of the user's calculations, newest first unless order=asc.
+
+    The body stays a plain list; when more calculations match, the cursor
+    for the next page is returned in X-Next-Cursor (and as a rel="next" Link).
+    """
+    stmt = _page_statement(current_user.id, params)
+    calculations, next_cursor = Calculation.split_page(db.scalars(stmt).all(), params)
+    _set_next_page(request, response, next_cursor)
     return calculations
 
-# Read / Retrieve a Specific Calculation by ID
-@app.get("/calculations/{calc_id}", response_model=CalculationResponse, tags=["calculations"])
-def get_calculation(
-    calc_id: str,
+# Calculation Statistics (maintained on every write; no scan of calculations)
+def _stats_response(rows: List[CalculationStats]) -> CalculationStatsResponse:
+    return CalculationStatsResponse(
+        count=sum(row.count for row in rows),
+        by_type=[
+            CalculationTypeStats(
+                type=row.type,
+                count=row.count,
+                sum=row.result_sum,
+                min=row.result_min,
+                max=row.result_max,
+                average=row.result_sum / row.count if row.result_sum is not None else None,
+                last_created_at=row.last_created_at,
+            )
+            for row in rows
+        ],
+    )
+
+@app.get("/calculations/stats", response_model=CalculationStatsResponse, tags=["calculations"])
+def get_calculation_stats(
     current_user = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
+    rows = db.query(CalculationStats).filter(
+        CalculationStats.user_id == current_user.id
+    ).order_by(CalculationStats.type).all()
+    return _stats_response(rows)
+
+def _parse_calculation_id(calc_id: str) -> UUID:
     try:
-        calc_uuid = UUID(calc_id)
+        return UUID(calc_id)
     except ValueError:
         raise HTTPException(status_code=400, detail="Invalid calculation id format.")
-    calculation = db.query(Calculation).filter(
-        Calculation.id == calc_uuid,
-        Calculation.user_id == current_user.id
-    ).first()
+
+def _get_user_calculation(db: Session, calc_uuid: UUID, user_id) -> Calculation:
+    """Load one of the user's calculations or raise 404."""
+    calculation = Calculation.get_owned(db, calc_uuid, user_id)
     if not calculation:
         raise HTTPException(status_code=404, detail="Calculation not found.")
     return calculation
 
+# Read / Retrieve a Specific Calculation by ID
+@app.get("/calculations/{calc_id}", response_model=CalculationResponse, tags=["calculations"])
+def get_calculation(
+    calc_id: str,
+    current_user = Depends(get_current_active_user),
+    db: Session = Depends(get_read_db)
+):
+    calc_uuid = _parse_calculation_id(calc_id)
+    return _get_user_calculation(db, calc_uuid, current_user.id)
+
+def _finish_update(db: Session, calculation: Calculation, recompute: bool) -> Calculation:
+    """Recompute dependents (if needed), then commit and refresh."""
+    if recompute:
+        # Only the downstream subgraph is recomputed, in the same transaction.
+        calculation.recompute_dependents(db)
+    calculation.updated_at = datetime.utcnow()
+    return _persist_calculation(db, calculation)
+
+def _update_inputs(db: Session, calc_uuid: UUID, user_id, inputs):
+    row = Calculation.update_inputs_returning(db, calc_uuid, user_id, inputs)
+    if row is not None:
+        db.commit()
+    return row
+
 # Edit / Update a Calculation
 @app.put("/calculations/{calc_id}", response_model=CalculationResponse, tags=["calculations"])
-def update_calculation(
+async def update_calculation(
     calc_id: str,
     calculation_update: CalculationUpdate,
     current_user = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ):
+    calc_uuid = _parse_calculation_id(calc_id)
+    if calculation_update.inputs is not None and calculation_update.input_refs is None:
+        # Common case, one round trip on PostgreSQL; None means "use the ORM path".
+        updated = await _run_db(db, _update_inputs, calc_uuid, current_user.id, calculation_update.inputs)
+        if updated is not None:
+            return updated
+    calculation = await _run_db(db, _get_user_calculation, calc_uuid, current_user.id)
+
+    changed = calculation_update.inputs is not None or calculation_update.input_refs is not None
     try:
-        calc_uuid = UUID(calc_id)
-    except ValueError:
-        raise HTTPException(status_code=400, detail="Invalid calculation id format.")
-    calculation = db.query(Calculation).filter(
-        Calculation.id == calc_uuid,
-        Calculation.user_id == current_user.id
-    ).first()
-    if not calculation:
-        raise HTTPException(status_code=404, detail="Calculation not found.")
+        if calculation_update.inputs is not None:
+            calculation.inputs = calculation_update.inputs
+        if calculation_update.input_refs is not None:
+            await _run_db(db, _resolve_inputs, calculation, calculation_update.input_refs)
+        elif calculation_update.inputs is not None and calculation.input_refs:
+            # Keep existing references pointing at the new input list.
+            await _run_db(db, _resolve_inputs, calculation, calculation.input_refs)
+        if changed:
+            calculation.result = await calculation.aget_result()
+        return await _run_db(db, _finish_update, calculation, changed)
+    except ValueError as e:
+        await _run_db(db, Session.rollback)
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
-    if calculation_update.inputs is not None:
-        calculation.inputs = calculation_update.inputs
-        calculation.result = calculation.get_result()
-    calculation.updated_at = datetime.utcnow()
+def _delete_user_calculation(db: Session, calc_uuid: UUID, user_id) -> None:
+    """DELETE ... RETURNING and commit; an empty RETURNING is a 404."""
+    if not Calculation.delete_owned(db, calc_uuid, user_id):
+        raise HTTPException(status_code=404, detail="Calculation not found.")
     db.commit()
-    db.refresh(calculation)
-    return calculation
 
 # Delete a Calculation
 @app.delete("/calculations/{calc_id}", status_code=status.HTTP_204_NO_CONTENT, tags=["calculations"])
@@ -250,19 +1130,87 @@ def delete_calculation(
     current_user = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ):
+    calc_uuid = _parse_calculation_id(calc_id)
+    _delete_user_calculation(db, calc_uuid, current_user.id)
+    return None
+
+# ------------------------------------------------------------------------------
+# Calculation Jobs
+# ------------------------------------------------------------------------------
+def _load_job(db: Session, job_id: UUID, user_id) -> Optional[CalculationJob]:
+    return CalculationJob.get_owned(db, job_id, user_id)
+
+def _load_job_calculation(db: Session, job_id: UUID, user_id) -> Optional[Calculation]:
+    return Calculation.get_owned(db, job_id, user_id)
+
+@app.get("/jobs/{job_id}", response_model=CalculationJobResponse, tags=["calculations"])
+async def get_job(
+    job_id: str,
+    wait: float = Query(
+        0,
+        ge=0,
+        le=settings.CALC_JOB_MAX_WAIT_SECONDS,
+        description="Seconds to wait for the job to finish before answering (long-poll)"
+    ),
+    current_user = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Return the state of an asynchronous calculation job.
+
+    Job state is stored, so any worker can answer. Waiting on the worker
+    that runs the job is event based; other workers re-read the job every
+    CALC_JOB_POLL_SECONDS. Finished jobs are kept for
+    CALC_JOB_RETENTION_SECONDS; after that a succeeded job is answered from
+    its stored calculation, whose id is the job id.
+    """
     try:
-        calc_uuid = UUID(calc_id)
+        job_uuid = UUID(job_id)
     except ValueError:
-        raise HTTPException(status_code=400, detail="Invalid calculation id format.")
-    calculation = db.query(Calculation).filter(
-        Calculation.id == calc_uuid,
-        Calculation.user_id == current_user.id
-    ).first()
-    if not calculation:
-        raise HTTPException(status_code=404, detail="Calculation not found.")
-    db.delete(calculation)
-    db.commit()
-    return None
+        raise HTTPException(status_code=400, detail="Invalid job id format.")
+
+    job = await run_in_threadpool(_load_job, db, job_uuid, current_user.id)
+    if job is not None and not job.finished and wait > 0:
+        # The connection goes back to the pool while waiting; each read
+        # checks one out again, so pollers do not hold the pool.
+        local = calculation_jobs.get(job_uuid)
+        if local is not None:
+            await run_in_threadpool(db.close)
+            await calculation_jobs.wait(local, wait)
+            job = await run_in_threadpool(_load_job, db, job_uuid, current_user.id)
+        else:
+            deadline = time.monotonic() + wait
+            while job is not None and not job.finished and (remaining := deadline - time.monotonic()) > 0:
+                await run_in_threadpool(db.close)
+                await asyncio.sleep(min(settings.CALC_JOB_POLL_SECONDS, remaining))
+                job = await run_in_threadpool(_load_job, db, job_uuid, current_user.id)
+
+    if job is None or job.status == CalculationJobStatus.SUCCEEDED:
+        calculation = await run_in_threadpool(_load_job_calculation, db, job_uuid, current_user.id)
+        if calculation is None:
+            if job is None:
+                raise HTTPException(status_code=404, detail="Job not found.")
+            return CalculationJobResponse(id=job_uuid, status=job.status)
+        return CalculationJobResponse(
+            id=job_uuid,
+            status=CalculationJobStatus.SUCCEEDED,
+            calculation=CalculationResponse.model_validate(calculation),
+        )
+    return CalculationJobResponse(id=job.id, status=job.status, error=job.error)
+
+# ------------------------------------------------------------------------------
+# Async Stack (opt-in with DATABASE_ASYNC)
+# ------------------------------------------------------------------------------
+if settings.DATABASE_ASYNC:
+    from app.routers.async_api import router as async_router
+
+    # Serve the async handlers in place of the sync ones for the same routes.
+    replaced = {(route.path, method) for route in async_router.routes for method in route.methods}
+    app.router.routes = [
+        route for route in app.router.routes
+        if not (isinstance(route, APIRoute) and {(route.path, m) for m in route.methods} & replaced)
+    ]
+    app.include_router(async_router)
 
 # ------------------------------------------------------------------------------
 # Main Block to Run the Server
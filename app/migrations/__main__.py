@@ -0,0 +1,17 @@
+# app/migrations/__main__.py
+"""Apply pending schema migrations: python -m app.migrations [--status]"""
+import argparse
+import logging
+
+from app.migrations.schema import LATEST_VERSION, current_version, migrate
+
+if __name__ == "__main__":  # pragma: no cover
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--status", action="store_true", help="Print the versions and exit")
+    args = parser.parse_args()
+    if args.status:
+        print(f"current: {current_version()} latest: {LATEST_VERSION}")
+    else:
+        applied = migrate()
+        print(f"applied: {applied or 'nothing'}; schema version {current_version()}")
@@ -0,0 +1,146 @@
+# app/migrations/pack_inputs.py
+"""
+Convert calculations.inputs from JSON to the packed BYTEA format.
+
+Rows are converted in batches into a side column while the application keeps
+running; the final swap happens under a short ACCESS EXCLUSIVE lock. Deploy
+with CALC_INPUTS_STORAGE=packed once the migration has finished.
+
+While it runs, a trigger clears inputs_packed whenever the application
+writes inputs, so a row edited after its batch is converted again by the
+final pass instead of being swapped in with stale inputs. Each pass walks
+the table once in id order (keyset pagination), not from the start per batch.
+
+    python -m app.migrations.pack_inputs [--batch-size N]
+"""
+import argparse
+import json
+import logging
+
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+from app.database import engine
+from app.operations.packing import encode_inputs
+
+logger = logging.getLogger(__name__)
+
+_SELECT_BATCH = text(
+    "SELECT id, inputs FROM calculations WHERE inputs_packed IS NULL AND id > :last "
+    "ORDER BY id LIMIT :limit"
+)
+_UPDATE_ROW = text("UPDATE calculations SET inputs_packed = :packed WHERE id = :id")
+# Lowest UUID: a pass starts below every id
+_FIRST_ID = "00000000-0000-0000-0000-000000000000"
+
+_CREATE_INVALIDATE_TRIGGER = (
+    """
+    CREATE OR REPLACE FUNCTION calculations_invalidate_packed() RETURNS trigger AS $$
+    BEGIN
+        NEW.inputs_packed := NULL;
+        RETURN NEW;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    "DROP TRIGGER IF EXISTS calculations_invalidate_packed ON calculations",
+    """
+    CREATE TRIGGER calculations_invalidate_packed
+    BEFORE UPDATE OF inputs ON calculations
+    FOR EACH ROW EXECUTE FUNCTION calculations_invalidate_packed()
+    """,
+)
+_DROP_INVALIDATE_TRIGGER = (
+    "DROP TRIGGER IF EXISTS calculations_invalidate_packed ON calculations",
+    "DROP FUNCTION IF EXISTS calculations_invalidate_packed()",
+)
+
+
+def is_packed(bind: Engine) -> bool:
+    """Return True if calculations.inputs is already a binary column."""
+    columns = {col["name"]: col for col in inspect(bind).get_columns("calculations")}
+    return columns["inputs"]["type"].python_type is bytes
+
+
+def _convert_batch(conn, batch_size: int, last):
+    """
+    Pack the next batch of unconverted rows after id ``last``.
+
+    Returns:
+        (number converted, id to continue after); 0 when the pass is done
+    """
+    rows = conn.execute(_SELECT_BATCH, {"last": last, "limit": batch_size}).all()
+    if not rows:
+        return 0, last
+    params = []
+    for row_id, inputs in rows:
+        if isinstance(inputs, str):
+            inputs = json.loads(inputs)
+        params.append({
+            "id": row_id,
+            "packed": encode_inputs(inputs, settings.CALC_INPUTS_COMPRESS_MIN_BYTES),
+        })
+    conn.execute(_UPDATE_ROW, params)
+    return len(rows), rows[-1][0]
+
+
+def prepare(bind: Engine) -> None:
+    """Add the side column and the trigger that invalidates it on writes to inputs."""
+    with bind.begin() as conn:
+        conn.execute(text("ALTER TABLE calculations ADD COLUMN IF NOT EXISTS inputs_packed BYTEA"))
+        for statement in _CREATE_INVALIDATE_TRIGGER:
+            conn.execute(text(statement))
+
+
+def convert_online(bind: Engine, batch_size: int) -> int:
+    """One pass over the table, one transaction per batch; returns rows converted."""
+    converted, last = 0, _FIRST_ID
+    while True:
+        # One transaction per batch keeps row locks short.
+        with bind.begin() as conn:
+            count, last = _convert_batch(conn, batch_size, last)
+        if not count:
+            return converted
+        converted += count
+        logger.info("Packed %d calculations", converted)
+
+
+def migrate(bind: Engine = engine, batch_size: int = 1000) -> int:
+    """
+    Run the migration; safe to re-run after an interruption.
+
+    Returns:
+        int: Number of rows converted
+    """
+    if is_packed(bind):
+        logger.info("calculations.inputs is already packed")
+        return 0
+
+    prepare(bind)
+    converted = convert_online(bind, batch_size)
+
+    with bind.begin() as conn:
+        conn.execute(text("LOCK TABLE calculations IN ACCESS EXCLUSIVE MODE"))
+        # Rows written or edited by the application since their batch.
+        last = _FIRST_ID
+        while True:
+            count, last = _convert_batch(conn, batch_size, last)
+            if not count:
+                break
+            converted += count
+        for statement in _DROP_INVALIDATE_TRIGGER:
+            conn.execute(text(statement))
+        conn.execute(text("ALTER TABLE calculations DROP COLUMN inputs"))
+        conn.execute(text("ALTER TABLE calculations RENAME COLUMN inputs_packed TO inputs"))
+        conn.execute(text("ALTER TABLE calculations ALTER COLUMN inputs SET NOT NULL"))
+
+    logger.info("Migration finished: %d calculations packed", converted)
+    return converted
+
+
+if __name__ == "__main__":  # pragma: no cover
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    migrate(batch_size=args.batch_size)
@@ -0,0 +1,36 @@
+# app/migrations/rebuild_stats.py
+"""
+Rebuild calculation_stats from the calculations table.
+
+The stats are maintained incrementally on every write; run this after bulk
+changes made outside the application, or to reset floating-point drift in
+the running sums.
+
+    python -m app.migrations.rebuild_stats
+"""
+import logging
+
+from sqlalchemy.engine import Engine
+
+from app.database import engine
+from app.models.calculation import CalculationStats
+
+logger = logging.getLogger(__name__)
+
+
+def rebuild(bind: Engine = engine) -> int:
+    """
+    Replace every stats row in one transaction.
+
+    Returns:
+        int: Number of stats rows written
+    """
+    with bind.begin() as conn:
+        count = CalculationStats.rebuild(conn)
+    logger.info("Rebuilt %d calculation stats rows", count)
+    return count
+
+
+if __name__ == "__main__":  # pragma: no cover
+    logging.basicConfig(level=logging.INFO)
+    rebuild()
@@ -0,0 +1,280 @@
+# app/migrations/schema.py
+"""
+Versioned schema migrations.
+
+Each migration runs once, in its own transaction, and is recorded in the
+schema_migrations table. ``migrate`` applies pending migrations under a
+PostgreSQL advisory lock, so concurrent deploys and workers wait for one
+runner instead of racing. Worker startup calls ``ensure_schema``, which is a
+single ``SELECT max(version)`` when the schema is already current.
+
+Change the schema by appending a migration to MIGRATIONS; existing
+migrations must not be edited once deployed. Migrations are written as
+frozen DDL (the baseline tables below, then explicit statements), never
+derived from the live models, so a migration keeps meaning what it meant
+when it shipped. tests/integration/test_migrations.py checks that the
+migrated schema matches the models.
+
+    python -m app.migrations            # apply pending migrations
+    python -m app.migrations --status   # print current and latest version
+"""
+import logging
+from datetime import datetime
+from typing import Callable, List, NamedTuple
+
+from sqlalchemy import (
+    JSON, BigInteger, Boolean, Column, DateTime, Float, ForeignKey, Index, Integer, MetaData, String, Table,
+    func, select, text,
+)
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import DBAPIError
+
+from app.core.config import settings
+from app.database import engine
+from app.migrations.pack_inputs import is_packed
+
+logger = logging.getLogger(__name__)
+
+# Kept out of Base.metadata so create_all/drop_all of the models never
+# touch the migration history.
+metadata = MetaData()
+schema_migrations = Table(
+    "schema_migrations",
+    metadata,
+    Column("version", Integer, primary_key=True),
+    Column("name", String(200), nullable=False),
+    Column("applied_at", DateTime, nullable=False, default=datetime.utcnow),
+)
+
+# Arbitrary advisory lock key: one migration runner at a time.
+_MIGRATION_LOCK = 0x6D696772
+
+
+class Migration(NamedTuple):
+    version: int
+    name: str
+    upgrade: Callable
+
+
+# The tables as of migration 1. Frozen: later changes are new migrations.
+_baseline_metadata = MetaData()
+Table(
+    "users",
+    _baseline_metadata,
+    Column("id", UUID(as_uuid=True), primary_key=True, unique=True, index=True),
+    Column("username", String(50), unique=True, nullable=False, index=True),
+    Column("email", String, unique=True, nullable=False, index=True),
+    Column("password", String, nullable=False),
+    Column("first_name", String(50), nullable=False),
+    Column("last_name", String(50), nullable=False),
+    Column("is_active", Boolean),
+    Column("is_verified", Boolean),
+    Column("created_at", DateTime(timezone=True), nullable=False),
+    Column("updated_at", DateTime(timezone=True), nullable=False),
+    Column("last_login", DateTime(timezone=True), nullable=True),
+)
+Table(
+    "calculations",
+    _baseline_metadata,
+    Column("id", UUID(as_uuid=True), primary_key=True, nullable=False),
+    Column("user_id", UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True),
+    Column("type", String(50), nullable=False, index=True),
+    Column("inputs", JSON, nullable=False),
+    Column("result", Float, nullable=True),
+    Column("created_at", DateTime, nullable=False),
+    Column("updated_at", DateTime, nullable=False),
+)
+Table(
+    "calculation_dependencies",
+    _baseline_metadata,
+    Column("calculation_id", UUID(as_uuid=True), ForeignKey("calculations.id", ondelete="CASCADE"),
+           primary_key=True),
+    Column("position", Integer, primary_key=True),
+    Column("depends_on_id", UUID(as_uuid=True), ForeignKey("calculations.id", ondelete="CASCADE"),
+           nullable=False, index=True),
+)
+Table(
+    "calculation_stats",
+    _baseline_metadata,
+    Column("user_id", UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), primary_key=True),
+    Column("type", String(50), primary_key=True),
+    Column("count", BigInteger, nullable=False),
+    Column("result_sum", Float, nullable=True),
+    Column("result_min", Float, nullable=True),
+    Column("result_max", Float, nullable=True),
+    Column("last_created_at", DateTime, nullable=True),
+)
+
+
+def _baseline(conn) -> None:
+    # Tables that already exist (databases set up with create_all) are kept.
+    _baseline_metadata.create_all(conn)
+
+
+def _keyset_indexes(conn) -> None:
+    # create_all never added indexes to tables that already existed.
+    conn.execute(text(
+        "CREATE INDEX IF NOT EXISTS ix_calculations_user_created "
+        "ON calculations (user_id, created_at, id)"
+    ))
+    conn.execute(text(
+        "CREATE INDEX IF NOT EXISTS ix_calculations_user_type_created "
+        "ON calculations (user_id, type, created_at, id)"
+    ))
+
+
+def _backfill_stats(conn) -> None:
+    # calculation_stats was created empty next to existing calculations.
+    conn.execute(text("DELETE FROM calculation_stats"))
+    conn.execute(text(
+        "INSERT INTO calculation_stats "
+        "(user_id, type, count, result_sum, result_min, result_max, last_created_at) "
+        "SELECT user_id, type, count(*), sum(result), min(result), max(result), max(created_at) "
+        "FROM calculations GROUP BY user_id, type"
+    ))
+
+
+def _token_generation(conn) -> None:
+    conn.execute(text("ALTER TABLE users ADD COLUMN token_generation INTEGER NOT NULL DEFAULT 0"))
+
+
+def _calculation_jobs(conn) -> None:
+    tables = MetaData()
+    # Only to resolve the foreign key; users already exists.
+    Table("users", tables, Column("id", UUID(as_uuid=True), primary_key=True))
+    jobs = Table(
+        "calculation_jobs",
+        tables,
+        Column("id", UUID(as_uuid=True), primary_key=True),
+        Column("user_id", UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False),
+        Column("status", String(20), nullable=False),
+        Column("payload", JSON, nullable=False),
+        Column("error", String, nullable=True),
+        Column("created_at", DateTime, nullable=False),
+        Column("updated_at", DateTime, nullable=False),
+        Column("finished_at", DateTime, nullable=True),
+        Index("ix_calculation_jobs_status_updated", "status", "updated_at"),
+        Index("ix_calculation_jobs_finished", "finished_at"),
+    )
+    jobs.create(conn)
+
+
+def _result_filter_indexes(conn) -> None:
+    conn.execute(text(
+        "CREATE INDEX IF NOT EXISTS ix_calculations_user_result "
+        "ON calculations (user_id, result, created_at, id)"
+    ))
+    conn.execute(text(
+        "CREATE INDEX IF NOT EXISTS ix_calculations_user_type_result "
+        "ON calculations (user_id, type, result, created_at, id)"
+    ))
+
+
+MIGRATIONS: List[Migration] = [
+    Migration(1, "baseline schema", _baseline),
+    Migration(2, "keyset pagination indexes on calculations", _keyset_indexes),
+    Migration(3, "backfill calculation_stats", _backfill_stats),
+    Migration(4, "users.token_generation", _token_generation),
+    Migration(5, "calculation_jobs", _calculation_jobs),
+    Migration(6, "result filter indexes on calculations", _result_filter_indexes),
+]
+LATEST_VERSION = MIGRATIONS[-1].version
+
+
+def current_version(bind: Engine = engine) -> int:
+    """Highest applied migration; 0 for a database that has never been migrated."""
+    with bind.connect() as conn:
+        try:
+            return conn.execute(select(func.max(schema_migrations.c.version))).scalar() or 0
+        except DBAPIError:
+            # No schema_migrations table yet
+            return 0
+
+
+def migrate(bind: Engine = engine) -> List[int]:
+    """
+    Apply every pending migration.
+
+    Returns:
+        list: Versions applied by this call (empty if another runner did them)
+    """
+    applied = []
+    with bind.connect() as lock:
+        postgres = bind.dialect.name == "postgresql"
+        if postgres:
+            # Blocks until any other runner has finished.
+            lock.execute(text("SELECT pg_advisory_lock(:key)"), {"key": _MIGRATION_LOCK})
+            lock.commit()
+        try:
+            metadata.create_all(bind)
+            version = current_version(bind)
+            for migration in MIGRATIONS:
+                if migration.version <= version:
+                    continue
+                logger.info("Applying migration %d: %s", migration.version, migration.name)
+                with bind.begin() as conn:
+                    migration.upgrade(conn)
+                    conn.execute(schema_migrations.insert().values(
+                        version=migration.version, name=migration.name
+                    ))
+                applied.append(migration.version)
+        finally:
+            if postgres:
+                lock.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": _MIGRATION_LOCK})
+                lock.commit()
+    return applied
+
+
+def ensure_schema(bind: Engine = engine) -> int:
+    """
+    Startup check: make sure the database is at LATEST_VERSION.
+
+    When the schema is current this costs one query. Otherwise pending
+    migrations are applied if DATABASE_MIGRATE_ON_START is set.
+
+    Returns:
+        int: The schema version
+
+    Raises:
+        RuntimeError: If the schema is behind and migrating on start is disabled
+    """
+    version = current_version(bind)
+    if version > LATEST_VERSION:
+        logger.warning("Database schema version %d is newer than this code (%d)", version, LATEST_VERSION)
+    if version >= LATEST_VERSION:
+        return version
+    if not settings.DATABASE_MIGRATE_ON_START:
+        raise RuntimeError(
+            f"Database schema is at version {version}, expected {LATEST_VERSION}; "
+            "run python -m app.migrations"
+        )
+    migrate(bind)
+    return current_version(bind)
+
+
+def check_inputs_storage(bind: Engine = engine) -> None:
+    """
+    Startup check: calculations.inputs must have the type CALC_INPUTS_STORAGE expects.
+
+    The packed conversion is not one of MIGRATIONS (it runs online, batch by
+    batch, see app.migrations.pack_inputs), so a migrated database keeps its
+    JSON column until that has run.
+
+    Raises:
+        RuntimeError: If the column and the setting disagree
+    """
+    packed = is_packed(bind)
+    if settings.CALC_INPUTS_STORAGE == "packed" and not packed:
+        raise RuntimeError(
+            "CALC_INPUTS_STORAGE is packed but calculations.inputs is JSON; "
+            "run python -m app.migrations.pack_inputs"
+        )
+    if settings.CALC_INPUTS_STORAGE != "packed" and packed:
+        raise RuntimeError(
+            "calculations.inputs is packed; set CALC_INPUTS_STORAGE=packed"
+        )
+
+
+def drop_history(bind: Engine = engine) -> None:
+    metadata.drop_all(bind)
@@ -1,2 +1,3 @@
 from .user import User
-from .calculation import Calculation
\ No newline at end of file
+from .calculation import Calculation, CalculationDependency, CalculationStats
+from .job import CalculationJob
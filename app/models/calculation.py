@@ -1,12 +1,30 @@
 # app/models/calculation.py
-from datetime import datetime
+import base64
+import json
+import math
+from datetime import datetime, timezone
+from functools import lru_cache
+from graphlib import TopologicalSorter
 import uuid
-from typing import List
-from sqlalchemy import Column, String, DateTime, ForeignKey, JSON, Float
-from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.orm import relationship, declared_attr
+from typing import Dict, List, Optional, Sequence, Tuple
+from sqlalchemy import (
+    BigInteger, Column, String, DateTime, ForeignKey, Index, Integer, JSON, Float,
+    bindparam, case, delete, event, exists, func, insert, or_, select, text, tuple_, update,
+)
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.dialects.postgresql import UUID, insert as pg_insert
+from sqlalchemy.orm import Session, attributes, relationship, declared_attr, selectinload
 from sqlalchemy.ext.declarative import declared_attr
+from starlette.concurrency import run_in_threadpool
+from app.core.config import settings
 from app.database import Base
+from app.models.types import PackedFloatArray
+from app.operations.memo import memoize_result
+from app.operations.parallel import reduce_in_pool
+from app.schemas.calculation import (
+    CalculationBulkFilter, CalculationFilter, CalculationListQuery, CalculationType,
+)
+from app.operations.vectorized import evaluate_many, is_packed, is_vector, reduce_inputs
 
 class AbstractCalculation:
     """Abstract base class for calculations"""
@@ -44,7 +62,7 @@ class AbstractCalculation:
     @declared_attr
     def inputs(cls):
         return Column(
-            JSON, 
+            PackedFloatArray if settings.CALC_INPUTS_STORAGE == "packed" else JSON,
             nullable=False
         )
 
@@ -76,6 +94,22 @@ class AbstractCalculation:
     def user(cls):
         return relationship("User", back_populates="calculations")
 
+    @declared_attr
+    def dependencies(cls):
+        return relationship(
+            "CalculationDependency",
+            foreign_keys="CalculationDependency.calculation_id",
+            cascade="all, delete-orphan",
+            order_by="CalculationDependency.position",
+        )
+
+    @property
+    def input_refs(self) -> Optional[Dict[int, uuid.UUID]]:
+        """Map of input position to the id of the calculation feeding it."""
+        if not self.dependencies:
+            return None
+        return {dep.position: dep.depends_on_id for dep in self.dependencies}
+
     @classmethod
     def create(cls, calculation_type: str, user_id: uuid.UUID, inputs: List[float]) -> "Calculation":
         """Factory method to create calculations"""
@@ -94,6 +128,211 @@ class AbstractCalculation:
         """Method to compute calculation result"""
         raise NotImplementedError
 
+    async def aget_result(self) -> float:
+        """
+        Compute the result without blocking the event loop.
+
+        Inputs of CALC_PARALLEL_THRESHOLD elements or more are reduced across
+        the process pool; inputs of CALC_THREADPOOL_THRESHOLD or more run
+        get_result in the threadpool and shorter ones are computed inline.
+        """
+        if not is_vector(self.inputs) or len(self.inputs) < settings.CALC_THREADPOOL_THRESHOLD:
+            return self.get_result()
+        if len(self.inputs) < settings.CALC_PARALLEL_THRESHOLD:
+            return await run_in_threadpool(self.get_result)
+        try:
+            return await reduce_in_pool(self.type, self.inputs)
+        except ZeroDivisionError:
+            raise ValueError("Cannot divide by zero.")
+
+    @classmethod
+    def bulk_create(
+        cls,
+        db,
+        user_id: uuid.UUID,
+        items: Sequence[Tuple[str, List[float]]],
+    ) -> Tuple[List[Optional[object]], Dict[int, str]]:
+        """
+        Compute and insert many calculations with a single multi-row INSERT ... RETURNING.
+
+        Results are computed together by the vectorized engine. The insert runs
+        inside a savepoint; if it fails, each row is retried in its own savepoint
+        so that one bad row does not abort the rest. The caller commits.
+
+        Args:
+            db: SQLAlchemy database session
+            user_id: Owner of the new calculations
+            items: Sequence of (calculation type, inputs) pairs
+
+        Returns:
+            tuple: (rows, errors) where rows is aligned with items and holds the
+            inserted row or None, and errors maps item index to an error message
+        """
+        errors: Dict[int, str] = {}
+        results = evaluate_many(
+            [(calc_type.lower(), inputs) for calc_type, inputs in items],
+            return_exceptions=True,
+        )
+
+        params = []
+        indexes = []
+        now = datetime.utcnow()
+        for index, ((calc_type, inputs), result) in enumerate(zip(items, results)):
+            if isinstance(result, ZeroDivisionError):
+                errors[index] = "Cannot divide by zero."
+            elif isinstance(result, Exception):
+                errors[index] = str(result)
+            else:
+                indexes.append(index)
+                params.append({
+                    "id": uuid.uuid4(),
+                    "user_id": user_id,
+                    "type": calc_type.lower(),
+                    "inputs": list(inputs),
+                    "result": result,
+                    "created_at": now,
+                    "updated_at": now,
+                })
+
+        rows: List[Optional[object]] = [None] * len(items)
+        if not params:
+            return rows, errors
+
+        table = cls.__table__
+        stmt = insert(table).returning(*table.c, sort_by_parameter_order=True)
+        try:
+            with db.begin_nested():
+                inserted = db.execute(stmt, params).all()
+            for index, row in zip(indexes, inserted):
+                rows[index] = row
+        except SQLAlchemyError:
+            # Fall back to one savepoint per row to isolate the failures.
+            for index, row_params in zip(indexes, params):
+                try:
+                    with db.begin_nested():
+                        rows[index] = db.execute(stmt, row_params).one()
+                except SQLAlchemyError:
+                    errors[index] = "Could not store calculation."
+        # Core inserts bypass the ORM flush hook that maintains the stats.
+        CalculationStats.apply_changes(
+            db.connection(),
+            added=[(row.user_id, row.type, row.result, row.created_at) for row in rows if row is not None],
+        )
+        return rows, errors
+
+    def downstream_ids(self, db) -> List[uuid.UUID]:
+        """
+        Return the ids of every calculation that depends on this one, directly
+        or transitively, using a single recursive query over the dependency edges.
+        """
+        edges = CalculationDependency.__table__
+        downstream = (
+            select(edges.c.calculation_id)
+            .where(edges.c.depends_on_id == self.id)
+            .cte("downstream", recursive=True)
+        )
+        downstream = downstream.union(
+            select(edges.c.calculation_id).join(
+                downstream, edges.c.depends_on_id == downstream.c.calculation_id
+            )
+        )
+        return list(db.scalars(select(downstream.c.calculation_id)))
+
+    def resolve_inputs(self, db, input_refs: Dict[int, uuid.UUID]) -> None:
+        """
+        Point the given input positions at other calculations' results.
+
+        The referenced results are copied into ``inputs`` and the dependency
+        edges are replaced. An empty mapping removes all references.
+
+        Args:
+            db: SQLAlchemy database session
+            input_refs: Map of input position to referenced calculation id
+
+        Raises:
+            ValueError: If a position is out of range, a reference is missing,
+                owned by another user or has no result, or the references
+                would form a cycle
+        """
+        inputs = list(self.inputs)
+        for position in input_refs:
+            if not 0 <= position < len(inputs):
+                raise ValueError(f"Input reference position {position} is out of range.")
+
+        ref_ids = set(input_refs.values())
+        if ref_ids and self.id is not None:
+            if self.id in ref_ids or ref_ids & set(self.downstream_ids(db)):
+                raise ValueError("Calculation references would create a cycle.")
+
+        referenced = {}
+        if ref_ids:
+            referenced = {
+                calc.id: calc
+                for calc in db.query(Calculation).filter(
+                    Calculation.id.in_(ref_ids),
+                    Calculation.user_id == self.user_id,
+                )
+            }
+        for position, ref_id in input_refs.items():
+            if ref_id not in referenced:
+                raise ValueError(f"Referenced calculation {ref_id} not found.")
+            if referenced[ref_id].result is None:
+                raise ValueError(f"Referenced calculation {ref_id} has no result.")
+            inputs[position] = referenced[ref_id].result
+
+        self.inputs = inputs
+        self.dependencies = [
+            CalculationDependency(position=position, depends_on_id=ref_id)
+            for position, ref_id in sorted(input_refs.items())
+        ]
+
+    def recompute_dependents(self, db) -> List["Calculation"]:
+        """
+        Recompute every calculation downstream of this one, in topological order.
+
+        Only the affected subgraph is loaded. Changes are made in the current
+        transaction; the caller commits.
+
+        Returns:
+            list: The recomputed calculations, in the order they were updated
+
+        Raises:
+            ValueError: If a dependent can no longer be computed (e.g. a
+                referenced result became a zero divisor)
+        """
+        ids = self.downstream_ids(db)
+        if not ids:
+            return []
+
+        nodes = {
+            calc.id: calc
+            for calc in db.query(Calculation).options(selectinload(Calculation.dependencies)).filter(
+                Calculation.id.in_(ids)
+            )
+        }
+        results = {self.id: self.result}
+        graph = TopologicalSorter()
+        for calc in nodes.values():
+            graph.add(calc.id, *[
+                dep.depends_on_id for dep in calc.dependencies
+                if dep.depends_on_id in nodes
+            ])
+
+        now = datetime.utcnow()
+        recomputed = []
+        for calc_id in graph.static_order():
+            calc = nodes[calc_id]
+            inputs = list(calc.inputs)
+            for dep in calc.dependencies:
+                if dep.depends_on_id in results:
+                    inputs[dep.position] = results[dep.depends_on_id]
+            calc.inputs = inputs
+            calc.result = calc.get_result()
+            calc.updated_at = now
+            results[calc.id] = calc.result
+            recomputed.append(calc)
+        return recomputed
+
     def __repr__(self):
         return f"<Calculation(type={self.type}, inputs={self.inputs})>"
 
@@ -105,26 +344,549 @@ class Calculation(Base, AbstractCalculation):
         #"with_polymorphic": "*"
     }
 
+    @classmethod
+    def get_owned(cls, db, calc_id: uuid.UUID, user_id: uuid.UUID) -> Optional["Calculation"]:
+        """Return the user's calculation with this id, or None, via a pre-built statement."""
+        return db.execute(_owned_calculation(), {"calc_id": calc_id, "user_id": user_id}).scalars().first()
+
+    def insert_returning(self, db):
+        """
+        INSERT this new calculation with RETURNING and return the stored row.
+
+        Replaces add + commit + refresh: the id and timestamps are generated
+        client-side and the row comes back from the INSERT itself, so no
+        SELECT follows the commit. Calculations with input references go
+        through the ORM instead (their edges are separate rows). The stats
+        are updated in the same transaction; the caller commits.
+        """
+        t = Calculation.__table__
+        row = db.execute(
+            insert(t)
+            .values(
+                id=self.id or uuid.uuid4(), user_id=self.user_id, type=self.type,
+                inputs=self.inputs, result=self.result,
+            )
+            .returning(*t.c)
+        ).one()
+        CalculationStats.apply_changes(
+            db.connection(), added=[(row.user_id, row.type, row.result, row.created_at)]
+        )
+        return row
+
+    @classmethod
+    def update_inputs_returning(cls, db, calc_id: uuid.UUID, user_id: uuid.UUID, inputs: List[float]):
+        """
+        Replace a calculation's inputs and result in one UPDATE ... RETURNING.
+
+        The type is not known before the row is read, so the result is
+        computed for every type up front and picked with CASE on the stored
+        type. The previous result, needed for the stats, is read by a
+        locking CTE in the same statement. PostgreSQL only (SQLite's
+        RETURNING cannot see pre-update values).
+
+        Returns:
+            The updated row, or None if nothing was updated: the calculation
+            does not exist or is not the user's, it has input references or
+            dependents, the inputs are invalid for its type, or the backend
+            is not PostgreSQL. Callers fall back to the ORM path, which
+            reports those cases.
+        """
+        if db.get_bind().dialect.name != "postgresql" or len(inputs) >= settings.CALC_THREADPOOL_THRESHOLD:
+            return None
+        results = {}
+        for calc_type in CalculationType:
+            try:
+                results[calc_type.value] = cls.create(calc_type.value, user_id, inputs).get_result()
+            except (ValueError, ZeroDivisionError):
+                pass
+        if not results:
+            return None
+
+        t = Calculation.__table__
+        edges = CalculationDependency.__table__
+        old = (
+            select(t.c.id, t.c.result)
+            .where(t.c.id == calc_id, t.c.user_id == user_id)
+            .with_for_update()
+            .cte("old")
+        )
+        row = db.execute(
+            update(t)
+            .where(
+                t.c.id == old.c.id,
+                t.c.type.in_(list(results)),
+                ~exists().where(or_(edges.c.calculation_id == t.c.id, edges.c.depends_on_id == t.c.id)),
+            )
+            .values(inputs=inputs, result=case(results, value=t.c.type))
+            .returning(*t.c, old.c.result.label("previous_result"))
+        ).first()
+        if row is not None:
+            CalculationStats.apply_changes(
+                db.connection(),
+                added=[(row.user_id, row.type, row.result, None)],
+                removed=[(row.user_id, row.type, row.previous_result, None)],
+            )
+        return row
+
+    @classmethod
+    def delete_owned(cls, db, calc_id: uuid.UUID, user_id: uuid.UUID) -> bool:
+        """
+        DELETE the user's calculation with RETURNING; False if there was none.
+
+        RETURNING carries what the stats need, so no SELECT precedes the
+        DELETE. The caller commits.
+        """
+        row = db.execute(_DELETE_OWNED_CALCULATION, {"calc_id": calc_id, "user_id": user_id}).first()
+        if row is None:
+            return False
+        _delete_edges(db, [calc_id])
+        CalculationStats.apply_changes(db.connection(), removed=[tuple(row)])
+        return True
+
+    @classmethod
+    def bulk_clauses(cls, user_id: uuid.UUID, params: CalculationBulkFilter) -> list:
+        """WHERE clauses for bulk operations: the filter plus the optional id list."""
+        clauses = cls.filter_clauses(user_id, params)
+        if params.ids is not None:
+            clauses.append(cls.id.in_(params.ids))
+        return clauses
+
+    @classmethod
+    def delete_batch(cls, db, user_id: uuid.UUID, params: CalculationBulkFilter, limit: int) -> int:
+        """
+        DELETE up to ``limit`` of the user's calculations matching params.
+
+        One set-based ``DELETE ... WHERE id IN (SELECT ... LIMIT n) RETURNING``;
+        call it until it returns fewer than ``limit`` rows, committing in
+        between, to keep each transaction and its locks bounded. The caller
+        commits.
+
+        Returns:
+            int: Number of calculations deleted
+        """
+        t = cls.__table__
+        batch = select(t.c.id).where(*cls.bulk_clauses(user_id, params)).limit(limit)
+        rows = db.execute(
+            delete(t)
+            .where(t.c.id.in_(batch.scalar_subquery()))
+            .returning(t.c.id, t.c.user_id, t.c.type, t.c.result, t.c.created_at)
+        ).all()
+        if not rows:
+            return 0
+        _delete_edges(db, [row.id for row in rows])
+        CalculationStats.apply_changes(db.connection(), removed=[tuple(row)[1:] for row in rows])
+        return len(rows)
+
+    @classmethod
+    def recompute_batch_statement(
+        cls, user_id: uuid.UUID, params: CalculationBulkFilter, after: Optional[uuid.UUID], limit: int
+    ):
+        """
+        SELECT the next ``limit`` matching calculations after id ``after``, in id order.
+
+        Only the columns needed to recompute and store a result are read;
+        pass the rows to ``store_recomputed``.
+        """
+        t = cls.__table__
+        stmt = select(t.c.id, t.c.user_id, t.c.type, t.c.inputs, t.c.result, t.c.updated_at).where(
+            *cls.bulk_clauses(user_id, params)
+        )
+        if after is not None:
+            stmt = stmt.where(t.c.id > after)
+        return stmt.order_by(t.c.id).limit(limit)
+
+    @classmethod
+    def store_recomputed(
+        cls, db, rows: Sequence, results: Sequence[float]
+    ) -> Tuple[int, List[Tuple[uuid.UUID, str]]]:
+        """
+        Write recomputed results for rows read by ``recompute_batch_statement``.
+
+        Only rows whose result changed are written. Rows are locked first and
+        skipped if they were updated since they were read, so a concurrent
+        edit is never overwritten with a result computed from stale inputs.
+        Rows that other calculations reference go through the ORM and have
+        their dependents recomputed (see ``recompute_dependents``), each in
+        its own savepoint; the rest are written with one executemany UPDATE.
+        The caller commits.
+
+        Returns:
+            tuple: Number of calculations updated (dependents included), and
+                (id, reason) for rows left unchanged because a dependent
+                could no longer be computed
+        """
+        changed = [(row, result) for row, result in zip(rows, results) if result != row.result]
+        if not changed:
+            return 0, []
+        t = cls.__table__
+        current = dict(db.execute(
+            select(t.c.id, t.c.updated_at)
+            .where(t.c.id.in_([row.id for row, _ in changed]))
+            .with_for_update()
+        ).all())
+        changed = [(row, result) for row, result in changed if current.get(row.id) == row.updated_at]
+        if not changed:
+            return 0, []
+        edges = CalculationDependency.__table__
+        referenced = set(db.execute(
+            select(edges.c.depends_on_id)
+            .where(edges.c.depends_on_id.in_([row.id for row, _ in changed]))
+            .distinct()
+        ).scalars())
+
+        now = datetime.utcnow()
+        failed, written, refreshed = [], set(), set()
+        for row, result in changed:
+            # Rows refreshed as someone's dependent already hold the right result.
+            if row.id not in referenced or row.id in refreshed:
+                continue
+            try:
+                with db.begin_nested():
+                    calc = db.get(cls, row.id, populate_existing=True)
+                    calc.result = result
+                    calc.updated_at = now
+                    dependents = calc.recompute_dependents(db)
+            except (ValueError, ZeroDivisionError) as e:
+                failed.append((row.id, str(e)))
+                continue
+            written.add(row.id)
+            refreshed.update(dep.id for dep in dependents)
+
+        plain = [(row, result) for row, result in changed if row.id not in referenced and row.id not in refreshed]
+        if plain:
+            db.execute(_SET_RESULT, [
+                {"calc_id": row.id, "new_result": result, "recomputed_at": now} for row, result in plain
+            ])
+            CalculationStats.apply_changes(
+                db.connection(),
+                added=[(row.user_id, row.type, result, None) for row, result in plain],
+                removed=[(row.user_id, row.type, row.result, None) for row, _ in plain],
+            )
+        return len(written | refreshed) + len(plain), failed
+
+    @staticmethod
+    def encode_cursor(created_at: datetime, calc_id: uuid.UUID, order: str) -> str:
+        """Opaque cursor pointing just past (created_at, id) in the given order."""
+        payload = json.dumps([created_at.isoformat(), str(calc_id), order], separators=(",", ":"))
+        return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+    @staticmethod
+    def decode_cursor(cursor: str, order: str) -> Tuple[datetime, uuid.UUID]:
+        """
+        Return the (created_at, id) position of a cursor.
+
+        Raises:
+            ValueError: If the cursor is malformed or was issued for the other order
+        """
+        try:
+            padded = cursor + "=" * (-len(cursor) % 4)
+            created_at, calc_id, cursor_order = json.loads(base64.urlsafe_b64decode(padded))
+            position = datetime.fromisoformat(created_at), uuid.UUID(calc_id)
+        except (TypeError, ValueError) as e:
+            raise ValueError("Invalid cursor") from e
+        if cursor_order != order:
+            raise ValueError("Invalid cursor")
+        return position
+
+    @classmethod
+    def filter_clauses(cls, user_id: uuid.UUID, params: CalculationFilter) -> list:
+        """WHERE clauses selecting the user's calculations that match params."""
+        clauses = [cls.user_id == user_id]
+        if params.type is not None:
+            clauses.append(cls.type == params.type.value)
+        if params.result_min is not None:
+            clauses.append(cls.result >= params.result_min)
+        if params.result_max is not None:
+            clauses.append(cls.result <= params.result_max)
+        if params.created_after is not None:
+            clauses.append(cls.created_at >= _naive_utc(params.created_after))
+        if params.created_before is not None:
+            clauses.append(cls.created_at < _naive_utc(params.created_before))
+        return clauses
+
+    @classmethod
+    def page_statement(cls, user_id: uuid.UUID, params: CalculationListQuery):
+        """
+        SELECT for one page of a user's calculations, keyset-paginated on (created_at, id).
+
+        The page starts after the cursor's position rather than at an OFFSET,
+        so every page costs the same index range scan however deep it is. One
+        row more than ``params.limit`` is fetched to tell whether another page
+        follows; pass the rows to ``split_page``.
+
+        Raises:
+            ValueError: If params.cursor is invalid
+        """
+        # Each row of the page is answered with its input_refs
+        stmt = select(cls).options(selectinload(cls.dependencies)).where(*cls.filter_clauses(user_id, params))
+        key = tuple_(cls.created_at, cls.id)
+        descending = params.order == "desc"
+        if params.cursor:
+            created_at, calc_id = cls.decode_cursor(params.cursor, params.order)
+            position = tuple_(
+                bindparam(None, created_at, type_=cls.created_at.type),
+                bindparam(None, calc_id, type_=cls.id.type),
+            )
+            stmt = stmt.where(key < position if descending else key > position)
+            # Implied by the row comparison, but only a plain bound on
+            # created_at lets the planner prune month partitions.
+            bound = bindparam(None, created_at, type_=cls.created_at.type)
+            stmt = stmt.where(cls.created_at <= bound if descending else cls.created_at >= bound)
+        if descending:
+            stmt = stmt.order_by(cls.created_at.desc(), cls.id.desc())
+        else:
+            stmt = stmt.order_by(cls.created_at.asc(), cls.id.asc())
+        return stmt.limit(params.limit + 1)
+
+    @classmethod
+    def split_page(cls, rows: Sequence["Calculation"], params: CalculationListQuery):
+        """Return (page, next cursor or None) from the rows of ``page_statement``."""
+        page = list(rows[:params.limit])
+        if len(rows) <= params.limit:
+            return page, None
+        last = page[-1]
+        return page, cls.encode_cursor(last.created_at, last.id, params.order)
+
+
+def _naive_utc(value: datetime) -> datetime:
+    """created_at is stored as naive UTC; convert aware filter values to match."""
+    if value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+# Keyset pagination indexes: the user's calculations in (created_at, id)
+# order, overall and per type. Declared here because the single-table
+# subclasses share the table and cannot carry __table_args__.
+Index("ix_calculations_user_created", Calculation.user_id, Calculation.created_at, Calculation.id)
+Index(
+    "ix_calculations_user_type_created",
+    Calculation.user_id, Calculation.type, Calculation.created_at, Calculation.id,
+)
+# For result_min/result_max: a selective result range is read from these
+# (only the matching rows, then a top-N sort on created_at) instead of
+# walking the user's whole history in created_at order.
+Index("ix_calculations_user_result", Calculation.user_id, Calculation.result, Calculation.created_at, Calculation.id)
+Index(
+    "ix_calculations_user_type_result",
+    Calculation.user_id, Calculation.type, Calculation.result, Calculation.created_at, Calculation.id,
+)
+
+class CalculationDependency(Base):
+    """Edge of the calculation graph: an input that takes another calculation's result"""
+    __tablename__ = "calculation_dependencies"
+
+    calculation_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey('calculations.id', ondelete='CASCADE'),
+        primary_key=True
+    )
+    position = Column(Integer, primary_key=True)
+    depends_on_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey('calculations.id', ondelete='CASCADE'),
+        nullable=False,
+        index=True
+    )
+
+def _least(a, b):
+    """LEAST(a, b) ignoring NULLs, on any backend."""
+    return case((a.is_(None), b), (b.is_(None), a), (b < a, b), else_=a)
+
+def _greatest(a, b):
+    """GREATEST(a, b) ignoring NULLs, on any backend."""
+    return case((a.is_(None), b), (b.is_(None), a), (b > a, b), else_=a)
+
+def _plus(a, b):
+    """a + b treating NULL as "no values yet"."""
+    return case((a.is_(None), b), (b.is_(None), a), else_=a + b)
+
+class CalculationStats(Base):
+    """
+    Per-user, per-type aggregates of calculation results.
+
+    Rows are maintained in the same transaction as every calculation write
+    with upsert arithmetic (count/sum deltas, LEAST/GREATEST for extremes),
+    so concurrent writers never overwrite each other's changes. Removing the
+    current minimum, maximum or newest row recomputes that value from the
+    group's calculations.
+    """
+    __tablename__ = "calculation_stats"
+
+    user_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey('users.id', ondelete='CASCADE'),
+        primary_key=True
+    )
+    type = Column(String(50), primary_key=True)
+    count = Column(BigInteger, nullable=False, default=0)
+    result_sum = Column(Float, nullable=True)
+    result_min = Column(Float, nullable=True)
+    result_max = Column(Float, nullable=True)
+    last_created_at = Column(DateTime, nullable=True)
+
+    @classmethod
+    def apply_changes(cls, connection, added=(), removed=()) -> None:
+        """
+        Fold added and removed calculations into the stats rows.
+
+        Args:
+            connection: Connection of the transaction that wrote the calculations
+            added: (user_id, type, result, created_at) of new rows or new results
+            removed: (user_id, type, result, created_at) of deleted rows or old
+                results; created_at is None when the row itself still exists
+        """
+        groups: Dict[Tuple[uuid.UUID, str], Tuple[list, list]] = {}
+        for index, changes in enumerate((added, removed)):
+            for user_id, calc_type, result, created_at in changes:
+                groups.setdefault((user_id, calc_type), ([], []))[index].append((result, created_at))
+
+        # Fixed lock order so concurrent writers cannot deadlock on stats rows.
+        for key in sorted(groups, key=lambda k: (str(k[0]), k[1])):
+            plus, minus = groups[key]
+            if plus:
+                cls._add(connection, key, plus)
+            if minus:
+                cls._remove(connection, key, minus)
+
+    @staticmethod
+    def _aggregate(changes):
+        results = [result for result, _ in changes if result is not None]
+        created = [created_at for _, created_at in changes if created_at is not None]
+        return (
+            len(changes),
+            sum(results) if results else None,
+            min(results, default=None),
+            max(results, default=None),
+            max(created, default=None),
+        )
+
+    @classmethod
+    def _add(cls, connection, key, changes) -> None:
+        t = cls.__table__
+        count, total, low, high, last = cls._aggregate(changes)
+        stmt = pg_insert(t).values(
+            user_id=key[0], type=key[1], count=count, result_sum=total,
+            result_min=low, result_max=high, last_created_at=last,
+        )
+        new = stmt.excluded
+        connection.execute(stmt.on_conflict_do_update(
+            index_elements=[t.c.user_id, t.c.type],
+            set_={
+                "count": t.c.count + new.count,
+                "result_sum": _plus(t.c.result_sum, new.result_sum),
+                "result_min": _least(t.c.result_min, new.result_min),
+                "result_max": _greatest(t.c.result_max, new.result_max),
+                "last_created_at": _greatest(t.c.last_created_at, new.last_created_at),
+            },
+        ))
+
+    @classmethod
+    def _remove(cls, connection, key, changes) -> None:
+        cls._subtract(connection, key, *cls._aggregate(changes))
+
+    @classmethod
+    def subtract_groups(cls, connection, groups) -> None:
+        """
+        Take pre-aggregated calculations out of the stats, e.g. a dropped partition.
+
+        The calculations must already be gone from the calculations table,
+        so extremes they held are recomputed from the remaining rows.
+
+        Args:
+            connection: Connection of the transaction that removed the rows
+            groups: (user_id, type, count, sum, min, max, max created_at) rows
+        """
+        for user_id, calc_type, *aggregate in sorted(groups, key=lambda g: (str(g[0]), g[1])):
+            cls._subtract(connection, (user_id, calc_type), *aggregate)
+
+    @classmethod
+    def _subtract(cls, connection, key, count, total, low, high, last) -> None:
+        t = cls.__table__
+        calcs = Calculation.__table__
+        in_stats = (t.c.user_id == key[0]) & (t.c.type == key[1])
+        in_group = (calcs.c.user_id == key[0]) & (calcs.c.type == key[1])
+
+        # Lock the row first: the recompute subqueries below then run on a
+        # snapshot that includes every write committed before ours.
+        connection.execute(select(t.c.count).where(in_stats).with_for_update())
+
+        values = {"count": t.c.count - count}
+        if total is not None:
+            values["result_sum"] = t.c.result_sum - total
+        if low is not None:
+            values["result_min"] = case(
+                (t.c.result_min >= low, select(func.min(calcs.c.result)).where(in_group).scalar_subquery()),
+                else_=t.c.result_min,
+            )
+        if high is not None:
+            values["result_max"] = case(
+                (t.c.result_max <= high, select(func.max(calcs.c.result)).where(in_group).scalar_subquery()),
+                else_=t.c.result_max,
+            )
+        if last is not None:
+            values["last_created_at"] = case(
+                (t.c.last_created_at <= last, select(func.max(calcs.c.created_at)).where(in_group).scalar_subquery()),
+                else_=t.c.last_created_at,
+            )
+        connection.execute(update(t).where(in_stats).values(values))
+        connection.execute(delete(t).where(in_stats, t.c.count <= 0))
+
+    @classmethod
+    def rebuild(cls, connection) -> int:
+        """
+        Recompute every stats row from the calculations table.
+
+        Returns:
+            int: Number of stats rows written
+        """
+        t = cls.__table__
+        calcs = Calculation.__table__
+        if connection.dialect.name == "postgresql":
+            # Block concurrent stats upserts until the rebuild commits.
+            connection.execute(text("LOCK TABLE calculation_stats IN EXCLUSIVE MODE"))
+        connection.execute(delete(t))
+        source = select(
+            calcs.c.user_id,
+            calcs.c.type,
+            func.count(),
+            func.sum(calcs.c.result),
+            func.min(calcs.c.result),
+            func.max(calcs.c.result),
+            func.max(calcs.c.created_at),
+        ).group_by(calcs.c.user_id, calcs.c.type)
+        result = connection.execute(insert(t).from_select(
+            ["user_id", "type", "count", "result_sum", "result_min", "result_max", "last_created_at"],
+            source,
+        ))
+        return result.rowcount
+
 class Addition(Calculation):
     """Addition calculation"""
     __mapper_args__ = {"polymorphic_identity": "addition"}
 
+    @memoize_result
     def get_result(self) -> float:
-        if not isinstance(self.inputs, list):
+        if not is_vector(self.inputs):
             raise ValueError("Inputs must be a list of numbers.")
         if len(self.inputs) < 2:
             raise ValueError("Inputs must be a list with at least two numbers.")
+        if is_packed(self.inputs) and len(self.inputs) >= settings.CALC_VECTORIZE_THRESHOLD:
+            return reduce_inputs("addition", self.inputs)
         return sum(self.inputs)
 
 class Subtraction(Calculation):
     """Subtraction calculation"""
     __mapper_args__ = {"polymorphic_identity": "subtraction"}
 
+    @memoize_result
     def get_result(self) -> float:
-        if not isinstance(self.inputs, list):
+        if not is_vector(self.inputs):
             raise ValueError("Inputs must be a list of numbers.")
         if len(self.inputs) < 2:
             raise ValueError("Inputs must be a list with at least two numbers.")
+        if is_packed(self.inputs) and len(self.inputs) >= settings.CALC_VECTORIZE_THRESHOLD:
+            return reduce_inputs("subtraction", self.inputs)
         result = self.inputs[0]
         for value in self.inputs[1:]:
             result -= value
@@ -134,28 +896,95 @@ class Multiplication(Calculation):
     """Multiplication calculation"""
     __mapper_args__ = {"polymorphic_identity": "multiplication"}
 
+    @memoize_result
     def get_result(self) -> float:
-        if not isinstance(self.inputs, list):
+        if not is_vector(self.inputs):
             raise ValueError("Inputs must be a list of numbers.")
         if len(self.inputs) < 2:
             raise ValueError("Inputs must be a list with at least two numbers.")
-        result = 1
-        for value in self.inputs:
-            result *= value
-        return result
+        if is_packed(self.inputs) and len(self.inputs) >= settings.CALC_VECTORIZE_THRESHOLD:
+            return reduce_inputs("multiplication", self.inputs)
+        return math.prod(self.inputs)
 
 class Division(Calculation):
     """Division calculation"""
     __mapper_args__ = {"polymorphic_identity": "division"}
 
+    @memoize_result
     def get_result(self) -> float:
-        if not isinstance(self.inputs, list):
+        if not is_vector(self.inputs):
             raise ValueError("Inputs must be a list of numbers.")
         if len(self.inputs) < 2:
             raise ValueError("Inputs must be a list with at least two numbers.")
+        if is_packed(self.inputs) and len(self.inputs) >= settings.CALC_VECTORIZE_THRESHOLD:
+            try:
+                return reduce_inputs("division", self.inputs)
+            except ZeroDivisionError:
+                raise ValueError("Cannot divide by zero.")
         result = self.inputs[0]
         for value in self.inputs[1:]:
             if value == 0:
                 raise ValueError("Cannot divide by zero.")
             result /= value
         return result
+
+# The per-request calculation lookup, built once: requests skip query
+# construction and cache-key generation and go straight to the compiled
+# SQL in the engine's statement cache. Its callers answer with input_refs,
+# so the references are loaded with it; the loader option needs every
+# mapper configured, hence built on first use rather than at import.
+@lru_cache(maxsize=None)
+def _owned_calculation():
+    return select(Calculation).options(selectinload(Calculation.dependencies)).where(
+        Calculation.id == bindparam("calc_id"),
+        Calculation.user_id == bindparam("user_id"),
+    )
+
+_DELETE_OWNED_CALCULATION = (
+    delete(Calculation.__table__)
+    .where(
+        Calculation.__table__.c.id == bindparam("calc_id"),
+        Calculation.__table__.c.user_id == bindparam("user_id"),
+    )
+    .returning(
+        Calculation.__table__.c.user_id,
+        Calculation.__table__.c.type,
+        Calculation.__table__.c.result,
+        Calculation.__table__.c.created_at,
+    )
+)
+
+_SET_RESULT = (
+    update(Calculation.__table__)
+    .where(Calculation.__table__.c.id == bindparam("calc_id"))
+    .values(result=bindparam("new_result"), updated_at=bindparam("recomputed_at"))
+)
+
+def _delete_edges(db, calc_ids: List[uuid.UUID]) -> None:
+    """Delete the dependency edges of deleted calculations (SQLite only)."""
+    if db.get_bind().dialect.name == "postgresql":
+        # PostgreSQL cascades the edges; SQLite does not enforce foreign keys here.
+        return
+    edges = CalculationDependency.__table__
+    db.execute(delete(edges).where(
+        or_(edges.c.calculation_id.in_(calc_ids), edges.c.depends_on_id.in_(calc_ids))
+    ))
+
+@event.listens_for(Session, "after_flush")
+def _track_calculation_stats(session, flush_context):
+    """Apply the flush's calculation inserts, deletes and result changes to CalculationStats."""
+    added, removed = [], []
+    for obj in session.new:
+        if isinstance(obj, Calculation):
+            added.append((obj.user_id, obj.type, obj.result, obj.created_at))
+    for obj in session.deleted:
+        if isinstance(obj, Calculation):
+            removed.append((obj.user_id, obj.type, obj.result, obj.created_at))
+    for obj in session.dirty:
+        if isinstance(obj, Calculation):
+            history = attributes.get_history(obj, "result")
+            if history.added and history.deleted:
+                added.append((obj.user_id, obj.type, history.added[0], None))
+                removed.append((obj.user_id, obj.type, history.deleted[0], None))
+    if added or removed:
+        CalculationStats.apply_changes(session.connection(), added, removed)
@@ -0,0 +1,115 @@
+# app/models/job.py
+"""
+Persistent state of asynchronous calculation jobs (POST /calculations?mode=async).
+
+The row is written before the request is answered with 202, so any worker
+can answer GET /jobs/{id}, and jobs that were queued but not run when their
+worker stopped are found again and run by the next worker that starts.
+Status changes are single conditional UPDATEs: a job is claimed by exactly
+one worker.
+"""
+import uuid
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import JSON, Column, DateTime, ForeignKey, Index, String, and_, delete, or_, select, update
+from sqlalchemy.dialects.postgresql import UUID
+
+from app.database import Base
+from app.schemas.calculation import CalculationJobStatus as JobStatus
+
+
+class CalculationJob(Base):
+    """A queued, running or finished calculation job; its id is the id of the calculation it creates."""
+    __tablename__ = "calculation_jobs"
+
+    id = Column(UUID(as_uuid=True), primary_key=True)
+    user_id = Column(UUID(as_uuid=True), ForeignKey('users.id', ondelete='CASCADE'), nullable=False)
+    status = Column(String(20), nullable=False)
+    # The validated request: type, inputs and input_refs
+    payload = Column(JSON, nullable=False)
+    error = Column(String, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    # Set when the job is claimed; a running job older than the stale cutoff
+    # is assumed lost with its worker
+    updated_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    finished_at = Column(DateTime, nullable=True)
+
+    __table_args__ = (
+        Index("ix_calculation_jobs_status_updated", "status", "updated_at"),
+        Index("ix_calculation_jobs_finished", "finished_at"),
+    )
+
+    @property
+    def finished(self) -> bool:
+        return self.status in (JobStatus.SUCCEEDED, JobStatus.FAILED)
+
+    @classmethod
+    def add(cls, db, job_id: uuid.UUID, user_id: uuid.UUID, payload: Dict[str, Any]) -> None:
+        """Record a new pending job. The caller commits."""
+        now = datetime.utcnow()
+        db.execute(cls.__table__.insert().values(
+            id=job_id, user_id=user_id, status=JobStatus.PENDING.value, payload=payload,
+            created_at=now, updated_at=now,
+        ))
+
+    @classmethod
+    def get_owned(cls, db, job_id: uuid.UUID, user_id: uuid.UUID) -> Optional["CalculationJob"]:
+        return db.execute(
+            select(cls).where(cls.id == job_id, cls.user_id == user_id).execution_options(populate_existing=True)
+        ).scalar_one_or_none()
+
+    @classmethod
+    def claim(cls, db, job_id: uuid.UUID, stale_before: datetime) -> bool:
+        """
+        Mark a pending (or stale running) job as running; False if another
+        worker has it or it has finished. The caller commits.
+        """
+        result = db.execute(
+            update(cls.__table__)
+            .where(cls.id == job_id, _claimable(stale_before))
+            .values(status=JobStatus.RUNNING.value, updated_at=datetime.utcnow())
+        )
+        return result.rowcount == 1
+
+    @classmethod
+    def release(cls, db, job_id: uuid.UUID) -> None:
+        """Put a running job back to pending (its worker is stopping). The caller commits."""
+        db.execute(
+            update(cls.__table__)
+            .where(cls.id == job_id, cls.status == JobStatus.RUNNING.value)
+            .values(status=JobStatus.PENDING.value, updated_at=datetime.utcnow())
+        )
+
+    @classmethod
+    def finish(cls, db, job_id: uuid.UUID, status: JobStatus, error: Optional[str] = None) -> None:
+        """Record the outcome of a job. The caller commits."""
+        now = datetime.utcnow()
+        db.execute(
+            update(cls.__table__)
+            .where(cls.id == job_id)
+            .values(status=status.value, error=error, updated_at=now, finished_at=now)
+        )
+
+    @classmethod
+    def recoverable(cls, db, stale_before: datetime, limit: int) -> List[Any]:
+        """(id, user_id, payload) of jobs that are pending or whose worker was lost, oldest first."""
+        t = cls.__table__
+        return db.execute(
+            select(t.c.id, t.c.user_id, t.c.payload)
+            .where(_claimable(stale_before))
+            .order_by(t.c.created_at)
+            .limit(limit)
+        ).all()
+
+    @classmethod
+    def prune(cls, db, finished_before: datetime) -> int:
+        """Delete jobs that finished before the cutoff. The caller commits."""
+        return db.execute(delete(cls.__table__).where(cls.finished_at < finished_before)).rowcount
+
+
+def _claimable(stale_before: datetime):
+    return or_(
+        CalculationJob.status == JobStatus.PENDING.value,
+        and_(CalculationJob.status == JobStatus.RUNNING.value, CalculationJob.updated_at < stale_before),
+    )
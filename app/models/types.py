@@ -0,0 +1,26 @@
+# app/models/types.py
+from sqlalchemy import LargeBinary
+from sqlalchemy.types import TypeDecorator
+
+from app.core.config import settings
+from app.operations.packing import PackedVector, encode_inputs
+
+
+class PackedFloatArray(TypeDecorator):
+    """
+    BYTEA column holding a float vector in the compact packed format.
+
+    Values load as PackedVector, which only decodes when the inputs are read.
+    """
+    impl = LargeBinary
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        return encode_inputs(value, settings.CALC_INPUTS_COMPRESS_MIN_BYTES)
+
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        return PackedVector(value)
@@ -2,7 +2,7 @@
 
 import uuid
 from datetime import datetime, timezone, timedelta
-from sqlalchemy import Column, String, Boolean, DateTime, or_
+from sqlalchemy import Column, String, Boolean, DateTime, Integer, bindparam, or_, select, update
 from sqlalchemy.dialects.postgresql import UUID as PG_UUID
 from sqlalchemy.orm import relationship
 from app.core.config import get_settings
@@ -38,6 +38,9 @@ class User(Base):
     created_at = Column(DateTime(timezone=True), default=utcnow, nullable=False)
     updated_at = Column(DateTime(timezone=True), default=utcnow, onupdate=utcnow, nullable=False)
     last_login = Column(DateTime(timezone=True), nullable=True)
+
+    # Embedded in issued tokens; incrementing it revokes all of them at once
+    token_generation = Column(Integer, nullable=False, default=0, server_default="0")
     
     # Relationships
     calculations = relationship("Calculation", back_populates="user", cascade="all, delete-orphan")
@@ -99,6 +102,11 @@ class User(Base):
         from app.auth.jwt import get_password_hash
         return get_password_hash(password)
 
+    @classmethod
+    def get_by_id(cls, db, user_id: uuid.UUID):
+        """Return the user with this id, or None, via a pre-built statement."""
+        return db.execute(_USER_BY_ID, {"user_id": user_id}).scalars().first()
+
     @classmethod
     def register(cls, db, user_data: dict):
         """
@@ -114,20 +122,49 @@ class User(Base):
         Raises:
             ValueError: If password is invalid or username/email already exists
         """
-        password = user_data.get("password")
-        if not password or len(password) < 6:
-            raise ValueError("Password must be at least 6 characters long")
+        password = cls._check_new_password(user_data)
         
         # Check for duplicate email or username
-        existing_user = db.query(cls).filter(
-            or_(cls.email == user_data["email"], cls.username == user_data["username"])
-        ).first()
+        existing_user = db.query(cls).filter(cls._duplicate_clause(user_data)).first()
         if existing_user:
             raise ValueError("Username or email already exists")
         
         # Create new user instance
-        hashed_password = cls.hash_password(password)
-        user = cls(
+        user = cls._new_user(user_data, cls.hash_password(password))
+        db.add(user)
+        return user
+
+    @classmethod
+    async def aregister(cls, db, user_data: dict):
+        """
+        Register a new user through an AsyncSession.
+
+        Same checks and errors as register; the password is hashed in the
+        hashing pool so bcrypt does not block the event loop.
+        """
+        password = cls._check_new_password(user_data)
+        existing_user = await db.scalar(select(cls).where(cls._duplicate_clause(user_data)).limit(1))
+        if existing_user:
+            raise ValueError("Username or email already exists")
+        from app.auth.jwt import aget_password_hash
+        user = cls._new_user(user_data, await aget_password_hash(password))
+        db.add(user)
+        return user
+
+    @staticmethod
+    def _check_new_password(user_data: dict) -> str:
+        password = user_data.get("password")
+        if not password or len(password) < 6:
+            raise ValueError("Password must be at least 6 characters long")
+        return password
+
+    @classmethod
+    def _duplicate_clause(cls, user_data: dict):
+        return or_(cls.email == user_data["email"], cls.username == user_data["username"])
+
+    @classmethod
+    def _new_user(cls, user_data: dict, hashed_password: str):
+        return cls(
             first_name=user_data["first_name"],
             last_name=user_data["last_name"],
             email=user_data["email"],
@@ -136,8 +173,6 @@ class User(Base):
             is_active=True,
             is_verified=False
         )
-        db.add(user)
-        return user
 
     @classmethod
     def authenticate(cls, db, username_or_email: str, password: str):
@@ -152,9 +187,7 @@ class User(Base):
         Returns:
             dict: Authentication result with tokens and user data, or None if authentication fails
         """
-        user = db.query(cls).filter(
-            or_(cls.username == username_or_email, cls.email == username_or_email)
-        ).first()
+        user = db.query(cls).filter(cls._login_clause(username_or_email)).first()
 
         if not user or not user.verify_password(password):
             return None
@@ -162,10 +195,34 @@ class User(Base):
         # Update the last_login timestamp
         user.last_login = utcnow()
         db.flush()
+        return cls._login_result(user)
+
+    @classmethod
+    async def aauthenticate(cls, db, username_or_email: str, password: str):
+        """
+        Authenticate a user through an AsyncSession.
 
+        Same result as authenticate; the password is verified on the hashing pool.
+        """
+        from app.auth.jwt import averify_password
+        user = await db.scalar(select(cls).where(cls._login_clause(username_or_email)).limit(1))
+        if not user or not await averify_password(password, user.password):
+            return None
+        user.last_login = utcnow()
+        await db.flush()
+        return cls._login_result(user)
+
+    @classmethod
+    def _login_clause(cls, username_or_email: str):
+        return or_(cls.username == username_or_email, cls.email == username_or_email)
+
+    @classmethod
+    def _login_result(cls, user) -> dict:
+        """Issue the tokens returned by a successful login."""
         # Generate tokens
-        access_token = cls.create_access_token({"sub": str(user.id)})
-        refresh_token = cls.create_refresh_token({"sub": str(user.id)})
+        claims = {"sub": str(user.id), "gen": user.token_generation or 0}
+        access_token = cls.create_access_token(claims)
+        refresh_token = cls.create_refresh_token(claims)
         expires_at = utcnow() + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
 
         return {
@@ -182,14 +239,14 @@ class User(Base):
         Create a JWT access token.
         
         Args:
-            data: Token payload data
+            data: Token payload data ("sub" and optionally "gen")
             
         Returns:
             str: JWT access token
         """
         from app.auth.jwt import create_token
         from app.schemas.token import TokenType
-        return create_token(data["sub"], TokenType.ACCESS)
+        return create_token(data["sub"], TokenType.ACCESS, generation=data.get("gen", 0))
 
     @classmethod
     def create_refresh_token(cls, data: dict) -> str:
@@ -197,14 +254,32 @@ class User(Base):
         Create a JWT refresh token.
         
         Args:
-            data: Token payload data
+            data: Token payload data ("sub" and optionally "gen")
             
         Returns:
             str: JWT refresh token
         """
         from app.auth.jwt import create_token
         from app.schemas.token import TokenType
-        return create_token(data["sub"], TokenType.REFRESH)
+        return create_token(data["sub"], TokenType.REFRESH, generation=data.get("gen", 0))
+
+    @classmethod
+    def get_token_generation(cls, db, user_id: uuid.UUID):
+        """Return the user's current token generation, or None if there is no such user."""
+        return db.execute(_TOKEN_GENERATION_BY_ID, {"user_id": user_id}).scalar()
+
+    @classmethod
+    def revoke_all_tokens(cls, db, user_id: uuid.UUID):
+        """
+        Invalidate every token issued to the user so far with one UPDATE.
+
+        Tokens carry the generation they were issued at; incrementing it
+        makes all of them fail the check in app.auth.jwt. The caller commits.
+
+        Returns:
+            int: The new generation, or None if there is no such user
+        """
+        return db.execute(_REVOKE_ALL_TOKENS, {"user_id": user_id}).scalar()
 
     @classmethod
     def verify_token(cls, token: str):
@@ -217,10 +292,11 @@ class User(Base):
         Returns:
             UUID: User ID if token is valid, None otherwise
         """
-        from app.core.config import settings
-        from jose import jwt, JWTError
+        from app.auth.jwt import verify_jwt
+        from app.schemas.token import TokenType
+        from jose import JWTError
         try:
-            payload = jwt.decode(token, settings.JWT_SECRET_KEY, algorithms=[settings.ALGORITHM])
+            payload = verify_jwt(token, TokenType.ACCESS)
             sub = payload.get("sub")
             if sub is None:
                 return None
@@ -229,4 +305,19 @@ class User(Base):
             except (ValueError, TypeError):
                 return None
         except JWTError:
-            return None
\ No newline at end of file
+            return None
+
+# Built once so only the bind value changes per call. The routes take the
+# user from the token (app.auth.dependencies.get_current_user) and do not
+# load it; _USER_BY_ID serves app.auth.jwt.get_current_user, and
+# _TOKEN_GENERATION_BY_ID runs on a token-generation cache miss.
+_USER_BY_ID = select(User).where(User.id == bindparam("user_id"))
+
+_TOKEN_GENERATION_BY_ID = select(User.token_generation).where(User.id == bindparam("user_id"))
+
+_REVOKE_ALL_TOKENS = (
+    update(User.__table__)
+    .where(User.__table__.c.id == bindparam("user_id"))
+    .values(token_generation=User.__table__.c.token_generation + 1)
+    .returning(User.__table__.c.token_generation)
+)
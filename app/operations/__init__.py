@@ -1 +1,2 @@
-from .calculation_logic import perform_calculation, add, subtract, multiply, divide
\ No newline at end of file
+from .calculation_logic import perform_calculation, add, subtract, multiply, divide
+from .vectorized import reduce_inputs, evaluate_many
@@ -0,0 +1,64 @@
+# app/operations/binary.py
+"""
+Raw float64 input vectors.
+
+Uploads of little-endian float64 values are wrapped without copying
+(``numpy.frombuffer`` or ``memoryview.cast``) and validated with vectorized
+checks instead of per-element Python validators.
+"""
+import math
+import sys
+from array import array
+from typing import Union
+
+from app.operations.vectorized import HAS_NUMPY, np
+from app.schemas.calculation import CalculationType
+
+BytesLike = Union[bytes, bytearray, memoryview]
+
+
+def decode_float64(data: BytesLike):
+    """
+    Wrap raw little-endian float64 bytes as a 1-D float buffer.
+
+    On little-endian hosts no data is copied.
+
+    Raises:
+        ValueError: If the length is not a multiple of 8 bytes
+    """
+    if len(data) % 8:
+        raise ValueError("Binary inputs must be a whole number of little-endian float64 values")
+    if HAS_NUMPY:
+        return np.frombuffer(data, dtype="<f8")
+    values = memoryview(data).cast("B").cast("d")
+    if sys.byteorder == "big":  # pragma: no cover - little-endian CI
+        values = array("d", values)
+        values.byteswap()
+    return values
+
+
+def validate_float64(calc_type: Union[CalculationType, str], values) -> None:
+    """
+    Apply the CalculationBase input rules to a float buffer.
+
+    Raises:
+        ValueError: With the same messages as CalculationBase, plus a check
+            that every input is finite
+    """
+    calc_type = CalculationType(calc_type)
+    if len(values) < 2:
+        raise ValueError("At least two numbers are required for calculation")
+
+    if HAS_NUMPY:
+        if not np.isfinite(values).all():
+            raise ValueError("Inputs must be finite numbers")
+        if calc_type == CalculationType.DIVISION and not values[1:].all():
+            raise ValueError("Cannot divide by zero")
+        return
+
+    division = calc_type == CalculationType.DIVISION
+    for index, value in enumerate(values):
+        if not math.isfinite(value):
+            raise ValueError("Inputs must be finite numbers")
+        if division and index and value == 0:
+            raise ValueError("Cannot divide by zero")
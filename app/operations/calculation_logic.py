@@ -1,6 +1,9 @@
 import operator
 from functools import reduce
+from app.core.config import settings
 from app.schemas.calculation import CalculationType
+from app.operations.memo import lookup_or_compute
+from app.operations.vectorized import is_packed, reduce_inputs
 
 # Map the new Enum to operators
 CALCULATION_OPERATIONS = {
@@ -25,10 +28,14 @@ def perform_calculation(inputs: list[float], type: str) -> float:
     if not operation_func:
         raise ValueError(f"Operation {type} not supported.")
 
-    # 2. Perform Calculation using reduce
+    # 2. Perform Calculation using reduce (vectorized for long float64 buffers, memoized)
+    def compute():
+        if is_packed(inputs) and len(inputs) >= settings.CALC_VECTORIZE_THRESHOLD:
+            return reduce_inputs(calc_type, inputs)
+        return reduce(operation_func, inputs)
+
     try:
-        result = reduce(operation_func, inputs)
-        return result
+        return lookup_or_compute(calc_type, inputs, compute)
     except ZeroDivisionError:
         raise ValueError("Cannot divide by zero")
 
@@ -0,0 +1,90 @@
+# app/operations/ingest.py
+"""
+Incremental NDJSON reader for streamed uploads.
+
+Only the current partial line is buffered, so memory use does not grow
+with the size of the upload.
+"""
+import zlib
+from typing import AsyncIterator, Iterator, Optional, Tuple
+
+# Upper bound on the output of a single inflate step
+_INFLATE_STEP = 64 * 1024
+
+
+def _inflate(decompressor, data: bytes) -> Iterator[bytes]:
+    """Decompress in bounded steps so a small gzip bomb cannot allocate gigabytes."""
+    out = decompressor.decompress(data, _INFLATE_STEP)
+    if out:
+        yield out
+    while decompressor.unconsumed_tail:
+        out = decompressor.decompress(decompressor.unconsumed_tail, _INFLATE_STEP)
+        if out:
+            yield out
+
+
+async def iter_ndjson_lines(
+    chunks: AsyncIterator[bytes],
+    gzipped: bool = False,
+    max_line_bytes: int = 1024 * 1024,
+) -> AsyncIterator[Tuple[int, Optional[bytes]]]:
+    """
+    Split a stream of byte chunks into NDJSON lines.
+
+    Args:
+        chunks: Raw request body chunks
+        gzipped: Whether the body is gzip-encoded
+        max_line_bytes: Longest line to keep; longer lines are skipped
+
+    Yields:
+        tuple: (line number, line bytes without the newline), with None in
+        place of the bytes for lines longer than max_line_bytes
+
+    Raises:
+        zlib.error: If a gzip-encoded body is corrupt
+    """
+    decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS) if gzipped else None
+    buffer = bytearray()
+    overflow = False
+    line_number = 0
+
+    async def pieces():
+        async for chunk in chunks:
+            if decompressor is None:
+                yield chunk
+            else:
+                for out in _inflate(decompressor, chunk):
+                    yield out
+        if decompressor is not None:
+            tail = decompressor.flush()
+            if tail:
+                yield tail
+            if not decompressor.eof:
+                raise zlib.error("Incomplete gzip stream")
+
+    async for piece in pieces():
+        start = 0
+        while True:
+            end = piece.find(b"\n", start)
+            if end == -1:
+                if not overflow:
+                    buffer += piece[start:]
+                    if len(buffer) > max_line_bytes:
+                        overflow = True
+                        buffer.clear()
+                break
+
+            line_number += 1
+            if overflow:
+                yield line_number, None
+                overflow = False
+            else:
+                buffer += piece[start:end]
+                yield line_number, (bytes(buffer) if len(buffer) <= max_line_bytes else None)
+            buffer.clear()
+            start = end + 1
+
+    if overflow:
+        yield line_number + 1, None
+    elif buffer:
+        yield line_number + 1, bytes(buffer)
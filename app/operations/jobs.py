@@ -0,0 +1,148 @@
+# app/operations/jobs.py
+"""
+Background jobs for long-running calculations.
+
+Submitted coroutines run on a fixed number of asyncio worker tasks fed from
+a bounded queue, so a burst of heavy requests neither holds HTTP connections
+open nor grows without limit. Finished jobs are kept for a retention period
+so clients can poll for the outcome; waiting is event based, not a sleep
+loop.
+
+This is the executor only. Jobs that must survive the worker (calculation
+jobs) keep their state in the database (app.models.job); the Job objects
+here let a request on the same worker wait for the outcome.
+"""
+import asyncio
+import logging
+import time
+import uuid
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Tuple
+
+from app.core.config import settings
+from app.schemas.calculation import CalculationJobStatus as JobStatus
+
+logger = logging.getLogger(__name__)
+
+
+class Job:
+    """State of one submitted job."""
+
+    __slots__ = ("id", "owner", "status", "result", "error", "finished_at", "_done")
+
+    def __init__(self, job_id: uuid.UUID, owner: Any):
+        self.id = job_id
+        self.owner = owner
+        self.status = JobStatus.PENDING
+        self.result: Any = None
+        self.error: Optional[str] = None
+        self.finished_at: Optional[float] = None
+        self._done = asyncio.Event()
+
+    @property
+    def finished(self) -> bool:
+        return self.status in (JobStatus.SUCCEEDED, JobStatus.FAILED)
+
+
+class JobQueue:
+    """
+    Bounded in-process job queue served by a pool of asyncio workers.
+
+    ValueError raised by a job is reported to the client as the job error;
+    any other exception is logged and reported as a generic failure.
+    """
+
+    def __init__(self, workers: int, max_pending: int, retention_seconds: float):
+        self.workers = workers
+        self.max_pending = max_pending
+        self.retention_seconds = retention_seconds
+        self._jobs: Dict[uuid.UUID, Job] = {}
+        self._finished: Deque[Tuple[float, uuid.UUID]] = deque()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+
+    def _ensure_workers(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._loop is loop:
+            return
+        # Workers belong to the loop that serves requests; a new loop (for
+        # example a test client used without its lifespan) gets new workers.
+        self._loop = loop
+        self._queue = asyncio.Queue(self.max_pending)
+        self._tasks = [loop.create_task(self._worker()) for _ in range(self.workers)]
+
+    def _prune(self) -> None:
+        cutoff = time.monotonic() - self.retention_seconds
+        while self._finished and self._finished[0][0] <= cutoff:
+            _, job_id = self._finished.popleft()
+            self._jobs.pop(job_id, None)
+
+    def submit(
+        self,
+        owner: Any,
+        func: Callable[..., Awaitable[Any]],
+        *args: Any,
+        job_id: Optional[uuid.UUID] = None,
+    ) -> Job:
+        """
+        Queue ``func(*args)`` and return its job immediately.
+
+        Raises:
+            asyncio.QueueFull: If max_pending jobs are already waiting
+        """
+        self._ensure_workers()
+        self._prune()
+        job = Job(job_id or uuid.uuid4(), owner)
+        self._queue.put_nowait((job, func, args))
+        self._jobs[job.id] = job
+        return job
+
+    def get(self, job_id: uuid.UUID) -> Optional[Job]:
+        """Return a pending, running or recently finished job."""
+        self._prune()
+        return self._jobs.get(job_id)
+
+    async def wait(self, job: Job, timeout: float) -> Job:
+        """Wait up to ``timeout`` seconds for a job to finish."""
+        if timeout > 0 and not job.finished:
+            try:
+                await asyncio.wait_for(job._done.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+        return job
+
+    async def _worker(self) -> None:
+        while True:
+            job, func, args = await self._queue.get()
+            job.status = JobStatus.RUNNING
+            try:
+                job.result = await func(*args)
+                job.status = JobStatus.SUCCEEDED
+            except ValueError as e:
+                job.error = str(e)
+                job.status = JobStatus.FAILED
+            except Exception:
+                logger.exception("Job %s failed", job.id)
+                job.error = "Internal error"
+                job.status = JobStatus.FAILED
+            finally:
+                job.finished_at = time.monotonic()
+                self._finished.append((job.finished_at, job.id))
+                job._done.set()
+                self._queue.task_done()
+
+    async def shutdown(self) -> None:
+        """Stop the workers; queued jobs that have not started are dropped here."""
+        tasks, self._tasks = self._tasks, []
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._loop = self._queue = None
+
+
+calculation_jobs = JobQueue(
+    workers=settings.CALC_JOB_WORKERS,
+    max_pending=settings.CALC_JOB_MAX_PENDING,
+    retention_seconds=settings.CALC_JOB_RETENTION_SECONDS,
+)
@@ -0,0 +1,148 @@
+# app/operations/memo.py
+"""
+Memoization of calculation results.
+
+Results are cached under a digest of the calculation type and the inputs
+packed as float64, so ``[2, 3]`` and ``[2.0, 3.0]`` share an entry. The
+cache is an LRU bounded by an approximate byte budget, with a TTL per entry.
+It is off unless CALC_MEMO_ENABLED is set.
+"""
+import hashlib
+import sys
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+from typing import Callable, Dict, Sequence, Tuple, Union
+
+from app.core.config import settings
+from app.operations.vectorized import as_float64, is_vector
+from app.schemas.calculation import CalculationType
+
+
+def make_key(calc_type: Union[CalculationType, str], inputs: Sequence[float]) -> bytes:
+    """Return the canonical cache key for a (type, inputs) pair."""
+    digest = hashlib.blake2b(digest_size=20)
+    digest.update(CalculationType(calc_type).value.encode())
+    digest.update(b"\0")
+    digest.update(memoryview(as_float64(inputs)).cast("B"))
+    return digest.digest()
+
+
+class ResultCache:
+    """Thread-safe LRU + TTL cache bounded by size in bytes."""
+
+    def __init__(self, max_bytes: int, ttl_seconds: float, enabled: bool = True):
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.enabled = enabled
+        self._entries: "OrderedDict[bytes, Tuple[float, float, int]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    @staticmethod
+    def _entry_size(key: bytes, value: float) -> int:
+        # Key, value and expiry timestamp; dict bookkeeping is not counted.
+        return sys.getsizeof(key) + sys.getsizeof(value) + sys.getsizeof(0.0)
+
+    def get(self, key: bytes) -> Tuple[bool, float]:
+        """Return (found, value) for a key, refreshing its LRU position."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return False, None
+            value, expires_at, size = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                self._bytes -= size
+                self.expirations += 1
+                self.misses += 1
+                return False, None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return True, value
+
+    def put(self, key: bytes, value: float) -> None:
+        """Store a value, evicting least recently used entries over budget."""
+        size = self._entry_size(key, value)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old[2]
+            self._entries[key] = (value, time.monotonic() + self.ttl_seconds, size)
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                _, (_, _, evicted_size) = self._entries.popitem(last=False)
+                self._bytes -= evicted_size
+                self.evictions += 1
+
+    def clear(self) -> None:
+        """Drop all entries; counters are kept."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, Union[int, bool]]:
+        """Return the cache counters."""
+        with self._lock:
+            return {
+                "enabled": self.enabled,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
+
+
+result_cache = ResultCache(
+    max_bytes=settings.CALC_MEMO_MAX_BYTES,
+    ttl_seconds=settings.CALC_MEMO_TTL_SECONDS,
+    enabled=settings.CALC_MEMO_ENABLED,
+)
+
+
+def lookup_or_compute(
+    calc_type: Union[CalculationType, str],
+    inputs: Sequence[float],
+    compute: Callable[[], float],
+) -> float:
+    """
+    Return the cached result for (calc_type, inputs), computing it on a miss.
+
+    Input vectors shorter than CALC_MEMO_MIN_INPUTS bypass the cache. Keying
+    hashes every input, so a hit usually costs more than the reduction it
+    skips; see benchmarks/memo_hit.py before enabling the cache. Exceptions
+    raised by ``compute`` are never cached.
+    """
+    if (
+        not result_cache.enabled
+        or not is_vector(inputs)
+        or len(inputs) < settings.CALC_MEMO_MIN_INPUTS
+    ):
+        return compute()
+
+    key = make_key(calc_type, inputs)
+    found, value = result_cache.get(key)
+    if found:
+        return value
+    value = compute()
+    result_cache.put(key, value)
+    return value
+
+
+def memoize_result(method: Callable) -> Callable:
+    """Decorate a calculation's get_result so it goes through the result cache."""
+    @wraps(method)
+    def wrapper(self):
+        return lookup_or_compute(self.type, self.inputs, lambda: method(self))
+    return wrapper
@@ -0,0 +1,131 @@
+# app/operations/packing.py
+"""
+Compact binary encoding for calculation inputs.
+
+Layout: a 5-byte header (flags, element count) followed by the values as
+little-endian float64, or float32 when every value round-trips exactly.
+Payloads of at least ``compress_min_bytes`` are zlib-compressed when that
+makes them smaller.
+"""
+import struct
+import sys
+import zlib
+from array import array
+from collections.abc import Sequence
+from typing import Iterable, Optional
+
+from app.operations.vectorized import HAS_NUMPY, as_float64, np
+
+_HEADER = struct.Struct("<BI")
+FLAG_FLOAT32 = 0x01
+FLAG_ZLIB = 0x02
+
+
+def _to_little_endian(values: array) -> array:
+    if sys.byteorder == "big":  # pragma: no cover - little-endian CI
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values
+
+
+def encode_inputs(inputs: Iterable[float], compress_min_bytes: Optional[int] = 4096) -> bytes:
+    """
+    Pack input values into the compact binary format.
+
+    Args:
+        inputs: Numbers to pack
+        compress_min_bytes: Smallest payload to try compressing; None disables it
+
+    Returns:
+        bytes: Header and payload
+    """
+    if isinstance(inputs, PackedVector):
+        return inputs.raw
+    values = as_float64(inputs)
+    flags = 0
+
+    if HAS_NUMPY:
+        with np.errstate(over="ignore"):  # out-of-range values fail the check below
+            narrow = values.astype("<f4")
+        if np.array_equal(narrow.astype(np.float64), values):
+            payload, flags = narrow.tobytes(), FLAG_FLOAT32
+        else:
+            payload = values.astype("<f8").tobytes()
+    else:
+        narrow = array("f", values)
+        if all(a == b for a, b in zip(narrow, values)):
+            payload, flags = _to_little_endian(narrow).tobytes(), FLAG_FLOAT32
+        else:
+            payload = _to_little_endian(array("d", values)).tobytes()
+
+    if compress_min_bytes is not None and len(payload) >= compress_min_bytes:
+        compressed = zlib.compress(payload, 6)
+        if len(compressed) < len(payload):
+            payload, flags = compressed, flags | FLAG_ZLIB
+
+    return _HEADER.pack(flags, len(values)) + payload
+
+
+def decode_inputs(raw: bytes):
+    """Unpack bytes produced by encode_inputs into a float64 buffer."""
+    flags, count = _HEADER.unpack_from(raw)
+    payload = memoryview(raw)[_HEADER.size:]
+    if flags & FLAG_ZLIB:
+        payload = zlib.decompress(payload)
+
+    if HAS_NUMPY:
+        dtype = "<f4" if flags & FLAG_FLOAT32 else "<f8"
+        return np.frombuffer(payload, dtype=dtype, count=count).astype(np.float64, copy=False)
+
+    values = array("f" if flags & FLAG_FLOAT32 else "d")
+    values.frombytes(bytes(payload))
+    values = _to_little_endian(values)
+    return values if values.typecode == "d" else array("d", values)
+
+
+class PackedVector(Sequence):
+    """
+    Read-only sequence over packed inputs that decodes on first access.
+
+    ``len()`` is answered from the header, so rows whose inputs are never
+    read are never decoded.
+    """
+
+    __slots__ = ("raw", "_values")
+
+    def __init__(self, raw: bytes):
+        self.raw = bytes(raw)
+        self._values = None
+
+    @property
+    def values(self):
+        """The decoded float64 buffer."""
+        if self._values is None:
+            self._values = decode_inputs(self.raw)
+        return self._values
+
+    def __len__(self) -> int:
+        return _HEADER.unpack_from(self.raw)[1]
+
+    def __getitem__(self, index):
+        item = self.values[index]
+        if isinstance(index, slice):
+            return item.tolist()
+        return float(item)
+
+    def __iter__(self):
+        return iter(self.tolist())
+
+    def __array__(self, dtype=None, copy=None):
+        return self.values if dtype is None else self.values.astype(dtype)
+
+    def tolist(self) -> list:
+        return self.values.tolist()
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, (PackedVector, list, tuple)):
+            return self.tolist() == list(other)
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return repr(self.tolist())
@@ -0,0 +1,202 @@
+# app/operations/parallel.py
+"""
+Process-pool reduction for very large input vectors.
+
+The inputs are packed once into a shared memory block as float64; each
+worker attaches to the block and reduces its own slice, so no input data
+is pickled. Partial results are combined in order:
+
+- addition: partial sums are added
+- subtraction: a0 - a1 - ... - an == a0 - (sum of each later chunk)
+- multiplication: partial products are multiplied
+- division: a0 / a1 / ... / an == a0 / (product of each chunk's divisors)
+
+Products are carried as (mantissa, binary exponent) pairs, so a chunk's
+product cannot overflow or underflow on its own: the result is inf or 0
+only where the whole reduction is, whatever the chunking. This keeps the
+left-to-right meaning of subtraction and division. Rounding can differ
+from the sequential loop in the last few bits.
+
+The pool has CALC_PARALLEL_WORKERS processes per application worker;
+by default the host's CPUs are shared between the WEB_CONCURRENCY workers.
+Workers are started by a fork server, not forked from the application:
+by the time the pool starts, the app has threads, an event loop and
+connection pools that a forked child would inherit mid-use.
+"""
+import asyncio
+import math
+import multiprocessing
+import operator
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import reduce
+from multiprocessing import shared_memory
+from typing import List, Optional, Sequence, Tuple, Union
+
+from app.core.config import settings
+from app.operations.vectorized import HAS_NUMPY, as_float64, np
+from app.schemas.calculation import CalculationType
+
+_pool: Optional[ProcessPoolExecutor] = None
+
+
+def pool_size() -> int:
+    """Number of worker processes (and chunks per reduction) of this application worker."""
+    if settings.CALC_PARALLEL_WORKERS:
+        return settings.CALC_PARALLEL_WORKERS
+    return max(1, (os.cpu_count() or 1) // max(1, settings.WEB_CONCURRENCY))
+
+
+def get_pool() -> ProcessPoolExecutor:
+    """Return the shared process pool, creating it on first use."""
+    global _pool
+    if _pool is None:
+        _pool = ProcessPoolExecutor(max_workers=pool_size(), mp_context=multiprocessing.get_context("forkserver"))
+    return _pool
+
+
+def shutdown_pool() -> None:
+    """Shut the process pool down (called from the application lifespan)."""
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
+
+
+def _chunk_bounds(length: int, chunks: int) -> List[Tuple[int, int]]:
+    """Split [0, length) into at most ``chunks`` contiguous ranges."""
+    step = math.ceil(length / chunks)
+    return [(start, min(start + step, length)) for start in range(0, length, step)]
+
+
+# Mantissas are in [0.5, 1): the product of this many stays a normal float.
+_PRODUCT_BLOCK = 512
+
+
+def _frexp_product(values) -> Tuple[float, int]:
+    """Product of values as (mantissa, exponent) with product == mantissa * 2**exponent."""
+    if HAS_NUMPY:
+        mantissas, exponents = np.frexp(values)
+        exponent = int(exponents.sum(dtype=np.int64))
+        while len(mantissas) > 1:
+            pad = -len(mantissas) % _PRODUCT_BLOCK
+            if pad:
+                mantissas = np.concatenate((mantissas, np.ones(pad)))
+            mantissas, exponents = np.frexp(mantissas.reshape(-1, _PRODUCT_BLOCK).prod(axis=1))
+            exponent += int(exponents.sum(dtype=np.int64))
+        return (float(mantissas[0]) if len(mantissas) else 1.0), exponent
+    mantissa, exponent = 1.0, 0
+    for value in values:
+        value_mantissa, value_exponent = math.frexp(value)
+        mantissa, shift = math.frexp(mantissa * value_mantissa)
+        exponent += value_exponent + shift
+    return mantissa, exponent
+
+
+def _reduce_values(values, calc_type: CalculationType, first: bool) -> Tuple[float, int, bool]:
+    """
+    Reduce one slice; returns (partial, exponent, whether it holds a zero
+    divisor), the partial result being partial * 2**exponent.
+    """
+    if calc_type == CalculationType.ADDITION or (calc_type == CalculationType.SUBTRACTION and not first):
+        return (float(np.add.accumulate(values)[-1]) if HAS_NUMPY else float(sum(values))), 0, False
+    if calc_type == CalculationType.SUBTRACTION:
+        return (float(np.subtract.accumulate(values)[-1]) if HAS_NUMPY else float(reduce(operator.sub, values))), 0, False
+    if calc_type == CalculationType.MULTIPLICATION:
+        return (*_frexp_product(values), False)
+
+    # Division: the product of the chunk's divisors (the first chunk's head
+    # is the dividend and is read by the caller).
+    divisors = values[1:] if first else values
+    if (not divisors.all()) if HAS_NUMPY else any(v == 0 for v in divisors):
+        return 0.0, 0, True
+    return (*_frexp_product(divisors), False)
+
+
+def _reduce_chunk(
+    shm_name: str, length: int, start: int, stop: int, calc_type: str, first: bool
+) -> Tuple[float, int, bool]:
+    """Worker: attach to the shared block and reduce inputs[start:stop]."""
+    # Pool workers share the parent's resource tracker, which unlinks the
+    # block once the parent is done with it.
+    shm = shared_memory.SharedMemory(name=shm_name)
+    if HAS_NUMPY:
+        view = np.ndarray((length,), dtype=np.float64, buffer=shm.buf)
+    else:
+        view = shm.buf.cast("d")
+    try:
+        return _reduce_values(view[start:stop], CalculationType(calc_type), first)
+    finally:
+        # Views must be gone before the block can be closed.
+        if not HAS_NUMPY:
+            view.release()
+        del view
+        shm.close()
+
+
+def _pack(inputs: Sequence[float]) -> Tuple[shared_memory.SharedMemory, int]:
+    """Copy the inputs into a new shared memory block as float64."""
+    values = as_float64(inputs)
+    length = len(values)
+    shm = shared_memory.SharedMemory(create=True, size=max(length, 1) * 8)
+    shm.buf[:length * 8] = memoryview(values).cast("B")
+    return shm, length
+
+
+async def reduce_in_pool(calc_type: Union[CalculationType, str], inputs: Sequence[float]) -> float:
+    """
+    Reduce a large input vector across the process pool.
+
+    Args:
+        calc_type: Calculation type (enum member or its string value)
+        inputs: At least two numbers
+
+    Returns:
+        float: The combined result
+
+    Raises:
+        ZeroDivisionError: If a divisor is zero
+    """
+    calc_type = CalculationType(calc_type)
+    loop = asyncio.get_running_loop()
+    pool = get_pool()
+
+    shm, length = await loop.run_in_executor(None, _pack, inputs)
+    try:
+        bounds = _chunk_bounds(length, pool_size())
+        partials = await asyncio.gather(*[
+            loop.run_in_executor(
+                pool, _reduce_chunk, shm.name, length, start, stop, calc_type.value, index == 0
+            )
+            for index, (start, stop) in enumerate(bounds)
+        ])
+    finally:
+        shm.close()
+        shm.unlink()
+
+    if any(has_zero for _, _, has_zero in partials):
+        raise ZeroDivisionError("float division by zero")
+
+    if calc_type in (CalculationType.ADDITION, CalculationType.SUBTRACTION):
+        result = partials[0][0]
+        for partial, _, _ in partials[1:]:
+            result = result + partial if calc_type == CalculationType.ADDITION else result - partial
+        return result
+
+    # Multiply (or divide) the chunk products in order, renormalizing so
+    # nothing over- or underflows before the final scaling.
+    if calc_type == CalculationType.MULTIPLICATION:
+        mantissa, exponent = 1.0, 0
+    else:
+        mantissa, exponent = math.frexp(float(inputs[0]))
+    for partial, partial_exponent, _ in partials:
+        if calc_type == CalculationType.MULTIPLICATION:
+            mantissa, shift = math.frexp(mantissa * partial)
+            exponent += partial_exponent + shift
+        else:
+            mantissa, shift = math.frexp(mantissa / partial)
+            exponent += shift - partial_exponent
+    try:
+        return math.ldexp(mantissa, exponent)
+    except OverflowError:
+        return math.copysign(math.inf, mantissa)
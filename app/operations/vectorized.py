@@ -0,0 +1,207 @@
+# app/operations/vectorized.py
+"""
+Batch evaluation engine for calculations.
+
+Inputs are packed into contiguous float64 buffers and reduced strictly
+left-to-right, so results match the scalar loops in
+``app.models.calculation`` and ``perform_calculation`` bit for bit.
+NumPy is used when it is installed; otherwise the engine falls back to
+``array('d')`` buffers reduced with C-level builtins.
+"""
+import math
+import operator
+from array import array
+from collections.abc import Sequence as SequenceABC
+from functools import reduce
+from typing import Iterable, List, Sequence, Tuple, Union
+
+from app.schemas.calculation import CalculationType
+
+try:  # NumPy is optional
+    import numpy as np
+except ImportError:  # pragma: no cover - depends on the environment
+    np = None
+
+HAS_NUMPY = np is not None
+
+Number = Union[int, float]
+
+# Rows shorter than this are stacked and reduced together in evaluate_many;
+# longer ones are already wide enough to vectorize on their own.
+STACK_MAX_LENGTH = 256
+
+# Scalar operators, applied left-to-right
+_OPERATORS = {
+    CalculationType.ADDITION: operator.add,
+    CalculationType.SUBTRACTION: operator.sub,
+    CalculationType.MULTIPLICATION: operator.mul,
+    CalculationType.DIVISION: operator.truediv,
+}
+
+if HAS_NUMPY:
+    _UFUNCS = {
+        CalculationType.ADDITION: np.add,
+        CalculationType.SUBTRACTION: np.subtract,
+        CalculationType.MULTIPLICATION: np.multiply,
+        CalculationType.DIVISION: np.divide,
+    }
+
+
+def is_vector(inputs) -> bool:
+    """Return True for a list of numbers, a float buffer or another numeric sequence."""
+    if isinstance(inputs, list):
+        return True
+    if HAS_NUMPY and isinstance(inputs, np.ndarray):
+        return inputs.ndim == 1
+    if isinstance(inputs, (str, bytes, bytearray)):
+        return False
+    return isinstance(inputs, (array, memoryview, SequenceABC))
+
+
+def is_packed(inputs) -> bool:
+    """
+    Return True for a float64 buffer (NumPy array or ``array('d')``).
+
+    Only these are worth handing to ``reduce_inputs``: a list has to be
+    converted first, which costs more than reducing it with the scalar
+    loop (see benchmarks/vectorize_threshold.py).
+    """
+    if HAS_NUMPY and isinstance(inputs, np.ndarray):
+        return inputs.ndim == 1
+    return isinstance(inputs, array) and inputs.typecode == "d"
+
+
+def as_float64(inputs: Sequence[Number]):
+    """
+    Return the inputs as a contiguous float64 buffer.
+
+    NumPy arrays and ``array('d')`` buffers are returned without copying
+    when they already have the right layout.
+    """
+    if HAS_NUMPY:
+        return np.ascontiguousarray(inputs, dtype=np.float64)
+    if isinstance(inputs, array) and inputs.typecode == "d":
+        return inputs
+    return array("d", inputs)
+
+
+def reduce_inputs(calc_type: Union[CalculationType, str], inputs: Sequence[Number]) -> float:
+    """
+    Reduce one input vector with the operator for ``calc_type``.
+
+    Args:
+        calc_type: Calculation type (enum member or its string value)
+        inputs: At least two numbers
+
+    Returns:
+        float: The left-to-right reduction of the inputs
+
+    Raises:
+        ZeroDivisionError: If a divisor (any input after the first) is zero
+    """
+    calc_type = CalculationType(calc_type)
+    values = as_float64(inputs)
+
+    if HAS_NUMPY:
+        if calc_type == CalculationType.DIVISION and not values[1:].all():
+            raise ZeroDivisionError("float division by zero")
+        # ufunc.accumulate is always sequential, unlike add.reduce which
+        # uses pairwise summation and would round differently.
+        return float(_UFUNCS[calc_type].accumulate(values)[-1])
+
+    if calc_type == CalculationType.ADDITION:
+        return float(sum(values))
+    if calc_type == CalculationType.MULTIPLICATION:
+        return float(math.prod(values))
+    return float(reduce(_OPERATORS[calc_type], values))
+
+
+def _check_inputs(inputs) -> None:
+    """Apply the input rules of Calculation.get_result, with the same messages."""
+    if not is_vector(inputs):
+        raise ValueError("Inputs must be a list of numbers.")
+    if len(inputs) < 2:
+        raise ValueError("Inputs must be a list with at least two numbers.")
+
+
+def _reduce_one(calc_type: CalculationType, inputs: Sequence[Number]) -> float:
+    try:
+        return reduce_inputs(calc_type, inputs)
+    except (TypeError, ValueError):
+        raise ValueError("Inputs must be a list of numbers.") from None
+
+
+def _reduce_rows(calc_type: CalculationType, rows: List[Sequence[Number]]) -> List[float]:
+    """Reduce equal-length rows (at least two columns) column by column across the whole group."""
+    matrix = np.array(rows, dtype=np.float64)
+    ufunc = _UFUNCS[calc_type]
+    acc = matrix[:, 0].copy()
+    for col in range(1, matrix.shape[1]):
+        ufunc(acc, matrix[:, col], out=acc)
+    return acc.tolist()
+
+
+def evaluate_many(
+    items: Iterable[Tuple[Union[CalculationType, str], Sequence[Number]]],
+    return_exceptions: bool = False,
+) -> List[Union[float, Exception]]:
+    """
+    Evaluate many (type, inputs) pairs in one pass.
+
+    With NumPy, items sharing a type and input length are stacked into a
+    single float64 matrix and reduced together; long vectors go through
+    ``reduce_inputs`` individually.
+
+    Args:
+        items: Iterable of (calculation type, inputs) pairs
+        return_exceptions: When True, a failing item yields its exception in
+            place of a result instead of aborting the whole batch
+
+    Returns:
+        list: Results in the same order as ``items``
+
+    Raises:
+        ValueError: For an unknown calculation type, or inputs that are not
+            a list of at least two numbers (unless return_exceptions)
+        ZeroDivisionError: For a zero divisor (unless return_exceptions)
+    """
+    items = list(items)
+    results: List[Union[float, Exception]] = [None] * len(items)
+    groups = {}
+
+    for index, (calc_type, inputs) in enumerate(items):
+        try:
+            try:
+                calc_type = CalculationType(calc_type)
+            except ValueError:
+                raise ValueError(f"Unsupported calculation type: {calc_type}") from None
+            _check_inputs(inputs)
+            if HAS_NUMPY and len(inputs) < STACK_MAX_LENGTH:
+                if calc_type == CalculationType.DIVISION and 0 in inputs[1:]:
+                    raise ZeroDivisionError("float division by zero")
+                groups.setdefault((calc_type, len(inputs)), []).append(index)
+            else:
+                results[index] = _reduce_one(calc_type, inputs)
+        except (ValueError, ZeroDivisionError) as e:
+            if not return_exceptions:
+                raise
+            results[index] = e
+
+    for (calc_type, _), indexes in groups.items():
+        try:
+            values = _reduce_rows(calc_type, [items[i][1] for i in indexes])
+        except (TypeError, ValueError):
+            # A row that is not all numbers: reduce the group row by row so
+            # only the bad rows fail.
+            values = []
+            for index in indexes:
+                try:
+                    values.append(_reduce_one(calc_type, items[index][1]))
+                except ValueError as e:
+                    if not return_exceptions:
+                        raise
+                    values.append(e)
+        for index, value in zip(indexes, values):
+            results[index] = value
+
+    return results
@@ -0,0 +1,156 @@
+# app/routers/async_api.py
+"""
+Async versions of the auth and calculation CRUD endpoints.
+
+With DATABASE_ASYNC=true, app.main serves these routes in place of its sync
+handlers: requests wait on the async engine's connection pool instead of
+each holding a threadpool thread, so concurrency is bounded by the pool.
+Behavior is shared with the sync stack: create and update reuse the
+app.main coroutines, and model helpers written against a sync Session run
+through AsyncSession.run_sync on the same connection.
+
+Batch, ingest and job endpoints stay on the sync stack.
+"""
+from typing import Annotated, List, Literal
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.security import OAuth2PasswordRequestForm
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import main as api
+from app.auth.dependencies import get_current_active_user
+from app.database import get_async_db
+from app.models.calculation import Calculation, CalculationStats
+from app.models.user import User
+from app.schemas.calculation import (
+    CalculationBase,
+    CalculationListQuery,
+    CalculationResponse,
+    CalculationStatsResponse,
+    CalculationUpdate,
+)
+from app.schemas.token import TokenResponse
+from app.schemas.user import UserCreate, UserLogin, UserResponse
+
+router = APIRouter()
+
+
+async def _get_user_calculation(db: AsyncSession, calc_id: str, user_id) -> Calculation:
+    """Parse the id and load one of the user's calculations, or raise 400/404."""
+    calc_uuid = api._parse_calculation_id(calc_id)
+    return await db.run_sync(api._get_user_calculation, calc_uuid, user_id)
+
+
+# ------------------------------------------------------------------------------
+# Auth
+# ------------------------------------------------------------------------------
+@router.post(
+    "/auth/register",
+    response_model=UserResponse,
+    status_code=status.HTTP_201_CREATED,
+    tags=["auth"]
+)
+async def register(user_create: UserCreate, db: AsyncSession = Depends(get_async_db)):
+    user_data = user_create.dict(exclude={"confirm_password"})
+    try:
+        user = await User.aregister(db, user_data)
+        await db.commit()
+        await db.refresh(user)
+        return user
+    except ValueError as e:
+        await db.rollback()
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+@router.post("/auth/login", response_model=TokenResponse, tags=["auth"])
+async def login_json(user_login: UserLogin, db: AsyncSession = Depends(get_async_db)):
+    """Login with JSON payload"""
+    auth_result = api._check_login(
+        await User.aauthenticate(db, user_login.username, user_login.password)
+    )
+    await db.commit()  # Commit the last_login update
+    return api._token_response(auth_result)
+
+@router.post("/auth/token", tags=["auth"])
+async def login_form(
+    form_data: OAuth2PasswordRequestForm = Depends(),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Login with form data for Swagger UI"""
+    auth_result = api._check_login(
+        await User.aauthenticate(db, form_data.username, form_data.password)
+    )
+    return {
+        "access_token": auth_result["access_token"],
+        "token_type": "bearer"
+    }
+
+# ------------------------------------------------------------------------------
+# Calculations
+# ------------------------------------------------------------------------------
+async def create_calculation(
+    calculation_data: CalculationBase = Depends(api.read_calculation_payload),
+    mode: Literal["sync", "async"] = Query(
+        "sync",
+        description="async: queue the calculation, answer 202 and poll GET /jobs/{id}"
+    ),
+    current_user = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Compute and persist a calculation; see app.main.create_calculation."""
+    return await api.create_calculation(calculation_data, mode, current_user, db)
+
+router.add_api_route("/calculations", create_calculation, **api.CREATE_CALCULATION_ROUTE)
+
+@router.get("/calculations", response_model=List[CalculationResponse], tags=["calculations"])
+async def list_calculations(
+    request: Request,
+    response: Response,
+    params: Annotated[CalculationListQuery, Query()],
+    current_user = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    stmt = api._page_statement(current_user.id, params)
+    rows = await db.scalars(stmt)
+    calculations, next_cursor = Calculation.split_page(rows.all(), params)
+    api._set_next_page(request, response, next_cursor)
+    return calculations
+
+@router.get("/calculations/stats", response_model=CalculationStatsResponse, tags=["calculations"])
+async def get_calculation_stats(
+    current_user = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    rows = await db.scalars(
+        select(CalculationStats)
+        .where(CalculationStats.user_id == current_user.id)
+        .order_by(CalculationStats.type)
+    )
+    return api._stats_response(rows.all())
+
+@router.get("/calculations/{calc_id}", response_model=CalculationResponse, tags=["calculations"])
+async def get_calculation(
+    calc_id: str,
+    current_user = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    return await _get_user_calculation(db, calc_id, current_user.id)
+
+@router.put("/calculations/{calc_id}", response_model=CalculationResponse, tags=["calculations"])
+async def update_calculation(
+    calc_id: str,
+    calculation_update: CalculationUpdate,
+    current_user = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    return await api.update_calculation(calc_id, calculation_update, current_user, db)
+
+@router.delete("/calculations/{calc_id}", status_code=status.HTTP_204_NO_CONTENT, tags=["calculations"])
+async def delete_calculation(
+    calc_id: str,
+    current_user = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    calc_uuid = api._parse_calculation_id(calc_id)
+    await db.run_sync(api._delete_user_calculation, calc_uuid, current_user.id)
+    return None
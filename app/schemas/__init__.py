@@ -14,7 +14,23 @@ from .calculation import (
     CalculationBase,
     CalculationCreate,
     CalculationUpdate,
-    CalculationResponse
+    CalculationResponse,
+    CalculationBatchRequest,
+    CalculationBatchError,
+    CalculationBatchResponse,
+    CalculationIngestError,
+    CalculationIngestResponse,
+    CalculationFilter,
+    CalculationListQuery,
+    CalculationExportQuery,
+    CalculationBulkFilter,
+    CalculationBulkDeleteResponse,
+    CalculationRecomputeError,
+    CalculationRecomputeResponse,
+    CalculationTypeStats,
+    CalculationStatsResponse,
+    CalculationJobStatus,
+    CalculationJobResponse
 )
 
 __all__ = [
@@ -32,4 +48,20 @@ __all__ = [
     'CalculationCreate',
     'CalculationUpdate',
     'CalculationResponse',
+    'CalculationBatchRequest',
+    'CalculationBatchError',
+    'CalculationBatchResponse',
+    'CalculationIngestError',
+    'CalculationIngestResponse',
+    'CalculationFilter',
+    'CalculationListQuery',
+    'CalculationExportQuery',
+    'CalculationBulkFilter',
+    'CalculationBulkDeleteResponse',
+    'CalculationRecomputeError',
+    'CalculationRecomputeResponse',
+    'CalculationTypeStats',
+    'CalculationStatsResponse',
+    'CalculationJobStatus',
+    'CalculationJobResponse',
 ]
\ No newline at end of file
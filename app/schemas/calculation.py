@@ -1,6 +1,6 @@
 from enum import Enum
 from pydantic import BaseModel, Field, ConfigDict, model_validator, field_validator
-from typing import List, Optional
+from typing import Any, Dict, List, Literal, Optional
 from uuid import UUID
 from datetime import datetime
 
@@ -23,6 +23,11 @@ class CalculationBase(BaseModel):
         example=[10.5, 3, 2],
         min_items=2
     )
+    input_refs: Optional[Dict[int, UUID]] = Field(
+        None,
+        description="Map of input position to the id of a calculation whose result feeds that input",
+        example={"1": "123e4567-e89b-12d3-a456-426614174999"}
+    )
 
     @field_validator("type", mode="before")
     @classmethod
@@ -36,6 +41,9 @@ class CalculationBase(BaseModel):
     @field_validator("inputs", mode="before")
     @classmethod
     def check_inputs_is_list(cls, v):
+        if hasattr(v, "tolist"):
+            # Packed inputs loaded from the database
+            v = v.tolist()
         if not isinstance(v, list):
             raise ValueError("Input should be a valid list")
         return v
@@ -45,9 +53,13 @@ class CalculationBase(BaseModel):
         """Validate inputs based on calculation type"""
         if len(self.inputs) < 2:
             raise ValueError("At least two numbers are required for calculation")
+        refs = self.input_refs or {}
+        if any(not 0 <= position < len(self.inputs) for position in refs):
+            raise ValueError("Input reference position is out of range")
         if self.type == CalculationType.DIVISION:
-            # Prevent division by zero (skip the first value as numerator)
-            if any(x == 0 for x in self.inputs[1:]):
+            # Prevent division by zero (skip the first value as numerator and
+            # referenced positions, which are resolved later)
+            if any(x == 0 for i, x in enumerate(self.inputs[1:], 1) if i not in refs):
                 raise ValueError("Cannot divide by zero")
         return self
 
@@ -87,6 +99,10 @@ class CalculationUpdate(BaseModel):
         example=[42, 7],
         min_items=2
     )
+    input_refs: Optional[Dict[int, UUID]] = Field(
+        None,
+        description="Replacement input references; an empty object removes all references"
+    )
 
     @model_validator(mode='after')
     def validate_inputs(self) -> "CalculationUpdate":
@@ -134,3 +150,162 @@ class CalculationResponse(CalculationBase):
             }
         }
     )
+
+
+class CalculationBatchRequest(BaseModel):
+    """Schema for creating many calculations in one request"""
+    items: List[Dict[str, Any]] = Field(
+        ...,
+        description="Calculations to create; each item is validated like CalculationBase",
+        min_length=1
+    )
+
+    model_config = ConfigDict(
+        json_schema_extra={
+            "example": {
+                "items": [
+                    {"type": "addition", "inputs": [10.5, 3, 2]},
+                    {"type": "division", "inputs": [100, 2]}
+                ]
+            }
+        }
+    )
+
+class CalculationBatchError(BaseModel):
+    """Error for a single item of a batch request"""
+    index: int = Field(..., description="Position of the item in the request")
+    detail: str = Field(..., description="Why the item was rejected")
+
+class CalculationBatchResponse(BaseModel):
+    """Schema for the result of a batch create"""
+    created: List[CalculationResponse] = Field(
+        ...,
+        description="Created calculations, in request order"
+    )
+    errors: List[CalculationBatchError] = Field(
+        default_factory=list,
+        description="Items that were rejected"
+    )
+
+class CalculationIngestError(BaseModel):
+    """Error for a single line of an NDJSON ingest"""
+    line: int = Field(..., description="1-based line number in the upload")
+    detail: str = Field(..., description="Why the line was rejected")
+
+class CalculationIngestResponse(BaseModel):
+    """Summary of an NDJSON ingest"""
+    lines: int = Field(..., description="Non-empty lines read from the upload")
+    created: int = Field(..., description="Calculations stored")
+    failed: int = Field(..., description="Lines that were rejected")
+    errors: List[CalculationIngestError] = Field(
+        default_factory=list,
+        description="First rejected lines; see errors_truncated"
+    )
+    errors_truncated: bool = Field(
+        False,
+        description="True if more lines failed than are listed in errors"
+    )
+
+class CalculationFilter(BaseModel):
+    """Query parameters selecting a subset of a user's calculations"""
+    type: Optional[CalculationType] = Field(None, description="Only calculations of this type")
+    result_min: Optional[float] = Field(None, description="Only results greater than or equal to this")
+    result_max: Optional[float] = Field(None, description="Only results less than or equal to this")
+    created_after: Optional[datetime] = Field(None, description="Only calculations created at or after this time")
+    created_before: Optional[datetime] = Field(None, description="Only calculations created before this time")
+
+    @model_validator(mode='after')
+    def validate_ranges(self) -> "CalculationFilter":
+        if self.result_min is not None and self.result_max is not None and self.result_min > self.result_max:
+            raise ValueError("result_min must not be greater than result_max")
+        if self.created_after and self.created_before and self.created_after >= self.created_before:
+            raise ValueError("created_after must be earlier than created_before")
+        return self
+
+class CalculationListQuery(CalculationFilter):
+    """Query parameters for listing calculations, newest first by default"""
+    limit: int = Field(100, ge=1, le=1000, description="Maximum number of calculations to return")
+    cursor: Optional[str] = Field(
+        None,
+        description="X-Next-Cursor value of the previous page; filters and order must not change"
+    )
+    order: Literal["desc", "asc"] = Field("desc", description="Sort direction of created_at")
+
+class CalculationExportQuery(CalculationFilter):
+    """Query parameters for exporting calculations, oldest first"""
+    format: Literal["ndjson", "csv"] = Field("ndjson", description="Output format")
+
+class CalculationBulkFilter(CalculationFilter):
+    """Selection for bulk delete and recompute; at least one criterion is required"""
+    ids: Optional[List[UUID]] = Field(None, description="Only calculations with these ids")
+
+    @model_validator(mode='after')
+    def require_criterion(self) -> "CalculationBulkFilter":
+        if all(value is None for value in self.model_dump().values()):
+            raise ValueError("At least one filter is required")
+        return self
+
+    model_config = ConfigDict(
+        json_schema_extra={
+            "example": {"type": "division", "created_before": "2025-01-01T00:00:00"}
+        }
+    )
+
+class CalculationBulkDeleteResponse(BaseModel):
+    """Result of a bulk delete"""
+    deleted: int = Field(..., description="Calculations deleted")
+    batches: int = Field(..., description="DELETE statements that removed rows")
+
+class CalculationRecomputeError(BaseModel):
+    """A calculation whose result could not be recomputed"""
+    id: UUID = Field(..., description="Calculation id")
+    detail: str = Field(..., description="Why recomputing failed")
+
+class CalculationRecomputeResponse(BaseModel):
+    """Result of a bulk recompute"""
+    matched: int = Field(..., description="Calculations that matched the filter")
+    updated: int = Field(..., description="Calculations whose stored result changed")
+    failed: int = Field(..., description="Calculations that could not be recomputed")
+    batches: int = Field(..., description="Batches that wrote changed results")
+    errors: List[CalculationRecomputeError] = Field(
+        default_factory=list,
+        description="First failures; see errors_truncated"
+    )
+    errors_truncated: bool = Field(
+        False,
+        description="True if more calculations failed than are listed in errors"
+    )
+
+class CalculationTypeStats(BaseModel):
+    """Aggregates for one calculation type"""
+    type: CalculationType = Field(..., description="Calculation type")
+    count: int = Field(..., description="Number of calculations")
+    sum: Optional[float] = Field(None, description="Sum of the results")
+    min: Optional[float] = Field(None, description="Smallest result")
+    max: Optional[float] = Field(None, description="Largest result")
+    average: Optional[float] = Field(None, description="Mean result")
+    last_created_at: Optional[datetime] = Field(None, description="Time of the newest calculation")
+
+class CalculationStatsResponse(BaseModel):
+    """Aggregates over all of a user's calculations"""
+    count: int = Field(..., description="Number of calculations")
+    by_type: List[CalculationTypeStats] = Field(
+        default_factory=list,
+        description="Aggregates per calculation type"
+    )
+
+class CalculationJobStatus(str, Enum):
+    PENDING = "pending"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+class CalculationJobResponse(BaseModel):
+    """State of an asynchronous calculation job"""
+    id: UUID = Field(..., description="Job id; also the id of the calculation it creates")
+    status: CalculationJobStatus = Field(..., description="Job state")
+    calculation: Optional[CalculationResponse] = Field(
+        None,
+        description="The stored calculation once the job has succeeded"
+    )
+    error: Optional[str] = Field(None, description="Why the job failed")
@@ -0,0 +1,101 @@
+# benchmarks/async_vs_sync.py
+"""
+Load the calculation endpoints of two running servers side by side.
+
+Start the same app twice, once per mode, then point this script at both:
+
+    DATABASE_ASYNC=false uvicorn app.main:app --port 8001 --workers 1
+    DATABASE_ASYNC=true  uvicorn app.main:app --port 8002 --workers 1
+    python benchmarks/async_vs_sync.py \\
+        --target sync=http://localhost:8001 --target async=http://localhost:8002 \\
+        --requests 2000 --concurrency 200
+
+Each request creates a calculation and reads it back. The report lists
+throughput and latency percentiles per target, plus the server's pool wait
+histogram from GET /metrics.
+"""
+import argparse
+import asyncio
+import statistics
+import time
+import uuid
+from typing import Dict, List
+
+import httpx
+
+
+async def login(client: httpx.AsyncClient) -> Dict[str, str]:
+    """Register a throwaway user and return its auth header."""
+    suffix = uuid.uuid4().hex[:12]
+    password = "Bench-Passw0rd!"
+    response = await client.post("/auth/register", json={
+        "first_name": "Bench",
+        "last_name": "User",
+        "email": f"bench-{suffix}@example.com",
+        "username": f"bench_{suffix}",
+        "password": password,
+        "confirm_password": password,
+    })
+    response.raise_for_status()
+    response = await client.post("/auth/login", json={"username": f"bench_{suffix}", "password": password})
+    response.raise_for_status()
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+async def one_request(client: httpx.AsyncClient, headers: Dict[str, str], index: int) -> float:
+    start = time.perf_counter()
+    response = await client.post(
+        "/calculations",
+        json={"type": "addition", "inputs": [index, 1, 2]},
+        headers=headers,
+    )
+    response.raise_for_status()
+    response = await client.get(f"/calculations/{response.json()['id']}", headers=headers)
+    response.raise_for_status()
+    return time.perf_counter() - start
+
+
+async def run_target(base_url: str, requests: int, concurrency: int) -> Dict[str, float]:
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+        headers = await login(client)
+        semaphore = asyncio.Semaphore(concurrency)
+        latencies: List[float] = []
+
+        async def worker(index: int):
+            async with semaphore:
+                latencies.append(await one_request(client, headers, index))
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker(i) for i in range(requests)))
+        elapsed = time.perf_counter() - start
+        metrics = (await client.get("/metrics")).json()
+
+    quantiles = statistics.quantiles(latencies, n=100)
+    return {
+        "requests/s": requests / elapsed,
+        "p50 ms": quantiles[49] * 1000,
+        "p95 ms": quantiles[94] * 1000,
+        "p99 ms": quantiles[98] * 1000,
+        "pool waits": (metrics.get("async_db_pool") or metrics["db_pool"])["wait_seconds"]["count"],
+        "pool timeouts": (metrics.get("async_db_pool") or metrics["db_pool"])["timeouts"],
+    }
+
+
+async def main(targets: Dict[str, str], requests: int, concurrency: int) -> None:
+    results = {}
+    for name, url in targets.items():
+        results[name] = await run_target(url, requests, concurrency)
+    columns = list(next(iter(results.values())))
+    print(f"{'target':<10}" + "".join(f"{column:>15}" for column in columns))
+    for name, row in results.items():
+        print(f"{name:<10}" + "".join(f"{row[column]:>15.1f}" for column in columns))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--target", action="append", required=True, metavar="NAME=URL")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=200)
+    args = parser.parse_args()
+    asyncio.run(main(dict(t.split("=", 1) for t in args.target), args.requests, args.concurrency))
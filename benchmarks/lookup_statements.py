@@ -0,0 +1,96 @@
+# benchmarks/lookup_statements.py
+"""
+Per-call cost of the calculation and user lookups behind authenticated requests.
+
+Compares building the lookup with db.query(...).filter(...).first() each
+time against the pre-built statements. Calculation.get_owned runs on
+every get/update/delete of a calculation. User.get_token_generation is
+the user query of the live routes; it only runs on a token-generation
+cache miss (app.auth.generations), because the routes take the user from
+the token and do not load the row. User.get_by_id is used by
+app.auth.jwt.get_current_user, which no route depends on. Each case hits
+the same row through the same session, so the difference is ORM/Core
+overhead in Python:
+
+    PYTHONPATH=. python benchmarks/lookup_statements.py --database-url sqlite:////tmp/bench.db
+
+Against PostgreSQL the network round trip is added to both sides equally.
+"""
+import argparse
+import statistics
+import time
+import uuid
+
+from app.core.config import settings
+from app.database import get_engine, get_sessionmaker
+from app.migrations.schema import migrate
+from app.models.calculation import Calculation
+from app.models.user import User
+
+
+def per_call(func, iterations: int, rounds: int = 5) -> float:
+    """Median seconds per call over several rounds."""
+    samples = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for _ in range(iterations):
+            func()
+        samples.append((time.perf_counter() - start) / iterations)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--database-url", default=settings.DATABASE_URL)
+    parser.add_argument("--iterations", type=int, default=2000)
+    args = parser.parse_args()
+
+    bind = get_engine(args.database_url)
+    migrate(bind)
+    db = get_sessionmaker(bind)()
+    user = User(
+        first_name="Bench", last_name="User", email=f"{uuid.uuid4().hex}@example.com",
+        username=uuid.uuid4().hex[:20], password="x",
+    )
+    db.add(user)
+    db.flush()
+    calc = Calculation.create("addition", user.id, [1, 2])
+    calc.result = 3
+    db.add(calc)
+    db.commit()
+    user_id, calc_id = user.id, calc.id
+
+    cases = {
+        "calculation": (
+            lambda: db.query(Calculation).filter(
+                Calculation.id == calc_id, Calculation.user_id == user_id
+            ).first(),
+            lambda: Calculation.get_owned(db, calc_id, user_id),
+        ),
+        "generation": (
+            lambda: db.query(User.token_generation).filter(User.id == user_id).scalar(),
+            lambda: User.get_token_generation(db, user_id),
+        ),
+        "user": (
+            lambda: db.query(User).filter(User.id == user_id).first(),
+            lambda: User.get_by_id(db, user_id),
+        ),
+    }
+    for name, (query_each_time, prebuilt) in cases.items():
+        for func in (query_each_time, prebuilt):
+            func()  # warm the statement cache
+        before = per_call(query_each_time, args.iterations)
+        after = per_call(prebuilt, args.iterations)
+        print(
+            f"{name:12s} query() {before * 1e6:8.1f} us   pre-built {after * 1e6:8.1f} us   "
+            f"({(1 - after / before) * 100:.0f}% less)"
+        )
+
+    db.delete(user)
+    db.commit()
+    db.close()
+    bind.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+# benchmarks/memo_hit.py
+"""
+Compare a result cache hit with recomputing the result.
+
+For each input length, times the uncached get_result of a Calculation
+against the same call served from a warm ResultCache (make_key plus the
+LRU lookup), on a plain list and on a float64 buffer:
+
+    PYTHONPATH=. python benchmarks/memo_hit.py
+
+A hit only saves time where the "hit" column is below "compute". make_key
+hashes every input, so its cost grows with the length just like the
+reduction's, which is why CALC_MEMO_ENABLED defaults to off.
+"""
+import argparse
+import random
+import statistics
+import time
+
+from app.models.calculation import Calculation
+from app.operations import memo
+from app.operations.memo import ResultCache
+from app.operations.vectorized import HAS_NUMPY, as_float64
+
+
+def per_call(func, rounds: int = 5) -> float:
+    """Median seconds per call, over enough calls to take about 20 ms per round."""
+    func()
+    calls, start = 0, time.perf_counter()
+    while time.perf_counter() - start < 0.02:
+        func()
+        calls += 1
+    samples = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for _ in range(calls):
+            func()
+        samples.append((time.perf_counter() - start) / calls)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--types", default="addition,division")
+    parser.add_argument("--lengths", default="64,1024,10000,100000,1000000")
+    args = parser.parse_args()
+    memo.settings.CALC_MEMO_MIN_INPUTS = 0
+    warm = ResultCache(max_bytes=16 * 1024 * 1024, ttl_seconds=3600, enabled=True)
+    cold = ResultCache(max_bytes=0, ttl_seconds=0, enabled=False)
+    print(f"NumPy: {HAS_NUMPY}; microseconds per call")
+    print(f"{'type':15s} {'length':>8s} {'input':>6s} {'compute':>10s} {'hit':>10s} {'make_key':>10s}")
+    rng = random.Random(0)
+    for calc_type in args.types.split(","):
+        for length in map(int, args.lengths.split(",")):
+            values = [rng.uniform(0.99, 1.01) for _ in range(length)]
+            for label, inputs in (("list", values), ("buffer", as_float64(values))):
+                calculation = Calculation.create(calc_type, None, inputs)
+                memo.result_cache = cold
+                compute = per_call(calculation.get_result)
+                memo.result_cache = warm
+                hit = per_call(calculation.get_result)
+                make_key = per_call(lambda: memo.make_key(calc_type, inputs))
+                print(
+                    f"{calc_type:15s} {length:8d} {label:>6s} "
+                    f"{compute * 1e6:10.1f} {hit * 1e6:10.1f} {make_key * 1e6:10.1f}"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+# benchmarks/startup_schema_check.py
+"""
+Time the per-worker startup schema step against a database that is current.
+
+Compares what every worker used to do, Base.metadata.create_all (one
+catalog lookup per table plus index checks), with ensure_schema (one
+SELECT on schema_migrations):
+
+    PYTHONPATH=. python benchmarks/startup_schema_check.py --database-url postgresql://... --repeat 50
+
+Each round uses a fresh engine, as a newly started worker would.
+"""
+import argparse
+import statistics
+import time
+
+from sqlalchemy import event
+
+from app.core.config import settings
+from app.database import Base, get_engine
+from app.migrations.schema import ensure_schema, migrate
+
+
+def timed(database_url: str, step, repeat: int):
+    """Return (seconds per run, statements per run)."""
+    samples, statements = [], 0
+    for _ in range(repeat):
+        bind = get_engine(database_url)
+        executed = []
+        event.listen(bind, "before_cursor_execute", lambda *args: executed.append(args[2]))
+        start = time.perf_counter()
+        step(bind)
+        samples.append(time.perf_counter() - start)
+        statements = len(executed)
+        bind.dispose()
+    return samples, statements
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--database-url", default=settings.DATABASE_URL)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    bind = get_engine(args.database_url)
+    migrate(bind)
+    bind.dispose()
+
+    for name, step in (
+        ("create_all", lambda bind: Base.metadata.create_all(bind)),
+        ("ensure_schema", ensure_schema),
+    ):
+        samples, statements = timed(args.database_url, step, args.repeat)
+        print(
+            f"{name:14s} median {statistics.median(samples) * 1000:8.2f} ms  "
+            f"max {max(samples) * 1000:8.2f} ms  {statements:3d} statements  ({args.repeat} runs)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+# benchmarks/vectorize_threshold.py
+"""
+Find where reduce_inputs beats the scalar loops of Calculation.get_result.
+
+For each input length, times the scalar reduction (sum, math.prod or the
+left-to-right loop) against reduce_inputs, on a plain list and on a
+float64 buffer (what packed storage and binary uploads produce):
+
+    PYTHONPATH=. python benchmarks/vectorize_threshold.py
+
+reduce_inputs has to convert a list to float64 first, which costs more
+than the loop; on a buffer there is nothing to convert and the loop pays
+for boxing every element instead. CALC_VECTORIZE_THRESHOLD is the length
+from which the buffer column wins.
+"""
+import argparse
+import math
+import operator
+import random
+import statistics
+import time
+from functools import reduce
+
+from app.operations.vectorized import HAS_NUMPY, as_float64, reduce_inputs
+
+SCALAR = {
+    "addition": sum,
+    "multiplication": math.prod,
+    "division": lambda values: reduce(operator.truediv, values),
+}
+
+
+def per_call(func, rounds: int = 5) -> float:
+    """Median seconds per call, over enough calls to take about 20 ms per round."""
+    func()
+    calls, start = 0, time.perf_counter()
+    while time.perf_counter() - start < 0.02:
+        func()
+        calls += 1
+    samples = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for _ in range(calls):
+            func()
+        samples.append((time.perf_counter() - start) / calls)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--lengths", default="16,64,256,1024,4096,16384,100000")
+    args = parser.parse_args()
+    print(f"NumPy: {HAS_NUMPY}; microseconds per call")
+    print(f"{'type':15s} {'length':>7s} {'list loop':>10s} {'list vec':>10s} {'buf loop':>10s} {'buf vec':>10s}")
+    rng = random.Random(0)
+    for calc_type, scalar in SCALAR.items():
+        for length in map(int, args.lengths.split(",")):
+            values = [rng.uniform(0.99, 1.01) for _ in range(length)]
+            buffer = as_float64(values)
+            timings = [
+                per_call(lambda: scalar(values)),
+                per_call(lambda: reduce_inputs(calc_type, values)),
+                per_call(lambda: scalar(buffer)),
+                per_call(lambda: reduce_inputs(calc_type, buffer)),
+            ]
+            print(f"{calc_type:15s} {length:7d} " + " ".join(f"{t * 1e6:10.1f}" for t in timings))
+
+
+if __name__ == "__main__":
+    main()
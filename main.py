@@ -12,14 +12,15 @@ from app.models.user import User
 from app.schemas.calculation import CalculationBase, CalculationResponse, CalculationUpdate
 from app.schemas.token import TokenResponse
 from app.schemas.user import UserCreate, UserResponse, UserLogin
-from app.database import Base, get_db, engine
+from app.database import get_db, engine
+from app.migrations.schema import ensure_schema
 
-# Create tables on startup
+# Check (and if needed migrate) the schema on startup
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    print("Creating tables...")
-    Base.metadata.create_all(bind=engine)
-    print("Tables created successfully!")
+    print("Checking schema version...")
+    version = ensure_schema(engine)
+    print(f"Schema is at version {version}")
     yield
 
 app = FastAPI(
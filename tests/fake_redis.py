@@ -0,0 +1,101 @@
+# tests/fake_redis.py
+"""In-memory stand-in for the subset of redis.asyncio.Redis that app.auth.redis uses."""
+import asyncio
+import fnmatch
+
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+
+class FakePubSub:
+    def __init__(self, server):
+        self.server = server
+        self.queue = asyncio.Queue()
+
+    async def subscribe(self, channel):
+        if self.server.down:
+            raise RedisConnectionError("down")
+        self.server.subscribers.append(self)
+
+    async def get_message(self, ignore_subscribe_messages=False, timeout=0.0):
+        if self.server.down:
+            raise RedisConnectionError("down")
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout) if timeout else self.queue.get_nowait()
+        except (asyncio.TimeoutError, asyncio.QueueEmpty):
+            return None
+
+    async def aclose(self):
+        if self in self.server.subscribers:
+            self.server.subscribers.remove(self)
+
+
+class FakePipeline:
+    def __init__(self, server):
+        self.server = server
+        self.commands = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def setex(self, key, seconds, value):
+        self.commands.append(("setex", key, seconds, value))
+
+    def publish(self, channel, message):
+        self.commands.append(("publish", channel, message))
+
+    async def execute(self):
+        self.server._command("pipeline")
+        return [await getattr(self.server, name)(*args, _counted=False) for name, *args in self.commands]
+
+
+class FakeRedis:
+    """
+    Keys, pub/sub and pipelines; TTLs are ignored.
+
+    ``down`` breaks the pub/sub connection, ``failing`` every command;
+    ``commands`` records the round trips made.
+    """
+
+    def __init__(self):
+        self.data = {}
+        self.subscribers = []
+        self.down = False
+        self.failing = False
+        self.commands = []
+
+    def _command(self, name, counted=True):
+        if counted:
+            self.commands.append(name)
+            if self.failing:
+                raise RedisConnectionError("failing")
+
+    async def setex(self, key, seconds, value, _counted=True):
+        self._command("setex", _counted)
+        self.data[key] = value
+
+    async def get(self, key):
+        self._command("get")
+        return self.data.get(key)
+
+    async def mget(self, keys):
+        self._command("mget")
+        return [self.data.get(key) for key in keys]
+
+    async def scan_iter(self, match="*", count=None):
+        for key in list(self.data):
+            if fnmatch.fnmatch(key, match):
+                yield key
+
+    async def publish(self, channel, message, _counted=True):
+        self._command("publish", _counted)
+        for subscriber in self.subscribers:
+            subscriber.queue.put_nowait({"type": "message", "channel": channel, "data": message})
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+    def pubsub(self):
+        return FakePubSub(self)
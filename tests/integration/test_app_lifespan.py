@@ -0,0 +1,69 @@
+# ======================================================================================
+# tests/integration/test_app_lifespan.py
+# ======================================================================================
+# Purpose: Verify that the worker process pools start and stop with the application.
+# ======================================================================================
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app import main
+from app.auth.dependencies import get_current_active_user
+from app.auth.hashing import password_hasher
+from app.core.config import settings
+from app.main import app
+from app.operations import parallel
+
+
+@pytest.fixture
+def lifespan_client(test_user, monkeypatch):
+    """The app with its lifespan entered; no job recovery sweep."""
+    async def no_sweep():
+        pass
+
+    monkeypatch.setattr(main, "_maintain_calculation_jobs", no_sweep)
+    app.dependency_overrides[get_current_active_user] = lambda: test_user
+    try:
+        yield TestClient(app)
+    finally:
+        app.dependency_overrides.pop(get_current_active_user, None)
+
+
+def assert_stopped(processes):
+    for process in processes:
+        process.join(timeout=30)
+        assert process.exitcode is not None
+
+
+def test_calculation_pool_starts_and_stops_with_the_app(lifespan_client, monkeypatch):
+    monkeypatch.setattr(settings, "CALC_THREADPOOL_THRESHOLD", 1000)
+    monkeypatch.setattr(settings, "CALC_PARALLEL_THRESHOLD", 1000)
+    monkeypatch.setattr(settings, "CALC_PARALLEL_WORKERS", 2)
+    with lifespan_client as client:
+        response = client.post("/calculations", json={"type": "addition", "inputs": [1.5] * 2000})
+        assert response.status_code == 201
+        assert response.json()["result"] == 3000
+        pool = parallel._pool
+        assert pool._mp_context.get_start_method() == "forkserver"
+        processes = list(pool._processes.values())
+        assert processes
+
+    assert parallel._pool is None
+    assert_stopped(processes)
+
+
+def test_hashing_pool_starts_and_stops_with_the_app(lifespan_client, fake_user_data, monkeypatch):
+    monkeypatch.setattr(password_hasher, "workers", 1)
+    password = "Lifespan-Passw0rd!"
+    with lifespan_client as client:
+        response = client.post(
+            "/auth/register", json={**fake_user_data, "password": password, "confirm_password": password}
+        )
+        assert response.status_code == 201
+        pool = password_hasher._pool
+        assert pool._mp_context.get_start_method() == "forkserver"
+        processes = list(pool._processes.values())
+        assert processes
+
+    assert password_hasher._pool is None
+    assert_stopped(processes)
@@ -0,0 +1,84 @@
+# ======================================================================================
+# tests/integration/test_async_api.py
+# ======================================================================================
+# Purpose: Exercise the async auth and calculation handlers against the test database.
+# ======================================================================================
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.auth.dependencies import get_current_active_user
+from app.core.config import settings
+from app.database import get_async_db, get_async_engine, get_async_sessionmaker
+from app.routers.async_api import router
+
+
+@pytest.fixture
+def async_client(test_user):
+    """A client for an app serving only the async router, authenticated as test_user."""
+    engine = get_async_engine(settings.DATABASE_URL)
+    sessions = get_async_sessionmaker(engine)
+
+    async def get_test_db():
+        async with sessions() as db:
+            yield db
+
+    app = FastAPI()
+    app.include_router(router)
+    app.dependency_overrides[get_async_db] = get_test_db
+    app.dependency_overrides[get_current_active_user] = lambda: test_user
+    with TestClient(app) as client:
+        yield client
+        # Connections belong to the client's event loop; close them there.
+        client.portal.call(engine.dispose)
+
+
+def test_calculation_crud(async_client):
+    """Create, read, update, list and delete behave like the sync handlers."""
+    created = async_client.post("/calculations", json={"type": "addition", "inputs": [1, 2]})
+    assert created.status_code == 201
+    calc_id = created.json()["id"]
+    assert created.json()["result"] == 3
+
+    dependent = async_client.post(
+        "/calculations",
+        json={"type": "multiplication", "inputs": [0, 10], "input_refs": {"0": calc_id}},
+    )
+    assert dependent.json()["result"] == 30
+
+    updated = async_client.put(f"/calculations/{calc_id}", json={"inputs": [5, 5]})
+    assert updated.json()["result"] == 10
+    assert async_client.get(f"/calculations/{dependent.json()['id']}").json()["result"] == 100
+
+    assert len(async_client.get("/calculations").json()) == 2
+    assert async_client.get("/calculations/stats").json()["count"] == 2
+
+    assert async_client.delete(f"/calculations/{calc_id}").status_code == 204
+    assert async_client.get(f"/calculations/{calc_id}").status_code == 404
+
+
+def test_calculation_errors(async_client):
+    """Validation and lookup errors use the same status codes and messages."""
+    assert async_client.post("/calculations", json={"type": "division", "inputs": [1, 0]}).status_code == 422
+    missing = async_client.post(
+        "/calculations",
+        json={"type": "division", "inputs": [1, 0], "input_refs": {"1": "00000000-0000-0000-0000-000000000000"}},
+    )
+    assert missing.status_code == 400
+    assert async_client.get("/calculations/not-a-uuid").json()["detail"] == "Invalid calculation id format."
+
+
+def test_register_and_login(async_client, fake_user_data):
+    """Registration rejects duplicates and login returns tokens."""
+    fake_user_data["password"] = "Async-Passw0rd!"
+    payload = {**fake_user_data, "confirm_password": fake_user_data["password"]}
+    assert async_client.post("/auth/register", json=payload).status_code == 201
+    assert async_client.post("/auth/register", json=payload).json()["detail"] == "Username or email already exists"
+
+    login = async_client.post(
+        "/auth/login",
+        json={"username": fake_user_data["username"], "password": fake_user_data["password"]},
+    )
+    assert login.status_code == 200
+    assert login.json()["username"] == fake_user_data["username"]
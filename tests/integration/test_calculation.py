@@ -150,3 +150,36 @@ def test_invalid_inputs_for_division():
     division = Division(user_id=dummy_user_id(), inputs=[10])
     with pytest.raises(ValueError, match="Inputs must be a list with at least two numbers."):
         division.get_result()
+
+def test_division_by_zero_long_inputs():
+    """
+    Test that the vectorized path for long inputs keeps the model's error message.
+    """
+    inputs = [1.0] * 5000 + [0]
+    division = Division(user_id=dummy_user_id(), inputs=inputs)
+    with pytest.raises(ValueError, match="Cannot divide by zero."):
+        division.get_result()
+
+def test_multiplication_long_inputs():
+    """
+    Test that Multiplication.get_result on long inputs matches the scalar loop.
+    """
+    inputs = [1.0001] * 5000
+    multiplication = Multiplication(user_id=dummy_user_id(), inputs=inputs)
+    expected = 1
+    for value in inputs:
+        expected *= value
+    assert multiplication.get_result() == expected
+
+def test_get_owned_checks_the_owner(db_session, test_user):
+    """
+    Test that Calculation.get_owned only finds the owner's calculation.
+    """
+    calc = Calculation.create("multiplication", test_user.id, [2, 3])
+    calc.result = calc.get_result()
+    db_session.add(calc)
+    db_session.commit()
+    found = Calculation.get_owned(db_session, calc.id, test_user.id)
+    assert isinstance(found, Multiplication) and found.id == calc.id
+    assert Calculation.get_owned(db_session, calc.id, dummy_user_id()) is None
+    assert Calculation.get_owned(db_session, uuid.uuid4(), test_user.id) is None
@@ -0,0 +1,81 @@
+# ======================================================================================
+# tests/integration/test_calculation_batch.py
+# ======================================================================================
+# Purpose: Verify POST /calculations/batch over HTTP.
+# ======================================================================================
+
+import uuid
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.auth.dependencies import get_current_active_user
+from app.core.config import settings
+from app.main import app
+
+
+@pytest.fixture
+def client(test_user):
+    app.dependency_overrides[get_current_active_user] = lambda: test_user
+    try:
+        yield TestClient(app)
+    finally:
+        app.dependency_overrides.pop(get_current_active_user, None)
+
+
+def test_created_rows_follow_request_order(client):
+    items = [
+        {"type": "division", "inputs": [100, 2, 5]},
+        {"type": "addition", "inputs": [1, 2, 3]},
+        {"type": "multiplication", "inputs": [2, 3, 4]},
+        {"type": "subtraction", "inputs": [10, 4]},
+    ]
+    response = client.post("/calculations/batch", json={"items": items})
+    assert response.status_code == 201
+    body = response.json()
+    assert body["errors"] == []
+    assert [(row["type"], row["result"]) for row in body["created"]] == [
+        ("division", 10), ("addition", 6), ("multiplication", 24), ("subtraction", 6),
+    ]
+
+
+def test_each_failing_item_reports_its_own_error(client):
+    items = [
+        {"type": "addition", "inputs": [1, 1]},
+        {"type": "modulo", "inputs": [1, 2]},
+        {"type": "addition", "inputs": [1]},
+        {"type": "division", "inputs": [1, 0]},
+        {"type": "addition", "inputs": [1, "x"]},
+        {"type": "addition", "inputs": [0, 1], "input_refs": {"0": str(uuid.uuid4())}},
+        {"type": "multiplication", "inputs": [3, 3]},
+    ]
+    response = client.post("/calculations/batch", json={"items": items})
+    assert response.status_code == 201
+    body = response.json()
+    assert [row["result"] for row in body["created"]] == [2, 9]
+    assert body["errors"] == [
+        {"index": 1, "detail": "Type must be one of: addition, division, multiplication, subtraction"},
+        {"index": 2, "detail": "List should have at least 2 items after validation, not 1"},
+        {"index": 3, "detail": "Cannot divide by zero"},
+        {"index": 4, "detail": "Input should be a valid number, unable to parse string as a number"},
+        {"index": 5, "detail": "input_refs are not supported in batch requests."},
+    ]
+
+
+def test_batch_size_is_capped(client, monkeypatch):
+    monkeypatch.setattr(settings, "CALC_BATCH_MAX_ITEMS", 2)
+    items = [{"type": "addition", "inputs": [1, 2]}] * 3
+    response = client.post("/calculations/batch", json={"items": items})
+    assert response.status_code == 413
+    assert client.post("/calculations/batch", json={"items": items[:2]}).status_code == 201
+
+
+@pytest.mark.parametrize("seed_users", [1], indirect=True)
+def test_rows_belong_to_the_caller(client, test_user, seed_users):
+    response = client.post("/calculations/batch", json={"items": [{"type": "addition", "inputs": [1, 2]}]})
+    created = response.json()["created"][0]
+    assert created["user_id"] == str(test_user.id)
+    assert client.get(f"/calculations/{created['id']}").status_code == 200
+
+    app.dependency_overrides[get_current_active_user] = lambda: seed_users[0]
+    assert client.get(f"/calculations/{created['id']}").status_code == 404
@@ -0,0 +1,69 @@
+# ======================================================================================
+# tests/integration/test_calculation_bulk.py
+# ======================================================================================
+# Purpose: Exercise Calculation.bulk_create against the database.
+# ======================================================================================
+
+from app.models.calculation import Calculation
+
+
+def test_bulk_create_returns_rows_in_order(db_session, test_user):
+    """All valid items are inserted and returned in request order."""
+    items = [
+        ("addition", [1, 2, 3]),
+        ("division", [100, 2, 5]),
+        ("multiplication", [2, 3, 4]),
+    ]
+    rows, errors = Calculation.bulk_create(db_session, test_user.id, items)
+    db_session.commit()
+
+    assert errors == {}
+    assert [row.type for row in rows] == ["addition", "division", "multiplication"]
+    assert [row.result for row in rows] == [6, 10, 24]
+    stored = db_session.query(Calculation).filter(Calculation.user_id == test_user.id).count()
+    assert stored == 3
+
+
+def test_bulk_create_reports_bad_items(db_session, test_user):
+    """A zero divisor is reported by index and does not abort the batch."""
+    items = [
+        ("addition", [1, 1]),
+        ("division", [10, 0]),
+        ("subtraction", [10, 4]),
+    ]
+    rows, errors = Calculation.bulk_create(db_session, test_user.id, items)
+    db_session.commit()
+
+    assert errors == {1: "Cannot divide by zero."}
+    assert rows[1] is None
+    assert rows[0].result == 2
+    assert rows[2].result == 6
+
+
+def test_bulk_create_reports_each_items_own_error(db_session, test_user):
+    """Items that skipped schema validation (e.g. from ingest) keep their specific message."""
+    items = [
+        ("modulo", [1, 2]),
+        ("addition", [1]),
+        ("addition", [1, "x"]),
+        ("addition", [2, 2]),
+    ]
+    rows, errors = Calculation.bulk_create(db_session, test_user.id, items)
+    db_session.commit()
+
+    assert errors == {
+        0: "Unsupported calculation type: modulo",
+        1: "Inputs must be a list with at least two numbers.",
+        2: "Inputs must be a list of numbers.",
+    }
+    assert rows[3].result == 4
+
+
+def test_bulk_create_loads_polymorphic_rows(db_session, test_user):
+    """Inserted rows load back as the matching Calculation subclass."""
+    rows, _ = Calculation.bulk_create(db_session, test_user.id, [("subtraction", [5, 3])])
+    db_session.commit()
+
+    calc = db_session.get(Calculation, rows[0].id)
+    assert calc.__class__.__name__ == "Subtraction"
+    assert calc.get_result() == 2
@@ -0,0 +1,162 @@
+# ======================================================================================
+# tests/integration/test_calculation_bulk_ops.py
+# ======================================================================================
+# Purpose: Verify DELETE /calculations and POST /calculations/recompute.
+# ======================================================================================
+
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import func, select, update
+
+from app.auth.dependencies import get_current_active_user
+from app.core.config import settings
+from app.main import app
+from app.models.calculation import Calculation, CalculationDependency, CalculationStats
+
+START = datetime(2025, 1, 1)
+
+
+@pytest.fixture
+def client(test_user):
+    app.dependency_overrides[get_current_active_user] = lambda: test_user
+    try:
+        yield TestClient(app)
+    finally:
+        app.dependency_overrides.pop(get_current_active_user, None)
+
+
+@pytest.fixture
+def calculations(db_session, test_user, monkeypatch):
+    """Five additions and five multiplications a day apart; batches of two rows."""
+    monkeypatch.setattr(settings, "CALC_BULK_BATCH_SIZE", 2)
+    calcs = []
+    for i in range(10):
+        calc = Calculation.create("addition" if i % 2 == 0 else "multiplication", test_user.id, [i, 2])
+        calc.result = calc.get_result()
+        calc.created_at = START + timedelta(days=i)
+        calcs.append(calc)
+    db_session.add_all(calcs)
+    db_session.commit()
+    return calcs
+
+
+def remaining(db_session, test_user):
+    db_session.expire_all()
+    return set(db_session.execute(
+        select(Calculation.id).where(Calculation.user_id == test_user.id)
+    ).scalars())
+
+
+def test_bulk_delete_by_type_and_date(client, db_session, test_user, calculations):
+    kept = {
+        c.id for c in calculations if c.type == "multiplication" or c.created_at >= START + timedelta(days=8)
+    }
+    response = client.request(
+        "DELETE", "/calculations", json={"type": "addition", "created_before": "2025-01-08T00:00:00"}
+    )
+    assert response.status_code == 200
+    assert response.json() == {"deleted": 4, "batches": 2}
+    assert remaining(db_session, test_user) == kept
+    stats = db_session.get(CalculationStats, (test_user.id, "addition"))
+    assert (stats.count, stats.result_sum) == (1, 10)
+
+
+def test_bulk_delete_by_ids_removes_edges(client, db_session, test_user, calculations):
+    first, second = calculations[:2]
+    first_id = first.id
+    db_session.add(CalculationDependency(calculation_id=second.id, depends_on_id=first.id, position=0))
+    db_session.commit()
+
+    response = client.request("DELETE", "/calculations", json={"ids": [str(first.id), str(second.id)]})
+    assert response.json()["deleted"] == 2
+    assert first_id not in remaining(db_session, test_user)
+    assert db_session.scalar(select(func.count()).select_from(CalculationDependency)) == 0
+
+
+def test_bulk_delete_requires_a_filter(client, calculations, monkeypatch):
+    assert client.request("DELETE", "/calculations", json={}).status_code == 422
+    monkeypatch.setattr(settings, "CALC_BULK_MAX_IDS", 1)
+    ids = [str(c.id) for c in calculations[:2]]
+    assert client.request("DELETE", "/calculations", json={"ids": ids}).status_code == 413
+
+
+@pytest.mark.parametrize("parallel", [False, True])
+def test_recompute_fixes_stale_results(client, db_session, test_user, calculations, monkeypatch, parallel):
+    monkeypatch.setattr(settings, "CALC_PARALLEL_WORKERS", 2)
+    additions = [c.id for c in calculations if c.type == "addition"]
+    db_session.execute(update(Calculation).where(Calculation.id.in_(additions[:3])).values(result=-1))
+    db_session.commit()
+    CalculationStats.rebuild(db_session.connection())
+    db_session.commit()
+
+    response = client.post("/calculations/recompute", params={"parallel": parallel}, json={"type": "addition"})
+    assert response.status_code == 200
+    body = response.json()
+    # Ids are random, so the three stale rows fall into two or three batches.
+    assert (body["matched"], body["updated"], body["failed"]) == (5, 3, 0)
+    assert body["batches"] in (2, 3)
+    db_session.expire_all()
+    assert all(c.result == c.inputs[0] + c.inputs[1] for c in calculations if c.type == "addition")
+    stats = db_session.get(CalculationStats, (test_user.id, "addition"))
+    assert (stats.count, stats.result_sum, stats.result_min) == (5, 30, 2)
+
+
+def test_recompute_reports_failures(client, db_session, test_user, calculations):
+    bad = Calculation.create("division", test_user.id, [1, 2])
+    bad.result = 0.5
+    db_session.add(bad)
+    db_session.commit()
+    db_session.execute(update(Calculation).where(Calculation.id == bad.id).values(inputs=[1, 0]))
+    db_session.commit()
+
+    response = client.post("/calculations/recompute", json={"ids": [str(bad.id), str(calculations[0].id)]})
+    body = response.json()
+    assert (body["matched"], body["updated"], body["failed"]) == (2, 0, 1)
+    assert body["errors"] == [{"id": str(bad.id), "detail": "Cannot divide by zero."}]
+
+
+def add_dependent(db_session, test_user, calc_type, inputs, depends_on, position=0):
+    calc = Calculation.create(calc_type, test_user.id, inputs)
+    calc.result = calc.get_result()
+    calc.dependencies = [CalculationDependency(position=position, depends_on_id=depends_on.id)]
+    db_session.add(calc)
+    db_session.commit()
+    return calc
+
+
+def test_recompute_refreshes_dependents(client, db_session, test_user, calculations):
+    """Dependents of a recomputed row follow its new result, even outside the filter."""
+    source = calculations[0]  # 0 + 2
+    db_session.execute(update(Calculation).where(Calculation.id == source.id).values(result=-1))
+    db_session.commit()
+    child = add_dependent(db_session, test_user, "multiplication", [-1, 3], source)
+    grandchild = add_dependent(db_session, test_user, "addition", [-3, 1], child)
+    CalculationStats.rebuild(db_session.connection())
+    db_session.commit()
+
+    response = client.post("/calculations/recompute", json={"ids": [str(source.id)]})
+    body = response.json()
+    assert (body["matched"], body["updated"], body["failed"]) == (1, 3, 0)
+    db_session.expire_all()
+    assert (source.result, child.inputs, child.result, grandchild.result) == (2, [2, 3], 6, 7)
+    stats = db_session.get(CalculationStats, (test_user.id, "multiplication"))
+    assert stats.result_sum == sum(c.result for c in calculations if c.type == "multiplication") + 6
+
+
+def test_recompute_keeps_rows_whose_dependents_would_fail(client, db_session, test_user, calculations):
+    """A new result that a dependent cannot use is reported and not written."""
+    source = calculations[0]
+    db_session.execute(
+        update(Calculation).where(Calculation.id == source.id).values(inputs=[0, 0], result=5)
+    )
+    db_session.commit()
+    quotient = add_dependent(db_session, test_user, "division", [10, 5], source, position=1)
+
+    response = client.post("/calculations/recompute", json={"ids": [str(source.id)]})
+    body = response.json()
+    assert (body["matched"], body["updated"], body["failed"]) == (1, 0, 1)
+    assert body["errors"][0]["id"] == str(source.id)
+    db_session.expire_all()
+    assert (source.result, quotient.result) == (5, 2)
@@ -0,0 +1,116 @@
+# ======================================================================================
+# tests/integration/test_calculation_dag.py
+# ======================================================================================
+# Purpose: Exercise dependent calculations and incremental recomputation.
+# ======================================================================================
+
+import pytest
+from sqlalchemy import event
+
+from app.models.calculation import Calculation
+
+
+def make_calc(db_session, user, calc_type, inputs, input_refs=None):
+    calc = Calculation.create(calculation_type=calc_type, user_id=user.id, inputs=inputs)
+    if input_refs:
+        calc.resolve_inputs(db_session, input_refs)
+    calc.result = calc.get_result()
+    db_session.add(calc)
+    db_session.flush()
+    return calc
+
+
+@pytest.fixture
+def chain(db_session, test_user):
+    """a = 2 + 3; b = a * 10; c = b - 1; d = 100 / a (a feeds both b and d)."""
+    a = make_calc(db_session, test_user, "addition", [2, 3])
+    b = make_calc(db_session, test_user, "multiplication", [0, 10], {0: a.id})
+    c = make_calc(db_session, test_user, "subtraction", [0, 1], {0: b.id})
+    d = make_calc(db_session, test_user, "division", [100, 1], {1: a.id})
+    db_session.commit()
+    return a, b, c, d
+
+
+def test_refs_are_resolved_on_create(chain):
+    """Referenced results are copied into the dependent inputs."""
+    a, b, c, d = chain
+    assert b.inputs == [5, 10] and b.result == 50
+    assert c.result == 49
+    assert d.result == 20
+    assert b.input_refs == {0: a.id}
+
+
+def count_selects(db_session, func):
+    statements = []
+    listener = lambda *args: statements.append(args[2])
+    bind = db_session.get_bind()
+    event.listen(bind, "before_cursor_execute", listener)
+    try:
+        func()
+    finally:
+        event.remove(bind, "before_cursor_execute", listener)
+    return [statement for statement in statements if statement.lstrip().upper().startswith(("SELECT", "WITH"))]
+
+
+def test_references_load_only_where_they_are_read(db_session, chain):
+    """Loading a calculation is one SELECT; recomputing dependents loads every reference in one more."""
+    a_id, b_id = chain[0].id, chain[1].id
+    db_session.expunge_all()
+    assert len(count_selects(db_session, lambda: db_session.get(Calculation, b_id))) == 1
+
+    db_session.expunge_all()
+    source = db_session.get(Calculation, a_id)
+    source.inputs = [1, 1]
+    source.result = source.get_result()
+    # Dependents, their rows, their references
+    assert len(count_selects(db_session, lambda: source.recompute_dependents(db_session))) == 3
+    db_session.rollback()
+
+
+def test_downstream_ids(db_session, chain):
+    """The recursive query finds direct and transitive dependents only."""
+    a, b, c, d = chain
+    assert set(a.downstream_ids(db_session)) == {b.id, c.id, d.id}
+    assert set(b.downstream_ids(db_session)) == {c.id}
+    assert c.downstream_ids(db_session) == []
+
+
+def test_recompute_in_topological_order(db_session, chain):
+    """Changing a node recomputes its dependents, parents before children."""
+    a, b, c, d = chain
+    a.inputs = [1, 1]
+    a.result = a.get_result()
+    recomputed = a.recompute_dependents(db_session)
+    db_session.commit()
+
+    order = [calc.id for calc in recomputed]
+    assert order.index(b.id) < order.index(c.id)
+    assert (b.result, c.result, d.result) == (20, 19, 50)
+
+
+def test_recompute_rejects_zero_divisor(db_session, chain):
+    """A dependent that would divide by zero aborts the recompute."""
+    a, _, _, _ = chain
+    a.inputs = [0, 0]
+    a.result = a.get_result()
+    with pytest.raises(ValueError, match="Cannot divide by zero."):
+        a.recompute_dependents(db_session)
+    db_session.rollback()
+
+
+def test_cycle_is_rejected(db_session, chain):
+    """A node cannot reference one of its own dependents."""
+    a, _, c, _ = chain
+    with pytest.raises(ValueError, match="cycle"):
+        a.resolve_inputs(db_session, {0: c.id})
+    db_session.rollback()
+
+
+def test_reference_without_result_is_rejected(db_session, test_user):
+    """A referenced calculation with no stored result cannot feed another one."""
+    pending = Calculation.create(calculation_type="addition", user_id=test_user.id, inputs=[1, 2])
+    db_session.add(pending)
+    db_session.flush()
+    with pytest.raises(ValueError, match="has no result"):
+        make_calc(db_session, test_user, "multiplication", [0, 2], {0: pending.id})
+    db_session.rollback()
@@ -0,0 +1,78 @@
+# ======================================================================================
+# tests/integration/test_calculation_export.py
+# ======================================================================================
+# Purpose: Verify the streamed NDJSON/CSV export of GET /calculations/export.
+# ======================================================================================
+
+import csv
+import gzip
+import io
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.auth.dependencies import get_current_active_user
+from app.main import app
+from app.models.calculation import Calculation
+
+
+@pytest.fixture
+def client(test_user):
+    app.dependency_overrides[get_current_active_user] = lambda: test_user
+    try:
+        yield TestClient(app)
+    finally:
+        app.dependency_overrides.pop(get_current_active_user, None)
+
+
+@pytest.fixture
+def calculations(db_session, test_user, monkeypatch):
+    # Small batches so the export spans several server-side cursor fetches.
+    monkeypatch.setattr("app.main.settings.CALC_EXPORT_BATCH_SIZE", 2)
+    rows, errors = Calculation.bulk_create(
+        db_session, test_user.id,
+        [("addition", [i, 1]) for i in range(5)] + [("division", [9, 3])],
+    )
+    db_session.commit()
+    assert not errors
+    return rows
+
+
+def test_ndjson_export(client, calculations):
+    response = client.get("/calculations/export", headers={"Accept-Encoding": "identity"})
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    assert "content-encoding" not in response.headers
+    records = [json.loads(line) for line in response.text.splitlines()]
+    assert {r["id"] for r in records} == {str(c.id) for c in calculations}
+    assert [r["created_at"] for r in records] == sorted(r["created_at"] for r in records)
+
+
+def test_csv_export_with_filter(client, calculations):
+    response = client.get(
+        "/calculations/export",
+        params={"format": "csv", "type": "division"},
+        headers={"Accept-Encoding": "identity"},
+    )
+    assert response.headers["content-type"].startswith("text/csv")
+    assert 'filename="calculations.csv"' in response.headers["content-disposition"]
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert [(r["type"], json.loads(r["inputs"]), float(r["result"])) for r in rows] == [
+        ("division", [9, 3], 3.0)
+    ]
+
+
+def test_gzip_export(client, calculations):
+    """With Accept-Encoding: gzip the body is a gzip stream of the same NDJSON."""
+    with client.stream("GET", "/calculations/export", headers={"Accept-Encoding": "gzip"}) as response:
+        assert response.headers["content-encoding"] == "gzip"
+        raw = b"".join(response.iter_raw())
+    assert len(gzip.decompress(raw).splitlines()) == len(calculations)
+
+
+def test_export_round_trips_through_ingest(client, calculations):
+    """Exported NDJSON lines are valid ingest lines."""
+    exported = client.get("/calculations/export").content
+    response = client.post("/calculations/ingest", content=exported)
+    assert response.json()["created"] == len(calculations)
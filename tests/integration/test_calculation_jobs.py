@@ -0,0 +1,157 @@
+# ======================================================================================
+# tests/integration/test_calculation_jobs.py
+# ======================================================================================
+# Purpose: Verify that asynchronous calculation jobs are stored and visible to
+# every worker, and that jobs a worker did not finish are run again.
+# ======================================================================================
+
+import asyncio
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app import database, main
+from app.auth.dependencies import get_current_active_user
+from app.main import app
+from app.models.calculation import Calculation
+from app.models.job import CalculationJob
+from app.schemas.calculation import CalculationBase, CalculationJobStatus
+
+
+@pytest.fixture
+def client(test_user, monkeypatch):
+    """
+    Entered, so the job workers live on one event loop across requests.
+    Without the recovery sweep: jobs added by the tests stand for jobs of
+    other workers.
+    """
+    async def no_sweep():
+        pass
+
+    monkeypatch.setattr(main, "_maintain_calculation_jobs", no_sweep)
+    app.dependency_overrides[get_current_active_user] = lambda: test_user
+    try:
+        with TestClient(app) as client:
+            yield client
+    finally:
+        app.dependency_overrides.pop(get_current_active_user, None)
+
+
+def add_job(db_session, test_user, payload=None, status=None, age=0):
+    """A job stored by "another worker": not in this process' queue."""
+    job_id = uuid.uuid4()
+    CalculationJob.add(db_session, job_id, test_user.id, payload or {"type": "addition", "inputs": [1, 2]})
+    if status is not None:
+        db_session.query(CalculationJob).filter_by(id=job_id).update({
+            "status": status.value, "updated_at": datetime.utcnow() - timedelta(seconds=age),
+        })
+    db_session.commit()
+    return job_id
+
+
+def test_async_create_stores_the_job(client, db_session):
+    response = client.post("/calculations?mode=async", json={"type": "multiplication", "inputs": [6, 7]})
+    assert response.status_code == 202
+    job_id = uuid.UUID(response.json()["id"])
+    assert db_session.get(CalculationJob, job_id) is not None
+
+    body = client.get(f"/jobs/{job_id}?wait=5").json()
+    assert body["status"] == "succeeded"
+    assert body["calculation"]["result"] == 42
+    db_session.expire_all()
+    assert db_session.get(CalculationJob, job_id).status == "succeeded"
+
+
+def test_any_worker_answers_pending_and_failed_jobs(client, db_session, test_user):
+    pending = add_job(db_session, test_user)
+    assert client.get(f"/jobs/{pending}").json() == {
+        "id": str(pending), "status": "pending", "calculation": None, "error": None,
+    }
+
+    CalculationJob.finish(db_session, pending, CalculationJobStatus.FAILED, "Cannot divide by zero.")
+    db_session.commit()
+    body = client.get(f"/jobs/{pending}?wait=1").json()
+    assert (body["status"], body["error"]) == ("failed", "Cannot divide by zero.")
+    assert client.get(f"/jobs/{uuid.uuid4()}").status_code == 404
+
+
+def test_long_poll_sees_a_job_finished_by_another_worker(client, db_session, test_user, monkeypatch):
+    monkeypatch.setattr(main.settings, "CALC_JOB_POLL_SECONDS", 0.01)
+    job_id = add_job(db_session, test_user)
+    asyncio.run(main._run_calculation_job(job_id, test_user.id, CalculationBase(type="addition", inputs=[1, 2])))
+
+    body = client.get(f"/jobs/{job_id}?wait=1").json()
+    assert body["status"] == "succeeded" and body["calculation"]["result"] == 3
+
+
+def test_long_poll_does_not_hold_a_connection(client, db_session, test_user, monkeypatch):
+    """Between reads the request's connection is back in the pool."""
+    monkeypatch.setattr(main.settings, "CALC_JOB_POLL_SECONDS", 0.02)
+    job_id = add_job(db_session, test_user)
+    idle = database.pool_status()["checked_out"]
+    checked_out = []
+    load_job = main._load_job
+
+    def recording(db, job_uuid, user_id):
+        checked_out.append(database.pool_status()["checked_out"])
+        return load_job(db, job_uuid, user_id)
+
+    monkeypatch.setattr(main, "_load_job", recording)
+    assert client.get(f"/jobs/{job_id}?wait=0.2").json()["status"] == "pending"
+    assert len(checked_out) > 2
+    assert set(checked_out) == {idle}
+
+
+def test_a_job_is_claimed_once(db_session, test_user):
+    job_id = add_job(db_session, test_user)
+    cutoff = datetime.utcnow() - timedelta(minutes=5)
+    assert CalculationJob.claim(db_session, job_id, cutoff) is True
+    assert CalculationJob.claim(db_session, job_id, cutoff) is False
+    # Its worker is presumed dead once it has run past the cutoff.
+    assert CalculationJob.claim(db_session, job_id, datetime.utcnow() + timedelta(seconds=1)) is True
+    db_session.commit()
+
+
+def test_pending_and_lost_jobs_are_recovered(db_session, test_user):
+    pending = add_job(db_session, test_user)
+    lost = add_job(db_session, test_user, status=CalculationJobStatus.RUNNING, age=3600)
+    running = add_job(db_session, test_user, status=CalculationJobStatus.RUNNING)
+    done = add_job(db_session, test_user)
+    CalculationJob.finish(db_session, done, CalculationJobStatus.SUCCEEDED)
+    db_session.commit()
+
+    recovered = {row.id for row in main._recoverable_jobs()}
+    assert {pending, lost} <= recovered
+    assert not {running, done} & recovered
+
+
+def test_job_interrupted_by_shutdown_goes_back_to_pending(db_session, test_user, monkeypatch):
+    async def hang(self):
+        await asyncio.sleep(10)
+
+    monkeypatch.setattr(Calculation, "aget_result", hang)
+    job_id = add_job(db_session, test_user)
+
+    async def scenario():
+        task = asyncio.create_task(
+            main._run_calculation_job(job_id, test_user.id, CalculationBase(type="addition", inputs=[1, 2]))
+        )
+        await asyncio.sleep(0.2)
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+    asyncio.run(scenario())
+    db_session.expire_all()
+    assert db_session.get(CalculationJob, job_id).status == "pending"
+
+
+def test_finished_jobs_are_pruned_after_retention(db_session, test_user, monkeypatch):
+    monkeypatch.setattr(main.settings, "CALC_JOB_RETENTION_SECONDS", 0)
+    job_id = add_job(db_session, test_user)
+    CalculationJob.finish(db_session, job_id, CalculationJobStatus.FAILED, "x")
+    db_session.commit()
+    main._recoverable_jobs()
+    db_session.expire_all()
+    assert db_session.get(CalculationJob, job_id) is None
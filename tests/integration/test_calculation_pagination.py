@@ -0,0 +1,118 @@
+# ======================================================================================
+# tests/integration/test_calculation_pagination.py
+# ======================================================================================
+# Purpose: Verify keyset pagination, filtering and sorting of GET /calculations.
+# ======================================================================================
+
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.auth.dependencies import get_current_active_user
+from app.main import app
+from app.models.calculation import Calculation
+from app.schemas.calculation import CalculationListQuery
+
+START = datetime(2025, 1, 1)
+
+
+@pytest.fixture
+def client(test_user):
+    app.dependency_overrides[get_current_active_user] = lambda: test_user
+    try:
+        yield TestClient(app)
+    finally:
+        app.dependency_overrides.pop(get_current_active_user, None)
+
+
+@pytest.fixture
+def calculations(db_session, test_user):
+    """Seven calculations a minute apart; the last two share a timestamp."""
+    calcs = []
+    for i in range(7):
+        calc_type = "addition" if i % 2 == 0 else "multiplication"
+        calc = Calculation.create(calculation_type=calc_type, user_id=test_user.id, inputs=[i, 2])
+        calc.result = calc.get_result()
+        calc.created_at = START + timedelta(minutes=min(i, 5))
+        calcs.append(calc)
+    db_session.add_all(calcs)
+    db_session.commit()
+    return calcs
+
+
+def ordered(calcs, descending=True):
+    key = sorted(calcs, key=lambda c: (c.created_at, c.id), reverse=descending)
+    return [str(c.id) for c in key]
+
+
+def walk(client, **params):
+    """Follow X-Next-Cursor until the last page; return ids and page sizes."""
+    ids, sizes, cursor = [], [], None
+    while True:
+        query = dict(params, **({"cursor": cursor} if cursor else {}))
+        response = client.get("/calculations", params=query)
+        assert response.status_code == 200
+        page = response.json()
+        ids += [item["id"] for item in page]
+        sizes.append(len(page))
+        cursor = response.headers.get("X-Next-Cursor")
+        if cursor is None:
+            assert "Link" not in response.headers
+            return ids, sizes
+        assert 'rel="next"' in response.headers["Link"]
+
+
+@pytest.mark.parametrize("order", ["desc", "asc"])
+def test_pages_cover_everything_once(client, calculations, order):
+    """Pages are disjoint, in (created_at, id) order, and ties do not split or repeat."""
+    ids, sizes = walk(client, limit=3, order=order)
+    assert ids == ordered(calculations, descending=order == "desc")
+    assert sizes == [3, 3, 1]
+
+
+def test_default_is_newest_first(client, calculations):
+    response = client.get("/calculations")
+    assert [item["id"] for item in response.json()] == ordered(calculations)
+    assert "X-Next-Cursor" not in response.headers
+
+
+def test_filters(client, calculations):
+    """Type, result and created_at filters combine with pagination."""
+    ids, _ = walk(client, limit=1, type="addition", result_min=3, created_before="2025-01-01T00:06:00")
+    expected = [
+        c for c in calculations
+        if c.type == "addition" and c.result >= 3 and c.created_at < START + timedelta(minutes=6)
+    ]
+    assert ids == ordered(expected)
+
+    response = client.get("/calculations", params={"created_after": "2025-01-01T00:05:00Z"})
+    assert len(response.json()) == 2
+
+
+def test_invalid_cursor(client, calculations):
+    assert client.get("/calculations", params={"cursor": "not-a-cursor"}).status_code == 400
+    cursor = client.get("/calculations", params={"limit": 1}).headers["X-Next-Cursor"]
+    # A cursor is bound to the order it was issued for.
+    assert client.get("/calculations", params={"cursor": cursor, "order": "asc"}).status_code == 400
+
+
+def test_invalid_parameters(client):
+    assert client.get("/calculations", params={"limit": 0}).status_code == 422
+    assert client.get("/calculations", params={"limit": 1001}).status_code == 422
+    assert client.get("/calculations", params={"result_min": 2, "result_max": 1}).status_code == 422
+
+
+def test_cursor_round_trip():
+    created_at, calc_id = Calculation.decode_cursor(Calculation.encode_cursor(START, "0" * 32, "asc"), "asc")
+    assert (created_at, calc_id.int) == (START, 0)
+    with pytest.raises(ValueError):
+        Calculation.decode_cursor(Calculation.encode_cursor(START, "0" * 32, "asc"), "desc")
+
+
+def test_page_statement_uses_keyset(calculations):
+    """Deeper pages add a row-value comparison, never an OFFSET."""
+    cursor = Calculation.encode_cursor(START, calculations[0].id, "desc")
+    sql = str(Calculation.page_statement(calculations[0].user_id, CalculationListQuery(cursor=cursor)))
+    assert "OFFSET" not in sql.upper()
+    assert "(calculations.created_at, calculations.id) <" in sql
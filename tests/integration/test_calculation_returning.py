@@ -0,0 +1,135 @@
+# ======================================================================================
+# tests/integration/test_calculation_returning.py
+# ======================================================================================
+# Purpose: Verify that create and delete write with RETURNING and skip extra reads.
+# ======================================================================================
+
+import uuid
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+from app import database
+from app.auth.dependencies import get_current_active_user
+from app.main import app
+from app.models.calculation import Calculation, CalculationDependency, CalculationStats
+
+
+@pytest.fixture
+def client(test_user):
+    app.dependency_overrides[get_current_active_user] = lambda: test_user
+    try:
+        yield TestClient(app)
+    finally:
+        app.dependency_overrides.pop(get_current_active_user, None)
+
+
+@pytest.fixture
+def statements():
+    """SQL sent through the application's engine."""
+    sent = []
+    listener = lambda *args: sent.append(" ".join(args[2].split()))
+    event.listen(database.engine, "before_cursor_execute", listener)
+    yield sent
+    event.remove(database.engine, "before_cursor_execute", listener)
+
+
+def calculation_reads(sent):
+    return [sql for sql in sent if sql.startswith("SELECT") and "FROM calculations" in sql]
+
+
+def test_create_returns_the_inserted_row(client, statements, db_session, test_user):
+    response = client.post("/calculations", json={"type": "multiplication", "inputs": [3, 4]})
+    assert response.status_code == 201
+    body = response.json()
+    assert body["result"] == 12 and body["created_at"]
+    assert any(sql.startswith("INSERT INTO calculations") and "RETURNING" in sql for sql in statements)
+    assert calculation_reads(statements) == []
+    stats = db_session.get(CalculationStats, (test_user.id, "multiplication"))
+    assert (stats.count, stats.result_sum) == (1, 12)
+
+
+def test_delete_is_one_statement_and_404_when_returning_is_empty(client, statements, db_session, test_user):
+    calc_id = client.post("/calculations", json={"type": "addition", "inputs": [1, 2]}).json()["id"]
+    statements.clear()
+
+    assert client.delete(f"/calculations/{calc_id}").status_code == 204
+    assert any(sql.startswith("DELETE FROM calculations") and "RETURNING" in sql for sql in statements)
+    assert calculation_reads(statements) == []
+    assert db_session.get(CalculationStats, (test_user.id, "addition")) is None
+
+    assert client.delete(f"/calculations/{calc_id}").status_code == 404
+    assert client.delete(f"/calculations/{uuid.uuid4()}").status_code == 404
+
+
+def test_delete_removes_dependency_edges(client, db_session):
+    source = client.post("/calculations", json={"type": "addition", "inputs": [1, 2]}).json()["id"]
+    dependent = client.post(
+        "/calculations", json={"type": "addition", "inputs": [0, 5], "input_refs": {"0": source}}
+    ).json()["id"]
+
+    assert client.delete(f"/calculations/{source}").status_code == 204
+    edges = db_session.query(CalculationDependency).filter_by(calculation_id=uuid.UUID(dependent)).all()
+    assert edges == []
+
+
+on_postgres = pytest.mark.skipif(
+    database.engine.dialect.name != "postgresql", reason="UPDATE ... RETURNING path is PostgreSQL only"
+)
+
+
+def update_statements(sent):
+    return [sql for sql in sent if sql.startswith('WITH "old" AS') or sql.startswith("UPDATE calculations")]
+
+
+def test_update_uses_returning_only_on_postgres(client, db_session, test_user):
+    """SQLite cannot return pre-update values, so updates take the ORM path there."""
+    calc_id = client.post("/calculations", json={"type": "addition", "inputs": [1, 2]}).json()["id"]
+    row = Calculation.update_inputs_returning(db_session, uuid.UUID(calc_id), test_user.id, [5, 5])
+    if database.engine.dialect.name == "postgresql":
+        assert row is not None and row.result == 10
+    else:
+        assert row is None
+    db_session.rollback()
+    response = client.put(f"/calculations/{calc_id}", json={"inputs": [5, 5]})
+    assert response.json()["result"] == 10
+
+
+@on_postgres
+def test_update_is_one_statement_on_postgres(client, statements, db_session, test_user):
+    created = client.post("/calculations", json={"type": "division", "inputs": [100, 2]}).json()
+    statements.clear()
+
+    response = client.put(f"/calculations/{created['id']}", json={"inputs": [90, 3]})
+    assert response.status_code == 200
+    body = response.json()
+    assert (body["type"], body["inputs"], body["result"]) == ("division", [90, 3], 30)
+    assert body["updated_at"] > created["updated_at"]
+    assert len(update_statements(statements)) == 1
+    assert calculation_reads(statements) == []
+    stats = db_session.get(CalculationStats, (test_user.id, "division"))
+    assert (stats.count, stats.result_sum) == (1, 30)
+
+
+@on_postgres
+@pytest.mark.parametrize("case", ["refs", "dependents", "divisor", "missing"])
+def test_update_falls_back_to_the_orm(client, db_session, test_user, case):
+    """Rows the single statement cannot handle are left untouched for the ORM path."""
+    source = client.post("/calculations", json={"type": "division", "inputs": [8, 2]}).json()["id"]
+    target, inputs = source, [5, 5]
+    if case == "refs":
+        target = client.post(
+            "/calculations", json={"type": "addition", "inputs": [0, 1], "input_refs": {"0": source}}
+        ).json()["id"]
+    elif case == "dependents":
+        client.post("/calculations", json={"type": "addition", "inputs": [0, 1], "input_refs": {"0": source}})
+    elif case == "divisor":
+        inputs = [5, 0]
+    elif case == "missing":
+        target = str(uuid.uuid4())
+
+    assert Calculation.update_inputs_returning(db_session, uuid.UUID(target), test_user.id, inputs) is None
+    db_session.rollback()
+    stats = db_session.get(CalculationStats, (test_user.id, "division"))
+    assert (stats.count, stats.result_sum) == (1, 4)
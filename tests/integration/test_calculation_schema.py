@@ -97,3 +97,31 @@ def test_calculation_response_valid():
     assert calc_response.type == "subtraction"
     assert calc_response.inputs == [20, 5]
     assert calc_response.result == 15.5
+
+def test_calculation_batch_request_requires_items():
+    """Test CalculationBatchRequest rejects an empty batch."""
+    from app.schemas.calculation import CalculationBatchRequest
+    with pytest.raises(ValidationError):
+        CalculationBatchRequest(items=[])
+
+def test_calculation_input_refs_position_out_of_range():
+    """Test input_refs positions must point inside the inputs list."""
+    data = {
+        "type": "addition",
+        "inputs": [1.0, 2.0],
+        "input_refs": {"5": str(uuid4())},
+        "user_id": uuid4()
+    }
+    with pytest.raises(ValidationError, match="out of range"):
+        CalculationCreate(**data)
+
+def test_calculation_input_refs_skip_zero_check():
+    """Test a referenced divisor placeholder may be zero until it is resolved."""
+    data = {
+        "type": "division",
+        "inputs": [10.0, 0],
+        "input_refs": {"1": str(uuid4())},
+        "user_id": uuid4()
+    }
+    calc = CalculationCreate(**data)
+    assert 1 in calc.input_refs
@@ -0,0 +1,94 @@
+# ======================================================================================
+# tests/integration/test_calculation_stats.py
+# ======================================================================================
+# Purpose: Verify that calculation_stats follows every calculation write.
+# ======================================================================================
+
+import pytest
+
+from app.models.calculation import Calculation, CalculationStats
+
+
+def add_calc(db_session, user, calc_type, inputs):
+    calc = Calculation.create(calculation_type=calc_type, user_id=user.id, inputs=inputs)
+    calc.result = calc.get_result()
+    db_session.add(calc)
+    db_session.commit()
+    return calc
+
+
+def stats_for(db_session, user, calc_type):
+    db_session.expire_all()
+    return db_session.get(CalculationStats, (user.id, calc_type))
+
+
+def test_create_updates_stats(db_session, test_user):
+    """Each insert adds to count and sum and widens min/max."""
+    add_calc(db_session, test_user, "addition", [1, 2])
+    add_calc(db_session, test_user, "addition", [10, 20])
+    stats = stats_for(db_session, test_user, "addition")
+    assert stats.count == 2
+    assert stats.result_sum == 33
+    assert (stats.result_min, stats.result_max) == (3, 30)
+
+
+def test_update_replaces_old_result(db_session, test_user):
+    """Changing the minimum result recomputes the minimum."""
+    low = add_calc(db_session, test_user, "addition", [1, 2])
+    add_calc(db_session, test_user, "addition", [10, 20])
+    low.inputs = [100, 200]
+    low.result = low.get_result()
+    db_session.commit()
+    stats = stats_for(db_session, test_user, "addition")
+    assert stats.count == 2
+    assert stats.result_sum == 330
+    assert (stats.result_min, stats.result_max) == (30, 300)
+
+
+def test_delete_removes_row(db_session, test_user):
+    """Deleting the maximum recomputes it; deleting the last row drops the stats."""
+    add_calc(db_session, test_user, "multiplication", [2, 3])
+    high = add_calc(db_session, test_user, "multiplication", [5, 5])
+    db_session.delete(high)
+    db_session.commit()
+    stats = stats_for(db_session, test_user, "multiplication")
+    assert (stats.count, stats.result_max) == (1, 6)
+
+    db_session.delete(db_session.query(Calculation).filter_by(user_id=test_user.id).one())
+    db_session.commit()
+    assert stats_for(db_session, test_user, "multiplication") is None
+
+
+def test_bulk_create_updates_stats(db_session, test_user):
+    """Core inserts from bulk_create are counted too."""
+    Calculation.bulk_create(db_session, test_user.id, [("division", [8, 2]), ("division", [9, 3])])
+    db_session.commit()
+    stats = stats_for(db_session, test_user, "division")
+    assert (stats.count, stats.result_sum) == (2, 7)
+
+
+def test_rebuild_matches_incremental(db_session, test_user):
+    """Rebuilding from scratch gives the same rows."""
+    add_calc(db_session, test_user, "subtraction", [10, 4])
+    add_calc(db_session, test_user, "subtraction", [1, 4])
+    before = stats_for(db_session, test_user, "subtraction")
+    before = (before.count, before.result_sum, before.result_min, before.result_max)
+
+    CalculationStats.rebuild(db_session.connection())
+    db_session.commit()
+    after = stats_for(db_session, test_user, "subtraction")
+    assert (after.count, after.result_sum, after.result_min, after.result_max) == pytest.approx(before)
+
+
+def test_subtract_groups_after_rows_are_gone(db_session, test_user):
+    """A dropped partition's aggregates come out of the stats; extremes are recomputed."""
+    keep = add_calc(db_session, test_user, "addition", [1, 1])
+    dropped = add_calc(db_session, test_user, "addition", [50, 50])
+    group = (test_user.id, "addition", 1, dropped.result, dropped.result, dropped.result, dropped.created_at)
+    db_session.execute(Calculation.__table__.delete().where(Calculation.__table__.c.id == dropped.id))
+
+    CalculationStats.subtract_groups(db_session.connection(), [group])
+    db_session.commit()
+    stats = stats_for(db_session, test_user, "addition")
+    assert (stats.count, stats.result_sum, stats.result_max) == (1, 2, 2)
+    assert stats.last_created_at == keep.created_at
@@ -0,0 +1,94 @@
+# ======================================================================================
+# tests/integration/test_calculation_upload.py
+# ======================================================================================
+# Purpose: Verify the JSON, octet-stream and multipart bodies of POST /calculations.
+# ======================================================================================
+
+import struct
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.auth.dependencies import get_current_active_user
+from app.core.config import settings
+from app.main import app
+
+
+@pytest.fixture
+def client(test_user):
+    app.dependency_overrides[get_current_active_user] = lambda: test_user
+    try:
+        yield TestClient(app)
+    finally:
+        app.dependency_overrides.pop(get_current_active_user, None)
+
+
+def pack(*values: float) -> bytes:
+    return struct.pack(f"<{len(values)}d", *values)
+
+
+def test_octet_stream_body(client):
+    response = client.post(
+        "/calculations", params={"type": "addition"}, content=pack(1.5, 2.5, 3.0),
+        headers={"Content-Type": "application/octet-stream"},
+    )
+    assert response.status_code == 201
+    assert response.json()["result"] == 7.0
+
+
+def test_multipart_body(client):
+    response = client.post(
+        "/calculations", data={"type": "multiplication"},
+        files={"inputs": ("inputs.bin", pack(2.0, 3.0), "application/octet-stream")},
+    )
+    assert response.status_code == 201
+    assert response.json()["result"] == 6.0
+
+
+def test_binary_body_is_validated(client):
+    response = client.post(
+        "/calculations", params={"type": "division"}, content=pack(1.0, 0.0),
+        headers={"Content-Type": "application/octet-stream"},
+    )
+    assert response.status_code == 422
+    assert "Cannot divide by zero" in response.json()["detail"]
+
+
+def test_binary_body_size_is_capped(client, monkeypatch):
+    """Declared and streamed binary bodies over CALC_BINARY_MAX_BYTES are rejected with 413."""
+    monkeypatch.setattr(settings, "CALC_BINARY_MAX_BYTES", 16)
+    declared = client.post(
+        "/calculations", params={"type": "addition"}, content=pack(1.0, 2.0, 3.0),
+        headers={"Content-Type": "application/octet-stream"},
+    )
+    assert declared.status_code == 413
+
+    streamed = client.post(
+        "/calculations", params={"type": "addition"}, content=iter([pack(1.0, 2.0), pack(3.0)]),
+        headers={"Content-Type": "application/octet-stream"},
+    )
+    assert streamed.status_code == 413
+
+    multipart = client.post(
+        "/calculations", data={"type": "addition"},
+        files={"inputs": ("inputs.bin", pack(1.0, 2.0), "application/octet-stream")},
+    )
+    assert multipart.status_code == 413
+
+
+def test_json_errors_come_from_fastapi(client):
+    """JSON bodies are parsed and validated by FastAPI itself."""
+    invalid = client.post("/calculations", content=b"{", headers={"Content-Type": "application/json"})
+    assert invalid.status_code == 422
+    assert invalid.json()["detail"][0]["type"] == "json_invalid"
+
+    missing = client.post("/calculations")
+    assert missing.status_code == 422
+    assert missing.json()["detail"][0]["loc"] == ["body"]
+
+    wrong = client.post("/calculations", json={"type": "addition", "inputs": [1]})
+    assert wrong.status_code == 422
+    assert wrong.json()["detail"][0]["loc"][0] == "body"
+
+    ok = client.post("/calculations", json={"type": "addition", "inputs": [1, 2]})
+    assert ok.status_code == 201
@@ -53,3 +53,35 @@ def test_get_sessionmaker(mock_settings):
     engine = database.get_engine()
     SessionLocal = database.get_sessionmaker(engine)
     assert isinstance(SessionLocal, sessionmaker)
+
+def test_get_engine_applies_pool_settings(mock_settings, tmp_path):
+    """Pool settings are applied to engines built by get_engine."""
+    database = reload_database_module()
+    engine = database.get_engine(f"sqlite:///{tmp_path / 'pool.db'}")
+    assert isinstance(engine.pool, database.InstrumentedQueuePool)
+    assert engine.pool.size() == database.settings.DB_POOL_SIZE
+    assert engine.pool._max_overflow == database.settings.DB_MAX_OVERFLOW
+
+def test_pool_status_counts_waits_and_timeouts(mock_settings, tmp_path, monkeypatch):
+    """Checkouts are timed and pool exhaustion is counted as a timeout."""
+    database = reload_database_module()
+    monkeypatch.setattr(database.settings, "DB_POOL_SIZE", 1)
+    monkeypatch.setattr(database.settings, "DB_MAX_OVERFLOW", 0)
+    monkeypatch.setattr(database.settings, "DB_POOL_TIMEOUT", 0.01)
+    engine = database.get_engine(f"sqlite:///{tmp_path / 'pool.db'}")
+
+    with engine.connect():
+        assert database.pool_status(engine)["checked_out"] == 1
+        with pytest.raises(SQLAlchemyError):
+            engine.connect()
+
+    status = database.pool_status(engine)
+    assert status["checked_out"] == 0
+    assert status["timeouts"] == 1
+    assert status["wait_seconds"]["count"] == 2
+
+def test_connection_budget_skipped_off_postgres(mock_settings, tmp_path):
+    """The max_connections check only runs against PostgreSQL."""
+    database = reload_database_module()
+    engine = database.get_engine(f"sqlite:///{tmp_path / 'pool.db'}")
+    assert database.check_connection_budget(engine, workers=1000) is True
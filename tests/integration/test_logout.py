@@ -0,0 +1,127 @@
+# ======================================================================================
+# tests/integration/test_logout.py
+# ======================================================================================
+# Purpose: Verify per-user token generations and POST /auth/logout.
+# ======================================================================================
+
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.auth import generations
+from app.auth import redis as auth_redis
+from app.auth.generations import GenerationCache
+from app.auth.jwt import is_revoked, verify_jwt
+from app.auth.revocation import RevocationMirror
+from app.core.circuit_breaker import CircuitBreaker
+from app.main import app
+from app.models.user import User
+from app.schemas.token import TokenType
+from tests.fake_redis import FakeRedis
+
+
+@pytest.fixture
+def fake_redis(monkeypatch):
+    fake = FakeRedis()
+    monkeypatch.setattr(auth_redis, "redis_client", fake)
+    mirror = RevocationMirror()
+    mirror.replace([])
+    monkeypatch.setattr(auth_redis, "revocations", mirror)
+    return fake
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    fresh = GenerationCache(ttl_seconds=60, max_entries=100)
+    monkeypatch.setattr(generations, "token_generations", fresh)
+    monkeypatch.setattr("app.main.token_generations", fresh)
+    return fresh
+
+
+def issue(user):
+    return User.create_access_token({"sub": str(user.id), "gen": user.token_generation})
+
+
+def test_revoke_all_tokens_is_one_increment(db_session, test_user, fake_redis, cache):
+    first, second = issue(test_user), issue(test_user)
+    payloads = [verify_jwt(token, TokenType.ACCESS) for token in (first, second)]
+    assert all(payload["gen"] == 0 for payload in payloads)
+    assert not any(asyncio.run(is_revoked(payload)) for payload in payloads)
+    assert cache.stats()["misses"] == 1
+
+    assert User.revoke_all_tokens(db_session, test_user.id) == 1
+    db_session.commit()
+    # Still cached: another worker would notice once the TTL passes.
+    assert asyncio.run(is_revoked(payloads[0])) is False
+    cache.put(test_user.id, 1)
+    assert all(asyncio.run(is_revoked(payload)) for payload in payloads)
+
+    db_session.refresh(test_user)
+    assert asyncio.run(is_revoked(verify_jwt(issue(test_user), TokenType.ACCESS))) is False
+
+
+def test_logout_blacklists_only_this_token(test_user, fake_redis, cache):
+    client = TestClient(app)
+    token, other = issue(test_user), issue(test_user)
+    headers = {"Authorization": f"Bearer {token}"}
+
+    assert client.get("/calculations", headers=headers).status_code == 200
+    assert client.post("/auth/logout", headers=headers).status_code == 204
+    jti = verify_jwt(token, TokenType.ACCESS)["jti"]
+    assert f"revoked:{jti}" in fake_redis.data
+
+    response = client.get("/calculations", headers=headers)
+    assert response.status_code == 401
+    assert response.json()["detail"] == "Token has been revoked"
+    assert client.get("/calculations", headers={"Authorization": f"Bearer {other}"}).status_code == 200
+
+
+def test_logout_everywhere_revokes_every_token(db_session, test_user, fake_redis, cache):
+    client = TestClient(app)
+    token, other = issue(test_user), issue(test_user)
+
+    response = client.post("/auth/logout?everywhere=true", headers={"Authorization": f"Bearer {token}"})
+    assert response.status_code == 204
+    assert fake_redis.data == {}
+    db_session.refresh(test_user)
+    assert test_user.token_generation == 1
+    for revoked in (token, other):
+        assert client.get("/calculations", headers={"Authorization": f"Bearer {revoked}"}).status_code == 401
+
+    fresh = issue(test_user)
+    assert client.get("/calculations", headers={"Authorization": f"Bearer {fresh}"}).status_code == 200
+
+
+def test_logout_returns_503_when_redis_is_down(test_user, fake_redis, cache, monkeypatch):
+    monkeypatch.setattr(auth_redis, "breaker", auth_redis.CircuitBreaker(failure_threshold=100, reset_seconds=1))
+    fake_redis.failing = True
+    response = TestClient(app).post("/auth/logout", headers={"Authorization": f"Bearer {issue(test_user)}"})
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
+
+
+@pytest.fixture
+def live_redis(monkeypatch):
+    """The configured client, reachable or not, with fresh breaker and mirror."""
+    monkeypatch.setattr(auth_redis, "revocations", RevocationMirror())
+    monkeypatch.setattr(auth_redis, "breaker", CircuitBreaker(failure_threshold=5, reset_seconds=10))
+    monkeypatch.setattr(auth_redis, "_lookups", auth_redis._LookupBatcher())
+
+
+def test_protected_route_with_configured_redis(test_user, live_redis, cache):
+    """Whether or not Redis is running, a valid token is accepted under the default policy."""
+    headers = {"Authorization": f"Bearer {issue(test_user)}"}
+    response = TestClient(app).get("/calculations", headers=headers)
+    assert response.status_code == 200
+
+
+def test_protected_route_and_logout_without_redis(test_user, live_redis, cache, monkeypatch):
+    monkeypatch.setattr(auth_redis, "redis_client", None)
+    client = TestClient(app)
+    headers = {"Authorization": f"Bearer {issue(test_user)}"}
+
+    assert client.get("/calculations", headers=headers).status_code == 200
+    assert client.post("/auth/logout", headers=headers).status_code == 204
+    assert client.get("/calculations", headers=headers).status_code == 401
+    assert auth_redis.breaker.stats()["consecutive_failures"] == 0
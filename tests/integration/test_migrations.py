@@ -0,0 +1,98 @@
+# ======================================================================================
+# tests/integration/test_migrations.py
+# ======================================================================================
+# Purpose: Verify versioned migrations and the startup schema check.
+# ======================================================================================
+
+import uuid
+
+import pytest
+from sqlalchemy import event, inspect, text
+
+from app.database import Base, get_engine
+from app.migrations import schema
+from app.migrations.schema import (
+    LATEST_VERSION, check_inputs_storage, current_version, ensure_schema, migrate,
+)
+
+
+@pytest.fixture
+def fresh_engine(tmp_path):
+    bind = get_engine(f"sqlite:///{tmp_path / 'migrations.db'}")
+    yield bind
+    bind.dispose()
+
+
+def count_statements(bind, func):
+    statements = []
+    listener = lambda *args: statements.append(args[2])
+    event.listen(bind, "before_cursor_execute", listener)
+    try:
+        func(bind)
+    finally:
+        event.remove(bind, "before_cursor_execute", listener)
+    return statements
+
+
+def test_migrate_applies_each_version_once(fresh_engine):
+    assert current_version(fresh_engine) == 0
+    assert migrate(fresh_engine) == [m.version for m in schema.MIGRATIONS]
+    assert current_version(fresh_engine) == LATEST_VERSION
+    assert migrate(fresh_engine) == []
+
+
+def test_ensure_schema_is_one_query_when_current(fresh_engine):
+    migrate(fresh_engine)
+    statements = count_statements(fresh_engine, ensure_schema)
+    assert len(statements) == 1
+    assert "schema_migrations" in statements[0]
+
+
+def test_ensure_schema_refuses_when_migrating_on_start_is_off(fresh_engine, monkeypatch):
+    monkeypatch.setattr(schema.settings, "DATABASE_MIGRATE_ON_START", False)
+    with pytest.raises(RuntimeError, match="python -m app.migrations"):
+        ensure_schema(fresh_engine)
+
+
+def test_startup_refuses_packed_storage_on_a_json_column(fresh_engine, monkeypatch):
+    """The packed conversion is not a numbered migration; startup says so instead of failing writes."""
+    migrate(fresh_engine)
+    monkeypatch.setattr(schema.settings, "CALC_INPUTS_STORAGE", "json")
+    check_inputs_storage(fresh_engine)
+    monkeypatch.setattr(schema.settings, "CALC_INPUTS_STORAGE", "packed")
+    with pytest.raises(RuntimeError, match="python -m app.migrations.pack_inputs"):
+        check_inputs_storage(fresh_engine)
+
+
+def test_upgrade_of_database_created_with_create_all(fresh_engine):
+    """A database created before migrations existed gets the new indexes and its stats backfilled."""
+    schema._baseline_metadata.create_all(fresh_engine)
+    user_id = uuid.uuid4().hex
+    with fresh_engine.begin() as conn:
+        conn.execute(text(
+            "INSERT INTO users (id, first_name, last_name, email, username, password, is_active, "
+            "is_verified, created_at, updated_at) VALUES (:id, 'a', 'b', 'a@b.c', 'ab', 'x', 1, 0, "
+            "CURRENT_TIMESTAMP, CURRENT_TIMESTAMP)"
+        ), {"id": user_id})
+        conn.execute(text(
+            "INSERT INTO calculations (id, user_id, type, inputs, result, created_at, updated_at) "
+            "VALUES (:id, :user_id, 'addition', '[1, 2]', 3, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP)"
+        ), {"id": uuid.uuid4().hex, "user_id": user_id})
+
+    assert ensure_schema(fresh_engine) == LATEST_VERSION
+    with fresh_engine.connect() as conn:
+        indexes = conn.execute(text("SELECT name FROM sqlite_master WHERE type = 'index'")).scalars().all()
+        stats = conn.execute(text("SELECT count, result_sum FROM calculation_stats")).one()
+    assert "ix_calculations_user_created" in indexes
+    assert tuple(stats) == (1, 3)
+
+
+def test_migrated_schema_matches_the_models(fresh_engine):
+    """The frozen migrations end where the models are; a model change needs a migration."""
+    migrate(fresh_engine)
+    inspector = inspect(fresh_engine)
+    for table in Base.metadata.sorted_tables:
+        columns = {column["name"] for column in inspector.get_columns(table.name)}
+        assert columns == set(table.columns.keys()), table.name
+        indexes = {index["name"] for index in inspector.get_indexes(table.name)}
+        assert {index.name for index in table.indexes} <= indexes, table.name
@@ -0,0 +1,109 @@
+# ======================================================================================
+# tests/integration/test_pack_inputs.py
+# ======================================================================================
+# Purpose: Verify the online JSON -> packed inputs migration (PostgreSQL only).
+# ======================================================================================
+
+import json
+import uuid
+
+import pytest
+from sqlalchemy import create_engine, text
+
+from app import database
+from app.migrations import pack_inputs
+from app.migrations.schema import check_inputs_storage, migrate
+from app.operations.packing import decode_inputs
+
+pytestmark = pytest.mark.skipif(
+    database.engine.dialect.name != "postgresql", reason="the migration is PostgreSQL only"
+)
+
+
+@pytest.fixture
+def bind():
+    """A throwaway schema so the shared test tables are left as they are."""
+    url = database.engine.url
+    with database.engine.begin() as conn:
+        conn.execute(text("DROP SCHEMA IF EXISTS pack_inputs_test CASCADE"))
+        conn.execute(text("CREATE SCHEMA pack_inputs_test"))
+    engine = create_engine(url, connect_args={"options": "-csearch_path=pack_inputs_test"})
+    # The migrations create inputs as JSON whatever CALC_INPUTS_STORAGE says
+    migrate(engine)
+    yield engine
+    engine.dispose()
+    with database.engine.begin() as conn:
+        conn.execute(text("DROP SCHEMA pack_inputs_test CASCADE"))
+
+
+def insert_calculations(bind, count):
+    user_id = uuid.uuid4()
+    ids = sorted(uuid.uuid4() for _ in range(count))
+    with bind.begin() as conn:
+        conn.execute(text(
+            "INSERT INTO users (id, first_name, last_name, email, username, password, is_active, "
+            "is_verified, token_generation, created_at, updated_at) VALUES (:id, 'a', 'b', :email, "
+            ":username, 'x', true, false, 0, now(), now())"
+        ), {"id": user_id, "email": f"{user_id.hex}@example.com", "username": user_id.hex})
+        conn.execute(text(
+            "INSERT INTO calculations (id, user_id, type, inputs, result, created_at, updated_at) "
+            "VALUES (:id, :user_id, 'addition', :inputs, 0, now(), now())"
+        ), [{"id": calc_id, "user_id": user_id, "inputs": json.dumps([i, 1])} for i, calc_id in enumerate(ids)])
+    return ids
+
+
+def packed_inputs(bind):
+    with bind.connect() as conn:
+        rows = conn.execute(text("SELECT id, inputs FROM calculations")).all()
+    return {row_id: list(decode_inputs(raw)) for row_id, raw in rows}
+
+
+def test_rows_edited_after_their_batch_are_repacked(bind):
+    ids = insert_calculations(bind, 5)
+    pack_inputs.prepare(bind)
+    assert pack_inputs.convert_online(bind, batch_size=2) == 5
+
+    # The JSON-mode application edits an already packed row and adds one.
+    with bind.begin() as conn:
+        conn.execute(text("UPDATE calculations SET inputs = :inputs WHERE id = :id"),
+                     {"inputs": json.dumps([7, 7]), "id": ids[0]})
+    extra = insert_calculations(bind, 1)[0]
+
+    assert pack_inputs.migrate(bind, batch_size=2) == 2
+    inputs = packed_inputs(bind)
+    assert inputs[ids[0]] == [7, 7]
+    assert inputs[ids[4]] == [4, 1]
+    assert inputs[extra] == [0, 1]
+    assert pack_inputs.is_packed(bind)
+    with bind.connect() as conn:
+        assert conn.execute(text("SELECT count(*) FROM pg_trigger WHERE NOT tgisinternal")).scalar() == 0
+
+
+def test_each_pass_walks_the_table_once(bind):
+    insert_calculations(bind, 7)
+    pack_inputs.prepare(bind)
+    lasts = []
+    convert_batch = pack_inputs._convert_batch
+
+    def recording(conn, batch_size, last):
+        lasts.append(last)
+        return convert_batch(conn, batch_size, last)
+
+    pack_inputs._convert_batch = recording
+    try:
+        assert pack_inputs.convert_online(bind, batch_size=3) == 7
+    finally:
+        pack_inputs._convert_batch = convert_batch
+    # Three batches and the empty probe, each starting after the previous one
+    assert len(lasts) == 4 and lasts == sorted(lasts, key=str)
+
+
+def test_startup_check_follows_the_conversion(bind, monkeypatch):
+    """After the conversion only CALC_INPUTS_STORAGE=packed may start."""
+    insert_calculations(bind, 2)
+    pack_inputs.migrate(bind)
+    monkeypatch.setattr(pack_inputs.settings, "CALC_INPUTS_STORAGE", "json")
+    with pytest.raises(RuntimeError, match="CALC_INPUTS_STORAGE=packed"):
+        check_inputs_storage(bind)
+    monkeypatch.setattr(pack_inputs.settings, "CALC_INPUTS_STORAGE", "packed")
+    check_inputs_storage(bind)
@@ -0,0 +1,168 @@
+# ======================================================================================
+# tests/integration/test_replicas.py
+# ======================================================================================
+# Purpose: Verify replica selection and read-your-writes routing.
+# ======================================================================================
+
+import time
+
+import pytest
+from sqlalchemy import event
+from fastapi.testclient import TestClient
+from starlette.requests import Request
+
+from app import database
+from app.auth import redis as auth_redis
+from app.auth.dependencies import get_current_active_user
+from app.core import read_after_write
+from app.core.read_after_write import ReadAfterWriteMiddleware
+from app.database import ReplicaSet, get_read_db
+from app.main import app
+from app.models.user import User
+from tests.fake_redis import FakeRedis
+
+
+@pytest.fixture
+def replica_urls(tmp_path):
+    return [f"sqlite:///{tmp_path / 'replica_a.db'}", f"sqlite:///{tmp_path / 'replica_b.db'}"]
+
+
+@pytest.fixture
+def as_user(replica_urls, monkeypatch, test_user):
+    """Replicas configured and test_user authenticated; returns the bearer headers."""
+    replicas = ReplicaSet(replica_urls, health_interval=60)
+    monkeypatch.setattr(database, "replicas", replicas)
+    monkeypatch.setattr(read_after_write, "_local", {})
+    app.dependency_overrides[get_current_active_user] = lambda: test_user
+    yield {"Authorization": f"Bearer {User.create_access_token({'sub': str(test_user.id)})}"}
+    app.dependency_overrides.pop(get_current_active_user, None)
+
+
+def replica_client():
+    """The app as it is assembled when DATABASE_REPLICA_URLS is set."""
+    return TestClient(ReadAfterWriteMiddleware(app))
+
+
+def token(seconds_from_now: float, lsn: str = "") -> str:
+    return f"{time.time() + seconds_from_now:.3f}:{lsn}"
+
+
+def test_round_robin_over_healthy_replicas(replica_urls):
+    """Reads alternate between replicas."""
+    replicas = ReplicaSet(replica_urls, health_interval=60)
+    chosen = [replicas.engine_for_read(None) for _ in range(4)]
+    assert chosen == replicas.engines * 2
+    assert replicas.reads["replica"] == 4
+
+
+def test_unhealthy_replica_is_skipped(replica_urls, tmp_path):
+    """A replica that fails its health check receives no reads."""
+    broken = f"sqlite:///{tmp_path / 'missing' / 'replica.db'}"
+    replicas = ReplicaSet([broken, replica_urls[0]], health_interval=60)
+    assert {replicas.engine_for_read(None) for _ in range(3)} == {replicas.engines[1]}
+    assert replicas.healthy == [False, True]
+
+
+def test_no_healthy_replica_uses_primary(tmp_path):
+    replicas = ReplicaSet([f"sqlite:///{tmp_path / 'missing' / 'replica.db'}"], health_interval=60)
+    assert replicas.engine_for_read(None) is None
+    assert replicas.reads["primary_no_replica"] == 1
+
+
+def test_recent_write_reads_from_primary(replica_urls):
+    """Inside the read-after-write window reads stay on the primary; afterwards they do not."""
+    replicas = ReplicaSet(replica_urls, health_interval=60)
+    assert replicas.engine_for_read(token(5)) is None
+    assert replicas.engine_for_read(token(-1)) is not None
+    assert replicas.engine_for_read("garbage") is not None
+    assert replicas.reads["primary_recent_write"] == 1
+
+
+def test_get_read_db_binds_replica(replica_urls, monkeypatch):
+    """get_read_db hands out sessions bound to the chosen replica."""
+    replicas = ReplicaSet(replica_urls, health_interval=60)
+    monkeypatch.setattr(database, "replicas", replicas)
+    request = Request({"type": "http", "headers": []})
+    db = next(get_read_db(request))
+    assert db.get_bind() in replicas.engines
+    db.close()
+
+
+@pytest.mark.parametrize("with_redis", [True, False])
+def test_write_pins_the_users_reads_to_the_primary(as_user, monkeypatch, test_user, with_redis):
+    """After a write every client of the user reads from the primary; a rejected write records nothing."""
+    fake = FakeRedis()
+    monkeypatch.setattr(auth_redis, "redis_client", fake if with_redis else None)
+
+    rejected = replica_client().post("/calculations", json={"type": "division", "inputs": [1, 0]}, headers=as_user)
+    assert rejected.status_code == 422
+    assert fake.data == {}
+    assert read_after_write._local == {}
+
+    response = replica_client().post("/calculations", json={"type": "addition", "inputs": [1, 2]}, headers=as_user)
+    assert response.status_code == 201
+    if with_redis:
+        marker = fake.data[f"{read_after_write.KEY_PREFIX}{test_user.id}"]
+    else:
+        _, marker = read_after_write._local[str(test_user.id)]
+    deadline, _ = database.parse_read_after_write_token(marker)
+    assert deadline > time.time()
+    assert "set-cookie" not in response.headers
+
+    # Another client with the same user's token
+    listed = replica_client().get("/calculations", headers=as_user)
+    assert listed.status_code == 200
+    assert database.replicas.reads["primary_recent_write"] == 1
+
+
+def test_redis_failure_reads_from_the_primary(as_user, monkeypatch):
+    """If the user's marker cannot be read the read stays on the primary."""
+    fake = FakeRedis()
+    fake.failing = True
+    monkeypatch.setattr(auth_redis, "redis_client", fake)
+    assert replica_client().get("/calculations", headers=as_user).status_code == 200
+    assert database.replicas.reads["primary_recent_write"] == 1
+
+
+def test_no_middleware_without_replicas():
+    """Without DATABASE_REPLICA_URLS requests do not pass through ReadAfterWriteMiddleware."""
+    assert database.replicas is None
+    assert all(middleware.cls is not ReadAfterWriteMiddleware for middleware in app.user_middleware)
+
+
+def test_writes_read_the_wal_position_on_their_own_connection(as_user, monkeypatch, test_user):
+    """The position is read on the committing connection: no extra checkout per write."""
+    monkeypatch.setattr(auth_redis, "redis_client", None)
+    lsn_connections = []
+    current_wal_lsn = database.current_wal_lsn
+
+    def recording(connection):
+        lsn_connections.append(connection)
+        return current_wal_lsn(connection)
+
+    monkeypatch.setattr(database, "current_wal_lsn", recording)
+    checkouts = []
+    listener = lambda *args: checkouts.append(1)
+    event.listen(database.engine, "checkout", listener)
+    client, payload = replica_client(), {"type": "addition", "inputs": [1, 2]}
+    try:
+        assert client.post("/calculations", json=payload, headers=as_user).status_code == 201
+        with_replicas = len(checkouts)
+        monkeypatch.setattr(database, "replicas", None)
+        checkouts.clear()
+        assert client.post("/calculations", json=payload, headers=as_user).status_code == 201
+    finally:
+        event.remove(database.engine, "checkout", listener)
+
+    assert len(lsn_connections) == 1
+    assert with_replicas == len(checkouts)
+    _, marker = read_after_write._local[str(test_user.id)]
+    _, lsn = database.parse_read_after_write_token(marker)
+    assert ("/" in lsn) == (database.engine.dialect.name == "postgresql")
+
+
+def test_anonymous_writes_record_no_marker(as_user, monkeypatch):
+    monkeypatch.setattr(auth_redis, "redis_client", None)
+    # The route's user comes from the dependency override; there is no token
+    assert replica_client().post("/calculations", json={"type": "addition", "inputs": [1, 2]}).status_code == 201
+    assert read_after_write._local == {}
@@ -7,6 +7,7 @@
 
 import pytest
 import logging
+import uuid
 from sqlalchemy import text
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import sessionmaker
@@ -325,3 +326,8 @@ def test_error_handling():
             session.execute(text("INVALID SQL"))
     assert "INVALID SQL" in str(exc_info.value)
 
+
+def test_get_by_id(db_session, test_user):
+    """User.get_by_id finds the user by primary key, or returns None."""
+    assert User.get_by_id(db_session, test_user.id) is test_user
+    assert User.get_by_id(db_session, uuid.uuid4()) is None
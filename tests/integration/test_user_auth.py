@@ -3,7 +3,11 @@
 import pytest
 from uuid import UUID
 import pydantic_core
+from fastapi.testclient import TestClient
 from sqlalchemy.exc import IntegrityError
+from app.auth.hashing import password_hasher
+from app.core.config import settings
+from app.main import app
 from app.models.user import User
 
 def test_password_hashing(db_session, fake_user_data):
@@ -194,3 +198,20 @@ def test_missing_password_registration(db_session):
     # Adjust the expected error message
     with pytest.raises(ValueError, match="Password must be at least 6 characters long"):
         User.register(db_session, test_data)
+
+def test_login_is_shed_when_hashing_queue_is_full(monkeypatch):
+    """A full password hashing queue answers 503 with Retry-After, not a stall."""
+    client = TestClient(app)
+    monkeypatch.setattr(password_hasher, "_in_flight", password_hasher.capacity)
+    response = client.post(
+        "/auth/register",
+        json={
+            "first_name": "Busy", "last_name": "User", "email": "busy@example.com",
+            "username": "busyuser", "password": "SecurePass123!", "confirm_password": "SecurePass123!",
+        },
+    )
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
+    monkeypatch.setattr(settings, "METRICS_TOKEN", "metrics-token")
+    metrics = client.get("/metrics", headers={"Authorization": "Bearer metrics-token"}).json()
+    assert metrics["password_hashing"]["rejected"] >= 1
@@ -1,4 +1,5 @@
 from fastapi.testclient import TestClient
+from app.core.config import settings
 from app.main import app
 
 client = TestClient(app)
@@ -10,4 +11,17 @@ def test_read_health():
     """
     response = client.get("/health")
     assert response.status_code == 200
-    assert response.json() == {"status": "ok"}
\ No newline at end of file
+    assert response.json() == {"status": "ok"}
+
+
+def test_metrics_require_the_metrics_token(monkeypatch):
+    """/metrics is hidden without METRICS_TOKEN and needs it once set."""
+    monkeypatch.setattr(settings, "METRICS_TOKEN", None)
+    assert client.get("/metrics").status_code == 404
+
+    monkeypatch.setattr(settings, "METRICS_TOKEN", "s3cret")
+    assert client.get("/metrics").status_code == 401
+    assert client.get("/metrics", headers={"Authorization": "Bearer wrong"}).status_code == 401
+    response = client.get("/metrics", headers={"Authorization": "Bearer s3cret"})
+    assert response.status_code == 200
+    assert "db_pool" in response.json()
@@ -0,0 +1,61 @@
+# tests/unit/test_binary.py
+
+import struct
+
+import pytest
+
+from app.operations import binary, vectorized
+from app.operations.binary import decode_float64, validate_float64
+
+
+def pack(*values: float) -> bytes:
+    return struct.pack(f"<{len(values)}d", *values)
+
+
+@pytest.fixture(params=[True, False], ids=["numpy", "memoryview"])
+def engine(request, monkeypatch):
+    """Run each test against the NumPy path and the memoryview fallback."""
+    if request.param and not vectorized.HAS_NUMPY:
+        pytest.skip("NumPy is not installed")
+    monkeypatch.setattr(binary, "HAS_NUMPY", request.param)
+    return request.param
+
+
+def test_decode_round_trip(engine):
+    """Little-endian float64 bytes decode to the same values."""
+    values = decode_float64(pack(1.5, -2.0, 3.25))
+    assert list(values) == [1.5, -2.0, 3.25]
+
+
+def test_decode_does_not_copy(engine):
+    """The decoded buffer shares memory with the request body."""
+    data = bytearray(pack(1.0, 2.0))
+    values = decode_float64(data)
+    data[:8] = pack(9.0)
+    assert values[0] == 9.0
+
+
+def test_decode_rejects_partial_value(engine):
+    """A body that is not a multiple of 8 bytes is rejected."""
+    with pytest.raises(ValueError, match="float64"):
+        decode_float64(b"\x00" * 12)
+
+
+@pytest.mark.parametrize(
+    "calc_type, values, message",
+    [
+        ("addition", (1.0,), "At least two numbers"),
+        ("division", (1.0, 0.0), "Cannot divide by zero"),
+        ("addition", (1.0, float("nan")), "finite"),
+        ("multiplication", (float("inf"), 2.0), "finite"),
+    ],
+)
+def test_validate_rejects(engine, calc_type, values, message):
+    """Validation uses the same messages as CalculationBase."""
+    with pytest.raises(ValueError, match=message):
+        validate_float64(calc_type, decode_float64(pack(*values)))
+
+
+def test_validate_allows_zero_numerator(engine):
+    """Only divisors must be non-zero."""
+    validate_float64("division", decode_float64(pack(0.0, 2.0)))
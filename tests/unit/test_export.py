@@ -0,0 +1,59 @@
+# tests/unit/test_export.py
+
+import csv
+import gzip
+import io
+import json
+import uuid
+from datetime import datetime
+
+from app.operations.export import EXPORT_COLUMNS, encode_csv, encode_ndjson, gzip_chunks
+
+CREATED = datetime(2025, 1, 1, 12, 30)
+ROWS = [
+    (uuid.UUID(int=1), "addition", [1.0, 2.0], 3.0, CREATED, CREATED),
+    (uuid.UUID(int=2), "division", [10.0, 4.0], 2.5, CREATED, CREATED),
+]
+
+
+class Packed:
+    """Stands in for PackedVector: anything with tolist()."""
+
+    def tolist(self):
+        return [5.0, 5.0]
+
+
+def test_ndjson_one_chunk_per_batch():
+    chunks = list(encode_ndjson([ROWS[:1], ROWS[1:]]))
+    assert len(chunks) == 2
+    first = json.loads(chunks[0])
+    assert first == {
+        "id": str(uuid.UUID(int=1)),
+        "type": "addition",
+        "inputs": [1.0, 2.0],
+        "result": 3.0,
+        "created_at": "2025-01-01T12:30:00",
+        "updated_at": "2025-01-01T12:30:00",
+    }
+
+
+def test_ndjson_packed_inputs():
+    row = (uuid.UUID(int=3), "addition", Packed(), 10.0, CREATED, CREATED)
+    assert json.loads(b"".join(encode_ndjson([[row]])))["inputs"] == [5.0, 5.0]
+
+
+def test_csv_header_and_rows():
+    text = b"".join(encode_csv([ROWS])).decode()
+    rows = list(csv.reader(io.StringIO(text)))
+    assert tuple(rows[0]) == EXPORT_COLUMNS
+    assert rows[1][:4] == [str(uuid.UUID(int=1)), "addition", "[1.0,2.0]", "3.0"]
+    assert len(rows) == 3
+
+
+def test_csv_empty_export_has_header():
+    assert b"".join(encode_csv([])) == b"id,type,inputs,result,created_at,updated_at\n"
+
+
+def test_gzip_chunks_round_trip():
+    chunks = list(encode_ndjson([ROWS, ROWS]))
+    assert gzip.decompress(b"".join(gzip_chunks(chunks))) == b"".join(chunks)
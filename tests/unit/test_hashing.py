@@ -0,0 +1,70 @@
+# tests/unit/test_hashing.py
+
+import asyncio
+import threading
+
+import pytest
+
+from app.auth import hashing
+from app.auth.hashing import HasherBusy, PasswordHasher
+
+
+def test_pool_hashes_and_verifies():
+    """Hashes run in worker processes and are recorded in the latency histograms."""
+    hasher = PasswordHasher(workers=2, max_pending=0)
+    try:
+        hashed = hasher.hash("secret123")
+        assert hasher.verify("secret123", hashed) is True
+        assert asyncio.run(hasher.averify("wrong", hashed)) is False
+    finally:
+        hasher.shutdown()
+    stats = hasher.stats()
+    assert stats["completed"] == 3
+    assert stats["hash_seconds"]["count"] == stats["wait_seconds"]["count"] == 3
+    assert (stats["running"], stats["queued"]) == (0, 0)
+
+
+def test_full_queue_is_rejected(monkeypatch):
+    """Beyond workers + max_pending, submissions fail fast instead of queueing."""
+    release = threading.Event()
+    started = threading.Barrier(3)
+
+    def slow_hash(password):
+        started.wait()
+        release.wait()
+        return password, 0.0
+
+    monkeypatch.setattr(hashing, "_timed_hash", slow_hash)
+    hasher = PasswordHasher(workers=0, max_pending=1)
+    threads = [threading.Thread(target=hasher.hash, args=("x",)) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    started.wait()
+    try:
+        assert hasher.stats()["queued"] == 1
+        with pytest.raises(HasherBusy):
+            hasher.hash("y")
+    finally:
+        release.set()
+        for thread in threads:
+            thread.join()
+    stats = hasher.stats()
+    assert (stats["rejected"], stats["completed"], stats["queued"]) == (1, 2, 0)
+
+
+def test_failures_release_their_slot():
+    hasher = PasswordHasher(workers=0, max_pending=0)
+    with pytest.raises(ValueError):
+        hasher.verify("secret123", "not-a-hash")
+    assert hasher.verify("secret123", hasher.hash("secret123")) is True
+
+
+def test_pool_is_shared_between_web_workers(monkeypatch):
+    monkeypatch.setattr(hashing.settings, "AUTH_HASH_WORKERS", None)
+    monkeypatch.setattr(hashing.settings, "WEB_CONCURRENCY", 4)
+    monkeypatch.setattr(hashing.os, "cpu_count", lambda: 8)
+    assert hashing.pool_size() == 2
+    monkeypatch.setattr(hashing.settings, "WEB_CONCURRENCY", 1)
+    assert hashing.pool_size() == 4
+    monkeypatch.setattr(hashing.settings, "WEB_CONCURRENCY", 16)
+    assert hashing.pool_size() == 1
@@ -0,0 +1,55 @@
+# tests/unit/test_ingest.py
+
+import asyncio
+import gzip
+import zlib
+
+import pytest
+
+from app.operations.ingest import iter_ndjson_lines
+
+
+async def _chunks(data: bytes, size: int):
+    for start in range(0, len(data), size):
+        yield data[start:start + size]
+
+
+def collect(data: bytes, size: int = 7, **kwargs):
+    async def run():
+        return [item async for item in iter_ndjson_lines(_chunks(data, size), **kwargs)]
+    return asyncio.run(run())
+
+
+BODY = (
+    b'{"type": "addition", "inputs": [1, 2]}\n'
+    b'\n'
+    b'{"type": "division", "inputs": [10, 5]}\n'
+    b'{"type": "subtraction", "inputs": [3, 1]}'
+)
+
+
+def test_lines_split_across_chunks():
+    """Lines are reassembled regardless of how the body is chunked."""
+    lines = collect(BODY)
+    assert [number for number, _ in lines] == [1, 2, 3, 4]
+    assert lines[0][1] == b'{"type": "addition", "inputs": [1, 2]}'
+    assert lines[1][1] == b""
+    assert lines[3][1] == b'{"type": "subtraction", "inputs": [3, 1]}'
+
+
+def test_gzip_body():
+    """A gzip body yields the same lines as the plain one."""
+    assert collect(gzip.compress(BODY), gzipped=True) == collect(BODY)
+
+
+def test_truncated_gzip_body():
+    """A truncated gzip stream raises zlib.error."""
+    with pytest.raises(zlib.error):
+        collect(gzip.compress(BODY)[:-10], gzipped=True)
+
+
+def test_long_line_is_skipped():
+    """Lines over max_line_bytes come back as None without breaking later lines."""
+    body = b"x" * 100 + b"\n" + b'{"ok": 1}\n' + b"y" * 100
+    lines = collect(body, size=16, max_line_bytes=50)
+    assert lines == [(1, None), (2, b'{"ok": 1}'), (3, None)]
@@ -0,0 +1,97 @@
+# tests/unit/test_jobs.py
+
+import asyncio
+
+import pytest
+
+from app.operations.jobs import JobQueue, JobStatus
+
+
+async def double(x):
+    await asyncio.sleep(0)
+    return x * 2
+
+
+async def reject():
+    raise ValueError("Cannot divide by zero.")
+
+
+async def crash():
+    raise RuntimeError("boom")
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def test_job_succeeds_and_wait_returns_result():
+    """A submitted job runs in the background and wait() sees the result."""
+    async def scenario():
+        jobs = JobQueue(workers=2, max_pending=10, retention_seconds=60)
+        job = jobs.submit("alice", double, 21)
+        assert job.status == JobStatus.PENDING
+        await jobs.wait(job, 1)
+        await jobs.shutdown()
+        return job
+
+    job = run(scenario())
+    assert job.status == JobStatus.SUCCEEDED
+    assert job.result == 42
+    assert job.owner == "alice"
+
+
+@pytest.mark.parametrize("func, error", [(reject, "Cannot divide by zero."), (crash, "Internal error")])
+def test_job_failure_is_reported(func, error):
+    """ValueError messages are surfaced; other errors are hidden."""
+    async def scenario():
+        jobs = JobQueue(workers=1, max_pending=10, retention_seconds=60)
+        job = await jobs.wait(jobs.submit(None, func), 1)
+        await jobs.shutdown()
+        return job
+
+    job = run(scenario())
+    assert job.status == JobStatus.FAILED
+    assert job.error == error
+
+
+def test_wait_times_out_while_running():
+    """Long-polling returns the current state after the timeout."""
+    async def scenario():
+        jobs = JobQueue(workers=1, max_pending=10, retention_seconds=60)
+        gate = asyncio.Event()
+        job = jobs.submit(None, gate.wait)
+        await jobs.wait(job, 0.01)
+        status = job.status
+        gate.set()
+        await jobs.wait(job, 1)
+        await jobs.shutdown()
+        return status, job.status
+
+    assert run(scenario()) == (JobStatus.RUNNING, JobStatus.SUCCEEDED)
+
+
+def test_submit_rejects_when_queue_is_full():
+    """At most max_pending jobs wait for a worker."""
+    async def scenario():
+        jobs = JobQueue(workers=1, max_pending=1, retention_seconds=60)
+        gate = asyncio.Event()
+        jobs.submit(None, gate.wait)
+        await asyncio.sleep(0)  # the worker takes the first job
+        jobs.submit(None, gate.wait)
+        with pytest.raises(asyncio.QueueFull):
+            jobs.submit(None, gate.wait)
+        await jobs.shutdown()
+
+    run(scenario())
+
+
+def test_finished_jobs_expire():
+    """Finished jobs are forgotten after the retention period."""
+    async def scenario():
+        jobs = JobQueue(workers=1, max_pending=10, retention_seconds=0)
+        job = await jobs.wait(jobs.submit(None, double, 1), 1)
+        found = jobs.get(job.id)
+        await jobs.shutdown()
+        return found
+
+    assert run(scenario()) is None
@@ -0,0 +1,82 @@
+# tests/unit/test_memo.py
+
+import pytest
+
+from app.operations import memo
+from app.operations.calculation_logic import perform_calculation
+from app.operations.memo import ResultCache, lookup_or_compute, make_key
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    """Swap in a fresh cache so counters start at zero."""
+    fresh = ResultCache(max_bytes=1024 * 1024, ttl_seconds=60)
+    monkeypatch.setattr(memo, "result_cache", fresh)
+    monkeypatch.setattr(memo.settings, "CALC_MEMO_MIN_INPUTS", 2)
+    return fresh
+
+
+def test_key_is_canonical():
+    """Ints and floats with the same value share a key; types do not."""
+    assert make_key("addition", [2, 3]) == make_key("addition", [2.0, 3.0])
+    assert make_key("addition", [2, 3]) != make_key("multiplication", [2, 3])
+    assert make_key("addition", [2, 3]) != make_key("addition", [3, 2])
+
+
+def test_hit_and_miss_counters(cache):
+    """The second identical computation is served from the cache."""
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return 5.0
+
+    assert lookup_or_compute("addition", [2, 3], compute) == 5.0
+    assert lookup_or_compute("addition", [2, 3], compute) == 5.0
+    assert len(calls) == 1
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_errors_are_not_cached(cache):
+    """Divide-by-zero errors are raised every time and never stored."""
+    for _ in range(2):
+        with pytest.raises(ValueError, match="Cannot divide by zero"):
+            perform_calculation([1, 0], "division")
+    assert cache.stats()["entries"] == 0
+
+
+def test_eviction_by_bytes():
+    """Least recently used entries are evicted once the byte budget is exceeded."""
+    entry_size = ResultCache._entry_size(make_key("addition", [1, 1]), 1.0)
+    cache = ResultCache(max_bytes=entry_size * 2, ttl_seconds=60)
+    keys = [make_key("addition", [i, i]) for i in range(3)]
+    cache.put(keys[0], 0.0)
+    cache.put(keys[1], 1.0)
+    cache.get(keys[0])
+    cache.put(keys[2], 2.0)
+
+    assert cache.get(keys[1]) == (False, None)
+    assert cache.get(keys[0]) == (True, 0.0)
+    assert cache.stats()["evictions"] == 1
+    assert cache.stats()["bytes"] <= cache.max_bytes
+
+
+def test_ttl_expiry(monkeypatch):
+    """Entries past their TTL are treated as misses and dropped."""
+    now = [1000.0]
+    monkeypatch.setattr(memo.time, "monotonic", lambda: now[0])
+    cache = ResultCache(max_bytes=1024, ttl_seconds=10)
+    key = make_key("addition", [1, 2])
+    cache.put(key, 3.0)
+    now[0] += 11
+    assert cache.get(key) == (False, None)
+    assert cache.stats()["expirations"] == 1
+
+
+def test_disabled_cache_bypasses_storage(cache):
+    """A disabled cache neither stores nor counts."""
+    cache.enabled = False
+    lookup_or_compute("addition", [2, 3], lambda: 5.0)
+    assert cache.stats()["entries"] == 0
+    assert cache.stats()["misses"] == 0
@@ -0,0 +1,31 @@
+# tests/unit/test_metrics.py
+
+import threading
+
+from app.core.metrics import Counter, Histogram
+
+
+def test_histogram_buckets_are_cumulative():
+    """Each bucket counts observations up to and including its bound."""
+    histogram = Histogram(buckets=(0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 2.0):
+        histogram.observe(value)
+    snapshot = histogram.snapshot()
+    assert snapshot["buckets"] == {"0.1": 2, "1.0": 3, "+Inf": 4}
+    assert snapshot["count"] == histogram.count == 4
+    assert snapshot["sum"] == 2.65
+
+
+def test_counter_is_safe_across_threads():
+    counter = Counter()
+
+    def bump():
+        for _ in range(10000):
+            counter.inc()
+
+    threads = [threading.Thread(target=bump) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert counter.value == 80000
@@ -0,0 +1,73 @@
+# tests/unit/test_packing.py
+
+import pytest
+
+from app.operations import packing, vectorized
+from app.operations.packing import (
+    FLAG_FLOAT32,
+    FLAG_ZLIB,
+    PackedVector,
+    decode_inputs,
+    encode_inputs,
+)
+
+
+@pytest.fixture(params=[True, False], ids=["numpy", "array"])
+def engine(request, monkeypatch):
+    """Run each test against the NumPy path and the array fallback."""
+    if request.param and not vectorized.HAS_NUMPY:
+        pytest.skip("NumPy is not installed")
+    monkeypatch.setattr(packing, "HAS_NUMPY", request.param)
+    monkeypatch.setattr(vectorized, "HAS_NUMPY", request.param)
+    return request.param
+
+
+def flags(raw: bytes) -> int:
+    return raw[0]
+
+
+def test_round_trip_float64(engine):
+    """Values that need float64 survive a round trip unchanged."""
+    values = [0.1, -2.5, 1e300]
+    raw = encode_inputs(values)
+    assert not flags(raw) & FLAG_FLOAT32
+    assert list(decode_inputs(raw)) == values
+
+
+def test_float32_when_lossless(engine):
+    """Values exactly representable as float32 are stored in half the space."""
+    values = [1.0, 2.5, -4.0]
+    raw = encode_inputs(values)
+    assert flags(raw) & FLAG_FLOAT32
+    assert len(raw) == 5 + 4 * len(values)
+    assert list(decode_inputs(raw)) == values
+
+
+def test_compresses_above_threshold(engine):
+    """Large repetitive payloads are zlib-compressed; small ones are not."""
+    values = [1.5] * 2000
+    raw = encode_inputs(values, compress_min_bytes=1024)
+    assert flags(raw) & FLAG_ZLIB
+    assert len(raw) < 1000
+    assert list(decode_inputs(raw)) == values
+    assert not flags(encode_inputs(values, compress_min_bytes=None)) & FLAG_ZLIB
+
+
+def test_packed_vector_is_lazy():
+    """len() is read from the header without decoding the payload."""
+    vector = PackedVector(encode_inputs([1.0, 2.0, 3.0]))
+    assert len(vector) == 3
+    assert vector._values is None
+    assert vector[1] == 2.0
+    assert vector._values is not None
+
+
+def test_packed_vector_behaves_like_list():
+    """PackedVector compares, slices and re-encodes like the original list."""
+    raw = encode_inputs([1.0, 2.0, 3.0])
+    vector = PackedVector(raw)
+    assert vector == [1.0, 2.0, 3.0]
+    assert vector[1:] == [2.0, 3.0]
+    assert list(vector) == [1.0, 2.0, 3.0]
+    assert encode_inputs(vector) is raw
+    assert vectorized.is_vector(vector)
@@ -0,0 +1,74 @@
+# tests/unit/test_parallel.py
+
+import asyncio
+import operator
+import random
+from functools import reduce
+
+import pytest
+
+from app.operations import parallel
+from app.operations.parallel import _chunk_bounds, reduce_in_pool
+
+SCALAR_OPS = {
+    "addition": operator.add,
+    "subtraction": operator.sub,
+    "multiplication": operator.mul,
+    "division": operator.truediv,
+}
+
+
+@pytest.fixture(scope="module", autouse=True)
+def small_pool():
+    """Use a two-process pool and shut it down after the module."""
+    original = parallel.settings.CALC_PARALLEL_WORKERS
+    parallel.settings.CALC_PARALLEL_WORKERS = 2
+    yield
+    parallel.shutdown_pool()
+    parallel.settings.CALC_PARALLEL_WORKERS = original
+
+
+def test_chunk_bounds_cover_range():
+    """Chunks are contiguous and cover every index once."""
+    bounds = _chunk_bounds(10, 3)
+    assert bounds == [(0, 4), (4, 8), (8, 10)]
+
+
+@pytest.mark.parametrize("calc_type", list(SCALAR_OPS))
+def test_reduce_in_pool_matches_sequential(calc_type):
+    """Chunked results keep left-to-right semantics for every operator."""
+    rng = random.Random(7)
+    inputs = [rng.uniform(0.99, 1.01) for _ in range(10001)]
+    expected = reduce(SCALAR_OPS[calc_type], inputs)
+    result = asyncio.run(reduce_in_pool(calc_type, inputs))
+    assert result == pytest.approx(expected, rel=1e-12)
+
+
+@pytest.mark.parametrize("calc_type, factor", [("division", 0.5), ("multiplication", 2.0)])
+def test_chunk_products_do_not_overflow(calc_type, factor):
+    """The second chunk's product alone (2**1500) overflows; the result 2**500 does not."""
+    inputs = [2.0 ** -1000] + [1.0] * 1500 + [factor] * 1500
+    expected = reduce(SCALAR_OPS[calc_type], inputs)
+    assert expected == 2.0 ** 500
+    assert asyncio.run(reduce_in_pool(calc_type, inputs)) == expected
+
+
+def test_pool_is_shared_between_web_workers(monkeypatch):
+    monkeypatch.setattr(parallel.settings, "CALC_PARALLEL_WORKERS", None)
+    monkeypatch.setattr(parallel.settings, "WEB_CONCURRENCY", 4)
+    monkeypatch.setattr(parallel.os, "cpu_count", lambda: 8)
+    assert parallel.pool_size() == 2
+    monkeypatch.setattr(parallel.settings, "WEB_CONCURRENCY", 16)
+    assert parallel.pool_size() == 1
+
+
+def test_reduce_in_pool_divide_by_zero():
+    """A zero divisor in any chunk raises ZeroDivisionError."""
+    inputs = [1.0] * 1000 + [0.0] + [1.0] * 1000
+    with pytest.raises(ZeroDivisionError):
+        asyncio.run(reduce_in_pool("division", inputs))
+
+
+def test_reduce_in_pool_zero_numerator():
+    """Only divisors are checked; a zero numerator gives zero."""
+    assert asyncio.run(reduce_in_pool("division", [0.0] + [2.0] * 100)) == 0.0
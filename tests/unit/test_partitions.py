@@ -0,0 +1,43 @@
+# tests/unit/test_partitions.py
+
+from datetime import date, datetime
+
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.schema import CreateTable
+
+from app.migrations.partition_calculations import (
+    expired_months,
+    month_partition_name,
+    months_to_create,
+    partitioned_table,
+)
+
+NOW = datetime(2025, 11, 15, 8, 0)
+
+
+def test_months_to_create_wraps_the_year():
+    assert months_to_create(NOW, ahead=3) == [
+        date(2025, 11, 1), date(2025, 12, 1), date(2026, 1, 1), date(2026, 2, 1)
+    ]
+
+
+def test_months_to_create_covers_existing_rows():
+    months = months_to_create(NOW, ahead=0, oldest=datetime(2025, 8, 31, 23, 59))
+    assert months == [date(2025, 8, 1), date(2025, 9, 1), date(2025, 10, 1), date(2025, 11, 1)]
+
+
+def test_expired_months_keeps_the_retention_window():
+    names = [month_partition_name(date(2025, m, 1)) for m in range(1, 12)] + ["calculations_default"]
+    # Six months kept: May through October are whole months inside the window.
+    assert expired_months(names, NOW, retention_months=6) == [
+        "calculations_p2025_01", "calculations_p2025_02", "calculations_p2025_03", "calculations_p2025_04",
+    ]
+
+
+def test_partitioned_table_ddl():
+    ddl = str(CreateTable(partitioned_table("month")).compile(dialect=postgresql.dialect()))
+    assert "PRIMARY KEY (id, created_at)" in ddl
+    assert "PARTITION BY RANGE (created_at)" in ddl
+    ddl = str(CreateTable(partitioned_table("hash")).compile(dialect=postgresql.dialect()))
+    assert "PRIMARY KEY (id, user_id)" in ddl
+    assert "PARTITION BY HASH (user_id)" in ddl
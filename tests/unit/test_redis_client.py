@@ -0,0 +1,93 @@
+# tests/unit/test_redis_client.py
+
+import asyncio
+import time
+
+import pytest
+
+from app.auth import redis as auth_redis
+from app.auth.revocation import RevocationMirror
+from app.core.circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker
+from tests.fake_redis import FakeRedis
+
+
+@pytest.fixture
+def fake_redis(monkeypatch):
+    """A fake client, a fresh breaker and metrics, and an unsynced mirror (lookups go to Redis)."""
+    fake = FakeRedis()
+    monkeypatch.setattr(auth_redis, "redis_client", fake)
+    monkeypatch.setattr(auth_redis, "revocations", RevocationMirror())
+    monkeypatch.setattr(auth_redis, "breaker", CircuitBreaker(failure_threshold=2, reset_seconds=60))
+    monkeypatch.setattr(auth_redis, "redis_metrics", auth_redis.RedisMetrics())
+    monkeypatch.setattr(auth_redis, "_lookups", auth_redis._LookupBatcher())
+    monkeypatch.setattr(auth_redis.settings, "REDIS_BATCH_WINDOW_SECONDS", 0.01)
+    return fake
+
+
+def test_breaker_opens_half_opens_and_closes(monkeypatch):
+    breaker = CircuitBreaker(failure_threshold=2, reset_seconds=10)
+    breaker.record_failure()
+    assert breaker.allow() and breaker.state == CLOSED
+    breaker.record_failure()
+    assert breaker.state == OPEN and not breaker.allow()
+
+    later = time.monotonic() + 11
+    monkeypatch.setattr(time, "monotonic", lambda: later)
+    assert breaker.state == HALF_OPEN
+    assert breaker.allow() is True
+    assert breaker.allow() is False  # one trial at a time
+    breaker.record_success()
+    assert breaker.state == CLOSED
+    assert breaker.stats() == {"state": "closed", "consecutive_failures": 0, "opened": 1, "rejected": 2}
+
+
+def test_cancelled_trial_releases_the_breaker(fake_redis, monkeypatch):
+    breaker = auth_redis.breaker
+    breaker.record_failure()
+    breaker.record_failure()
+    later = time.monotonic() + 61
+    monkeypatch.setattr(time, "monotonic", lambda: later)
+
+    async def hang():
+        await asyncio.sleep(10)
+
+    async def scenario():
+        trial = asyncio.create_task(auth_redis._execute(hang))
+        await asyncio.sleep(0)
+        trial.cancel()
+        await asyncio.gather(trial, return_exceptions=True)
+
+    asyncio.run(scenario())
+    assert breaker.state == HALF_OPEN
+    assert breaker.allow() is True
+
+
+def test_concurrent_lookups_share_one_mget(fake_redis):
+    async def scenario():
+        await auth_redis.add_to_blacklist("b", 60)
+        # Forget the local copy so every lookup goes to Redis.
+        auth_redis.revocations = RevocationMirror()
+        return await asyncio.gather(*(auth_redis.is_blacklisted(jti) for jti in ("a", "b", "a", "c")))
+
+    assert asyncio.run(scenario()) == [False, True, False, False]
+    # One pipelined write, one MGET for all four lookups
+    assert fake_redis.commands == ["pipeline", "mget"]
+    stats = auth_redis.redis_metrics.stats()
+    assert (stats["batches"], stats["batched_lookups"]) == (1, 4)
+    assert stats["latency_seconds"]["count"] == 2
+
+
+@pytest.mark.parametrize("policy, revoked", [("open", False), ("closed", True)])
+def test_failure_policy_and_breaker(fake_redis, monkeypatch, policy, revoked):
+    monkeypatch.setattr(auth_redis.settings, "REDIS_FAILURE_POLICY", policy)
+    fake_redis.failing = True
+
+    async def scenario():
+        return [await auth_redis.is_blacklisted("x") for _ in range(4)]
+
+    assert asyncio.run(scenario()) == [revoked] * 4
+    # Two failures open the breaker; later lookups do not reach Redis.
+    assert fake_redis.commands == ["mget", "mget"]
+    stats = auth_redis.redis_metrics.stats()
+    assert stats["errors"] == 2
+    assert stats["breaker"]["state"] == "open" and stats["breaker"]["rejected"] == 2
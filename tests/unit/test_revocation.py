@@ -0,0 +1,108 @@
+# tests/unit/test_revocation.py
+
+import asyncio
+import time
+
+import pytest
+
+from app.auth import redis as auth_redis
+from app.auth.revocation import RevocationMirror
+from tests.fake_redis import FakeRedis
+
+
+@pytest.fixture
+def fake_redis(monkeypatch):
+    fake = FakeRedis()
+    monkeypatch.setattr(auth_redis, "redis_client", fake)
+    monkeypatch.setattr(auth_redis, "revocations", RevocationMirror())
+    return fake
+
+
+async def wait_for(condition):
+    for _ in range(200):
+        if condition():
+            return
+        await asyncio.sleep(0.01)
+    raise AssertionError("condition not reached")
+
+
+def test_mirror_prunes_expired_and_answers_none_until_synced():
+    mirror = RevocationMirror()
+    now = time.time()
+    mirror.add("old", now - 1)
+    mirror.add("live", now + 60)
+    assert mirror.lookup("live") is True
+    assert mirror.lookup("other") is None
+    mirror.replace([("live", now + 60), ("old", now - 1)])
+    assert mirror.lookup("other") is False
+    assert mirror.lookup("old") is False
+    assert mirror.stats()["entries"] == 1
+
+
+def test_sync_answers_locally_and_recovers_missed_updates(fake_redis, monkeypatch):
+    monkeypatch.setattr(auth_redis.settings, "REDIS_BATCH_WINDOW_SECONDS", 0)
+
+    def lookups_since(start):
+        return [c for c in fake_redis.commands[start:] if c == "get"]
+
+    async def scenario():
+        await fake_redis.setex("revoked:before", 60, repr(time.time() + 60))
+        task = asyncio.create_task(auth_redis.sync_revocations())
+        mirror = auth_redis.revocations
+        await wait_for(lambda: mirror.synced)
+        start = len(fake_redis.commands)
+
+        # Loaded at startup, and published by another worker afterwards
+        assert await auth_redis.is_blacklisted("before") is True
+        await fake_redis.publish(auth_redis.REVOCATIONS_CHANNEL, f"remote {time.time() + 60!r}")
+        await wait_for(lambda: mirror.lookup("remote"))
+        assert await auth_redis.is_blacklisted("unknown") is False
+        assert lookups_since(start) == []
+
+        # Disconnected: lookups fall back to Redis; a revocation whose
+        # message was lost is picked up by the reload on reconnect.
+        fake_redis.down = True
+        await wait_for(lambda: not mirror.synced)
+        await fake_redis.setex("revoked:missed", 60, repr(time.time() + 60))
+        assert await auth_redis.is_blacklisted("missed") is True
+        assert len(lookups_since(start)) == 1
+        fake_redis.down = False
+        await wait_for(lambda: mirror.synced)
+        assert await auth_redis.is_blacklisted("missed") is True
+        assert len(lookups_since(start)) == 1
+
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+    asyncio.run(scenario())
+
+
+def test_add_to_blacklist_is_visible_locally_at_once(fake_redis):
+    async def scenario():
+        await auth_redis.add_to_blacklist("jti-1", 60)
+        assert await auth_redis.is_blacklisted("jti-1") is True
+        assert "revoked:jti-1" in fake_redis.data
+
+    asyncio.run(scenario())
+
+
+def test_sync_survives_malformed_entries(fake_redis, caplog):
+    """A malformed stored revocation is logged and still counts as revoked; the sync keeps running."""
+    async def scenario():
+        await fake_redis.setex("revoked:garbled", 60, "not-a-number")
+        await fake_redis.setex("revoked:good", 60, repr(time.time() + 60))
+        task = asyncio.create_task(auth_redis.sync_revocations())
+        mirror = auth_redis.revocations
+        await wait_for(lambda: mirror.synced)
+        assert mirror.lookup("garbled") is True
+        assert mirror.lookup("good") is True
+
+        await fake_redis.publish(auth_redis.REVOCATIONS_CHANNEL, f"later {time.time() + 60!r}")
+        await wait_for(lambda: mirror.lookup("later"))
+        assert not task.done()
+
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+    asyncio.run(scenario())
+    assert "Malformed revocation" in caplog.text
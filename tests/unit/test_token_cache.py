@@ -0,0 +1,83 @@
+# tests/unit/test_token_cache.py
+
+import asyncio
+import time
+import uuid
+
+import pytest
+from fastapi import HTTPException
+
+from app.auth import jwt as auth_jwt
+from app.auth.token_cache import TokenCache, make_key
+from app.models.user import User
+from app.schemas.token import TokenType
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    """Swap in a fresh cache so counters start at zero; every user is at generation 0."""
+    fresh = TokenCache(max_entries=2)
+    monkeypatch.setattr(auth_jwt, "token_cache", fresh)
+
+    async def current_generation(user_id):
+        return 0
+
+    monkeypatch.setattr(auth_jwt, "current_generation", current_generation)
+    return fresh
+
+
+def test_entries_expire_at_exp_and_evict_lru():
+    cache = TokenCache(max_entries=2)
+    now = time.time()
+    cache.put(b"a", {"sub": "a", "exp": now + 60})
+    cache.put(b"b", {"sub": "b", "exp": now - 1})
+    cache.put(b"c", {"sub": "c"})  # no exp: never cached
+    assert cache.get(b"a") == {"sub": "a", "exp": now + 60}
+    assert cache.get(b"b") is None
+    assert cache.get(b"c") is None
+    cache.put(b"d", {"exp": now + 60})
+    cache.put(b"e", {"exp": now + 60})
+    assert cache.get(b"a") is None
+    assert cache.stats() == {
+        "enabled": True, "entries": 2, "max_entries": 2,
+        "hits": 1, "misses": 3, "evictions": 1, "expirations": 1,
+    }
+
+
+def test_keys_depend_on_secret():
+    assert make_key("access", "t") != make_key("refresh", "t")
+    assert TokenCache(max_entries=0).get(make_key("access", "t")) is None
+
+
+def test_decode_token_hits_cache_but_still_checks_blacklist(cache, monkeypatch):
+    revoked = set()
+
+    async def is_blacklisted(jti):
+        return jti in revoked
+
+    monkeypatch.setattr(auth_jwt, "is_blacklisted", is_blacklisted)
+    user_id = uuid.uuid4()
+    token = auth_jwt.create_token(user_id, TokenType.ACCESS)
+
+    payload = asyncio.run(auth_jwt.decode_token(token, TokenType.ACCESS))
+    assert asyncio.run(auth_jwt.decode_token(token, TokenType.ACCESS)) == payload
+    assert User.verify_token(token) == user_id
+    assert (cache.hits, cache.misses) == (2, 1)
+
+    revoked.add(payload["jti"])
+    with pytest.raises(HTTPException) as excinfo:
+        asyncio.run(auth_jwt.decode_token(token, TokenType.ACCESS))
+    assert excinfo.value.detail == "Token has been revoked"
+
+
+def test_invalid_and_wrong_type_tokens_are_not_cached(cache, monkeypatch):
+    async def is_blacklisted(jti):
+        return False
+
+    monkeypatch.setattr(auth_jwt, "is_blacklisted", is_blacklisted)
+    refresh = auth_jwt.create_token(uuid.uuid4(), TokenType.REFRESH)
+    for _ in range(2):
+        with pytest.raises(HTTPException):
+            asyncio.run(auth_jwt.decode_token(refresh, TokenType.ACCESS))
+        assert User.verify_token(refresh + "x") is None
+    assert (cache.hits, cache.stats()["entries"]) == (0, 0)
@@ -0,0 +1,144 @@
+# tests/unit/test_vectorized.py
+
+import operator
+import random
+from functools import reduce
+
+import pytest
+
+from app.operations import vectorized
+from app.operations.calculation_logic import perform_calculation
+from app.operations.vectorized import evaluate_many, reduce_inputs
+from app.schemas.calculation import CalculationType
+
+SCALAR_OPS = {
+    "addition": operator.add,
+    "subtraction": operator.sub,
+    "multiplication": operator.mul,
+    "division": operator.truediv,
+}
+
+
+def random_inputs(n: int, seed: int = 0):
+    rng = random.Random(seed)
+    # Values near 1 keep long products and quotients finite.
+    return [rng.uniform(0.99, 1.01) for _ in range(n)]
+
+
+@pytest.fixture(params=[True, False], ids=["numpy", "array"])
+def engine(request, monkeypatch):
+    """Run each test against the NumPy path and the array('d') fallback."""
+    if request.param and not vectorized.HAS_NUMPY:
+        pytest.skip("NumPy is not installed")
+    monkeypatch.setattr(vectorized, "HAS_NUMPY", request.param)
+    return request.param
+
+
+@pytest.mark.parametrize("calc_type", list(SCALAR_OPS))
+def test_reduce_inputs_matches_scalar_loop(engine, calc_type):
+    """Long vectors reduce to exactly the same float as the scalar loop."""
+    inputs = random_inputs(20000)
+    expected = reduce(SCALAR_OPS[calc_type], inputs)
+    assert reduce_inputs(calc_type, inputs) == expected
+
+
+def test_reduce_inputs_divide_by_zero(engine):
+    """A zero divisor raises ZeroDivisionError like the scalar operator."""
+    with pytest.raises(ZeroDivisionError):
+        reduce_inputs(CalculationType.DIVISION, [10, 2, 0, 5])
+
+
+def test_reduce_inputs_allows_zero_numerator(engine):
+    """Only divisors are checked; a zero numerator is fine."""
+    assert reduce_inputs(CalculationType.DIVISION, [0, 2, 5]) == 0.0
+
+
+def test_evaluate_many_preserves_order(engine):
+    """Mixed types and lengths come back in request order."""
+    items = [
+        ("addition", [1, 2, 3]),
+        ("division", [100, 2, 5]),
+        ("multiplication", random_inputs(500, seed=1)),
+        ("subtraction", [20, 5, 3]),
+        ("addition", [4, 5, 6]),
+    ]
+    expected = [reduce(SCALAR_OPS[t], inputs) for t, inputs in items]
+    assert evaluate_many(items) == expected
+
+
+def test_evaluate_many_return_exceptions(engine):
+    """Failing items are reported in place when return_exceptions is set."""
+    items = [
+        ("division", [10, 0]),
+        ("addition", [1, 1]),
+        ("modulus", [1, 1]),
+    ]
+    results = evaluate_many(items, return_exceptions=True)
+    assert isinstance(results[0], ZeroDivisionError)
+    assert results[1] == 2.0
+    assert isinstance(results[2], ValueError)
+
+
+def test_evaluate_many_raises_by_default(engine):
+    """Without return_exceptions the first failure aborts the batch."""
+    with pytest.raises(ZeroDivisionError):
+        evaluate_many([("addition", [1, 2]), ("division", [1, 0])])
+
+
+def test_perform_calculation_long_inputs(engine):
+    """perform_calculation keeps its error message on the vectorized path."""
+    inputs = random_inputs(5000)
+    assert perform_calculation(inputs, "multiplication") == reduce(operator.mul, inputs)
+    with pytest.raises(ValueError, match="Cannot divide by zero"):
+        perform_calculation(inputs + [0.0], "division")
+
+
+def test_evaluate_many_rejects_bad_inputs_per_item(engine):
+    """Short, empty or non-numeric inputs fail on their own, like get_result."""
+    items = [
+        ("addition", []),
+        ("addition", [1]),
+        ("addition", [1, "x"]),
+        ("addition", [1, 2]),
+        ("multiplication", "12"),
+    ]
+    results = evaluate_many(items, return_exceptions=True)
+    assert [str(r) for r in results[:3]] == [
+        "Inputs must be a list with at least two numbers.",
+        "Inputs must be a list with at least two numbers.",
+        "Inputs must be a list of numbers.",
+    ]
+    assert results[3] == 3.0
+    assert str(results[4]) == "Inputs must be a list of numbers."
+    with pytest.raises(ValueError, match="at least two"):
+        evaluate_many([("addition", [1, 2]), ("addition", [])])
+
+
+def test_only_float64_buffers_are_vectorized(engine, monkeypatch):
+    """Lists keep the scalar loops at any length; buffers above the threshold use reduce_inputs."""
+    from array import array
+
+    from app.models import calculation as models
+    from app.operations import memo
+    from app.models.calculation import Calculation
+
+    calls = []
+
+    def tracking(calc_type, inputs):
+        calls.append(len(inputs))
+        return reduce_inputs(calc_type, inputs)
+
+    monkeypatch.setattr(models, "reduce_inputs", tracking)
+    monkeypatch.setattr(models, "is_packed", vectorized.is_packed)
+    monkeypatch.setattr(memo.result_cache, "enabled", False)
+    inputs = random_inputs(5000)
+    packed = vectorized.as_float64(inputs)
+    assert vectorized.is_packed(packed) and not vectorized.is_packed(inputs)
+    for calc_type in SCALAR_OPS:
+        expected = reduce(SCALAR_OPS[calc_type], inputs)
+        assert Calculation.create(calc_type, None, inputs).get_result() == expected
+        assert calls == []
+        assert Calculation.create(calc_type, None, packed).get_result() == expected
+        assert calls == [5000]
+        calls.clear()
+    assert vectorized.is_packed(array("d", [1.0, 2.0]))